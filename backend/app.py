@@ -1,11 +1,23 @@
-from flask import Flask, jsonify, request, make_response
+from flask import Flask, Response, jsonify, request, make_response, stream_with_context
 from flask_cors import CORS
-from services import CitationService, ProjectService, TagService
+from services import CitationChanged, CitationService, FormatterSweeper, ProjectService, ReferenceService, TagService
 from models.base import Citation, Project, Tag
-from utils.formatcitation import AGLC4Citation
-from utils.citation_extractor import CitationExtractor
+from utils.formatcitation import AGLC4Citation, FORMATTER_VERSION, affects_formatting, needs_reformat
+from utils.citation_extractor import AUTO_SOURCE_TYPE, CitationExtractor
+from utils.dates import DATE_CACHE
+from utils.extraction_pool import ExtractionPool, PoolBusy
+from utils.bibliography import collation_key, section_title
+from utils.coalesce import LatestRequests, SingleFlight
+from utils.footnotes import FootnoteSequence
+from utils.names import NAME_LIST_FIELDS, structured_names
+from utils.parallel_format import ParallelFormatter
+from utils.rendering import RENDERERS, parse_markup, render, render_html
+from utils.shadow import ShadowFormatter, load_engine
+from utils.styles import STYLES, format_styles
 from dotenv import load_dotenv
+import json
 import os
+import time
 from datetime import datetime
 from functools import wraps
 import jwt
@@ -18,19 +30,65 @@ CORS(app, resources={
     r"/api/*": {
         "origins": ["http://localhost:3000"],
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization", "Accept"],
+        "allow_headers": ["Content-Type", "Authorization", "Accept", "X-Preview-Client"],
+        "expose_headers": ["X-Entry-Count"],
         "supports_credentials": True
     }
 })
 
+# Initialize AGLC4 formatter with its formatted citation memo cache
+aglc_formatter = AGLC4Citation(cache_size=int(os.getenv('FORMAT_CACHE_SIZE', 4096)))
+
+# Optionally compare a sample of live formatting against a candidate engine
+if os.getenv('SHADOW_ENGINE'):
+    aglc_formatter = ShadowFormatter(
+        aglc_formatter,
+        load_engine(os.getenv('SHADOW_ENGINE')),
+        sample_rate=float(os.getenv('SHADOW_SAMPLE_RATE', 0.01))
+    )
+
+# Large bibliography exports are formatted across worker processes
+export_formatter = ParallelFormatter(
+    aglc_formatter,
+    workers=int(os.getenv('EXPORT_WORKERS', 0)) or None,
+    threshold=int(os.getenv('EXPORT_PARALLEL_THRESHOLD', 5000))
+)
+
 # Initialize services
-citation_service = CitationService()
+citation_service = CitationService(formatter=aglc_formatter)
 project_service = ProjectService()
+reference_service = ReferenceService()
 tag_service = TagService()
-citation_extractor = CitationExtractor()
-
-# Initialize AGLC4 formatter
-aglc_formatter = AGLC4Citation()
+citation_extractor = CitationExtractor(cache_size=int(os.getenv('EXTRACT_CACHE_SIZE', 2048)))
+MAX_EXTRACT_ENTRIES = int(os.getenv('MAX_EXTRACT_ENTRIES', 1000))
+# Characters of pasted text accepted by the extraction endpoints
+MAX_EXTRACT_TEXT_LENGTH = int(os.getenv('MAX_EXTRACT_TEXT_LENGTH', 500000))
+
+# Large extractions run in worker processes; when too many are pending, new ones get a 503
+extraction_pool = ExtractionPool(
+    citation_extractor,
+    workers=int(os.getenv('EXTRACT_WORKERS', 0)) or None,
+    max_pending=int(os.getenv('EXTRACT_MAX_PENDING', 0)) or None,
+    timeout=float(os.getenv('EXTRACT_TIMEOUT_SECONDS', 10)),
+    inline_threshold=int(os.getenv('EXTRACT_INLINE_THRESHOLD', 4000))
+)
+EXTRACT_RETRY_AFTER_SECONDS = 1
+
+# Reformat sweeps run in background threads, outside any request, so they get a
+# service-role client of their own; routes check the caller can see the project
+if os.getenv('SUPABASE_SERVICE_ROLE_KEY'):
+    formatter_sweeper = FormatterSweeper(CitationService(
+        create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_SERVICE_ROLE_KEY')),
+        formatter=aglc_formatter
+    ))
+else:
+    formatter_sweeper = None
+
+# Live previews: identical concurrent previews are formatted once, and a preview
+# superseded by a newer one from the same client within the debounce is not formatted
+preview_flight = SingleFlight()
+preview_requests = LatestRequests()
+PREVIEW_DEBOUNCE_SECONDS = float(os.getenv('PREVIEW_DEBOUNCE_SECONDS', 0.05))
 
 # Initialize Supabase client
 supabase = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_ANON_KEY"))
@@ -44,8 +102,8 @@ def require_auth(f):
             
         try:
             token = auth_header.split(' ')[1]
-            # Set the token in the citation service
-            citation_service.set_access_token(token)
+            # Set the token in the citation service, with its user for the held bibliographies
+            citation_service.set_access_token(token, token_user_id(token))
             return f(*args, **kwargs)
         except Exception as e:
             app.logger.error(f"Authentication error: {str(e)}")
@@ -53,6 +111,19 @@ def require_auth(f):
             
     return decorated
 
+def token_user_id(token):
+    """
+    The user id (sub claim) of a Supabase access token. The signature is checked
+    when SUPABASE_JWT_SECRET is set; otherwise the id is only good for keying
+    per-user state, not for authorising access.
+    """
+    secret = os.getenv('SUPABASE_JWT_SECRET')
+    if secret:
+        claims = jwt.decode(token, secret, algorithms=['HS256'], audience='authenticated')
+    else:
+        claims = jwt.decode(token, options={"verify_signature": False})
+    return claims.get('sub')
+
 # Citation routes
 @app.route('/api/citations', methods=['GET'])
 def get_citations():
@@ -86,9 +157,12 @@ def create_citation():
             return jsonify({"error": "project_id is required"}), 400
 
         try:
+            data.update(structured_names(data))
             citation_type = data['type'].lower()
             formatted_citation = aglc_formatter.format_citation(citation_type, **data)
             data['formatted_citation'] = formatted_citation
+            data['formatter_version'] = FORMATTER_VERSION
+            data['collation_key'] = collation_key(citation_type, data)
         except KeyError as e:
             print(f"Missing required field: {str(e)}")
             return jsonify({"error": f"Missing required field: {str(e)}"}), 400
@@ -102,31 +176,95 @@ def create_citation():
         print(f"Detailed error: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/citations/preview', methods=['POST'])
+@require_auth
+def preview_citation():
+    """
+    Format a citation without saving it, for the live preview in the citation form.
+    Clients debounce keystrokes themselves. Requests are tracked per user and
+    per X-Preview-Client header, one value per open form. A preview that is not
+    cached waits PREVIEW_DEBOUNCE_SECONDS before formatting; if a newer request
+    from the same form arrived meanwhile, it returns 409 without formatting and
+    the client should ignore it.
+    """
+    try:
+        data = request.json
+        if not data or not data.get('type'):
+            return jsonify({"error": "type is required"}), 400
+        # Names are normalised as they would be on save, so the preview matches
+        data.update(structured_names(data))
+        citation_type = data['type'].lower()
+        key = aglc_formatter.cache_key(citation_type, **data)
+        token = request.headers.get('Authorization').split(' ')[1]
+        client = (token_user_id(token), request.headers.get('X-Preview-Client'))
+        ticket = preview_requests.begin(client)
+
+        cached = aglc_formatter.cache is not None and key in aglc_formatter.cache
+        if not cached:
+            time.sleep(PREVIEW_DEBOUNCE_SECONDS)
+            if not preview_requests.is_latest(client, ticket):
+                return jsonify({"superseded": True}), 409
+        formatted_citation, _ = preview_flight.do(
+            key, lambda: aglc_formatter.format_citation(citation_type, **data)
+        )
+        return jsonify({
+            "formatted_citation": formatted_citation,
+            "html": render_html(parse_markup(formatted_citation)),
+            "cached": cached
+        }), 200
+    except jwt.InvalidTokenError:
+        return jsonify({"error": "Invalid token"}), 401
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except KeyError as e:
+        return jsonify({"error": f"Missing required field: {str(e)}"}), 400
+    except Exception as e:
+        app.logger.error(f"Error previewing citation: {str(e)}")
+        return jsonify({"error": f"Error formatting citation: {str(e)}"}), 500
+
 @app.route('/api/citations/<string:citation_id>', methods=['PUT'])
 @require_auth
 def update_citation(citation_id):
     try:
         data = request.json
-        
-        # Format citation using AGLC4 if necessary fields changed
-        format_fields = ['type', 'title', 'year', 'authors', 'journal']
-        if any(field in data for field in format_fields):
-            citation = citation_service.get_citation(citation_id)
-            citation_data = {**citation.dict(), **data}
-            try:
-                citation_type = citation_data['type'].lower()
-                formatted_citation = aglc_formatter.format_citation(citation_type, **citation_data)
-                data['formatted_citation'] = formatted_citation
-            except Exception as e:
-                app.logger.error(f"Error formatting citation: {str(e)}")
-                return jsonify({"error": f"Error formatting citation: {str(e)}"}), 400
 
         # Get auth token from decorator
         auth_header = request.headers.get('Authorization')
         token = auth_header.split(' ')[1]
         citation_service.set_access_token(token)
 
-        updated_citation = citation_service.update_citation(citation_id, data)
+        if not affects_formatting(data):
+            updated_citation = citation_service.update_citation(citation_id, data)
+            return jsonify(updated_citation.dict()), 200
+
+        # The patch changes a field the citation's type consumes: format once from
+        # the cached row with the patch applied, and write only if the row is still
+        # the one formatted from. If it changed elsewhere, read it again and retry once
+        updated_citation = None
+        for refresh in (False, True):
+            current = citation_service.get_citation_fields(citation_id, refresh=refresh)
+            if current is None:
+                return jsonify({"error": "Citation not found"}), 404
+            patch = dict(data)
+            if any(field in patch for field in NAME_LIST_FIELDS):
+                patch.update(structured_names({**current, **patch}))
+            if needs_reformat(current, patch):
+                citation_data = {**current, **patch}
+                try:
+                    citation_type = citation_data['type'].lower()
+                    patch['formatted_citation'] = aglc_formatter.format_citation(citation_type, **citation_data)
+                    patch['formatter_version'] = FORMATTER_VERSION
+                    patch['collation_key'] = collation_key(citation_type, citation_data)
+                except Exception as e:
+                    app.logger.error(f"Error formatting citation: {str(e)}")
+                    return jsonify({"error": f"Error formatting citation: {str(e)}"}), 400
+            try:
+                updated_citation = citation_service.update_citation(citation_id, patch, based_on=current)
+                break
+            except CitationChanged:
+                continue
+        if updated_citation is None:
+            return jsonify({"error": "Citation was changed by another request; reload it and try again"}), 409
         return jsonify(updated_citation.dict()), 200
     except Exception as e:
         app.logger.error(f"Error updating citation: {str(e)}")
@@ -211,16 +349,26 @@ def extract_citation():
 
         source_type = data['source_type']
         text = data['text']
+        if len(text) > MAX_EXTRACT_TEXT_LENGTH:
+            return jsonify({"error": f"Text too long (maximum {MAX_EXTRACT_TEXT_LENGTH} characters)"}), 413
 
-        # Extract citation details
+        # Extract citation details; 'auto' detects the source type from the text.
+        # Large pastes are normalised, detected and extracted in the worker processes
         try:
-            citation_type, extracted_fields = citation_extractor.extract_citation(source_type, text)
+            source_type, citation_type, extracted_fields = extraction_pool.extract(source_type, text)
             return jsonify({
+                "source_type": source_type,
                 "citation_type": citation_type,
                 "fields": extracted_fields
             })
         except ValueError as e:
             return jsonify({"error": str(e)}), 400
+        except PoolBusy:
+            response = jsonify({"error": "Extraction is busy, please retry shortly"})
+            response.headers['Retry-After'] = str(EXTRACT_RETRY_AFTER_SECONDS)
+            return response, 503
+        except TimeoutError:
+            return jsonify({"error": "Extraction timed out"}), 504
         except Exception as e:
             app.logger.error(f"Citation extraction error: {str(e)}")
             return jsonify({"error": "Failed to extract citation details"}), 500
@@ -229,6 +377,104 @@ def extract_citation():
         app.logger.error(f"Error in extract_citation: {str(e)}")
         return jsonify({"error": "Internal server error"}), 500
 
+@app.route('/api/citations/extract/batch', methods=['POST'])
+@require_auth
+def extract_citations_batch():
+    """
+    Extract every entry of a pasted reference list. Results are streamed as
+    newline-delimited JSON, one line per entry in paste order, as each is extracted:
+    {"index", "text", "source_type", "citation_type", "fields"}, or {"index", "text", "error"}.
+    With source_type 'auto' each entry's source type is detected separately.
+    """
+    try:
+        data = request.json
+        if not data or 'source_type' not in data or 'text' not in data:
+            return jsonify({"error": "Missing required fields"}), 400
+
+        source_type = data['source_type']
+        if source_type != AUTO_SOURCE_TYPE and source_type not in citation_extractor.extractors:
+            return jsonify({"error": f"Unsupported source type: {source_type}"}), 400
+
+        if len(data['text']) > MAX_EXTRACT_TEXT_LENGTH:
+            return jsonify({"error": f"Text too long (maximum {MAX_EXTRACT_TEXT_LENGTH} characters)"}), 413
+
+        # Large pastes are split, and their entries extracted, in the worker processes;
+        # this only waits for results. One entry past the limit is enough to reject the paste
+        try:
+            entries = extraction_pool.split(data['text'], MAX_EXTRACT_ENTRIES + 1)
+            if not entries:
+                return jsonify({"error": "No entries found in text"}), 400
+            if len(entries) > MAX_EXTRACT_ENTRIES:
+                return jsonify({"error": f"Too many entries (maximum {MAX_EXTRACT_ENTRIES})"}), 400
+            outcomes = extraction_pool.extract_many(source_type, entries)
+        except PoolBusy:
+            response = jsonify({"error": "Extraction is busy, please retry shortly"})
+            response.headers['Retry-After'] = str(EXTRACT_RETRY_AFTER_SECONDS)
+            return response, 503
+        except TimeoutError:
+            return jsonify({"error": "Extraction timed out"}), 504
+
+        def generate():
+            for index, (text, outcome) in enumerate(zip(entries, outcomes)):
+                if outcome.error:
+                    result = {"index": index, "text": text, "error": outcome.error}
+                else:
+                    result = {
+                        "index": index,
+                        "text": text,
+                        "source_type": outcome.source_type,
+                        "citation_type": outcome.citation_type,
+                        "fields": outcome.fields
+                    }
+                yield json.dumps(result) + '\n'
+
+        response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        response.headers['X-Entry-Count'] = str(len(entries))
+        return response
+
+    except Exception as e:
+        app.logger.error(f"Error in extract_citations_batch: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
+@app.route('/api/formatter/cache', methods=['GET'])
+def get_formatter_cache_stats():
+    """
+    Hit, miss and eviction counters of the formatted citation memo cache
+    and of the date normalisation cache, and how many previews were coalesced
+    """
+    extra = {
+        "dates": DATE_CACHE.stats(),
+        "previews": {"shared": preview_flight.shared, "superseded": preview_requests.superseded}
+    }
+    if aglc_formatter.cache is None:
+        return jsonify({"enabled": False, **extra}), 200
+    return jsonify({"enabled": True, **aglc_formatter.cache.stats(), **extra}), 200
+
+@app.route('/api/citations/extract/cache', methods=['GET'])
+def get_extraction_cache_stats():
+    """
+    Hit rate and resident size of the extraction result cache, and how many
+    concurrent identical extractions were coalesced
+    """
+    return jsonify(citation_extractor.cache_stats()), 200
+
+@app.route('/api/citations/extract/pool', methods=['GET'])
+def get_extraction_pool_stats():
+    """
+    Size of the extraction worker pool, requests pending in it, and how many
+    were run in the pool or inline, rejected as busy, or timed out
+    """
+    return jsonify(extraction_pool.stats()), 200
+
+@app.route('/api/formatter/shadow', methods=['GET'])
+def get_formatter_shadow_stats():
+    """
+    Differences found by the shadow formatter engine, when SHADOW_ENGINE is set
+    """
+    if not isinstance(aglc_formatter, ShadowFormatter):
+        return jsonify({"enabled": False}), 200
+    return jsonify({"enabled": True, **aglc_formatter.stats()}), 200
+
 # Project routes
 @app.route('/api/projects', methods=['GET'])
 def get_projects():
@@ -349,6 +595,282 @@ def get_project_citations(project_id):
         app.logger.error(f"Error fetching citations for project {project_id}: {str(e)}")
         return jsonify({"error": "Failed to fetch project citations"}), 500
 
+def render_targets(formatted_citation, targets):
+    """A formatted citation rendered to each target format, or None if it has no text"""
+    if not formatted_citation:
+        return None
+    runs = parse_markup(formatted_citation)
+    return {target: render(runs, target) for target in targets}
+
+@app.route('/api/projects/<string:project_id>/bibliography', methods=['GET'])
+@require_auth
+def get_project_bibliography(project_id):
+    """
+    Format every citation in a project in one response.
+    Citations that fail to format are reported per entry rather than failing the request.
+    An optional comma-separated ?format= (markup, html, text, rtf, ooxml) adds each
+    entry rendered to those formats, formatting every citation only once.
+    Large projects are formatted across worker processes.
+    An optional comma-separated ?style= (aglc4, oscola, bluebook) adds each entry
+    formatted in those styles, normalising every citation only once; AGLC4 is
+    the entry's own formatted citation, not formatted again.
+    Entries are in AGLC4 bibliography order, each tagged with its section.
+    Without ?style= the caller's materialised bibliography of the project is
+    served as kept, see CitationService.get_bibliography.
+    """
+    try:
+        targets = [t.strip() for t in request.args.get('format', '').split(',') if t.strip()]
+        unsupported = [t for t in targets if t not in RENDERERS]
+        if unsupported:
+            return jsonify({"error": f"Unsupported format: {', '.join(unsupported)}"}), 400
+        styles = [s.strip() for s in request.args.get('style', '').split(',') if s.strip()]
+        unsupported = [s for s in styles if s not in STYLES]
+        if unsupported:
+            return jsonify({"error": f"Unsupported style: {', '.join(unsupported)}"}), 400
+
+        if not styles:
+            token = request.headers.get('Authorization').split(' ')[1]
+            entries = citation_service.get_bibliography(project_id, token_user_id(token)).entries()
+            if targets:
+                entries = [
+                    {**entry, "rendered": render_targets(entry["formatted_citation"], targets)}
+                    for entry in entries
+                ]
+            return jsonify({
+                "project_id": project_id,
+                "count": len(entries),
+                "error_count": sum(1 for entry in entries if entry["error"]),
+                "entries": entries
+            }), 200
+
+        # Raw rows: the Citation model drops template fields it does not declare
+        rows = citation_service.get_citation_records(project_id=project_id, order_by='collation_key')
+        results = export_formatter.format_many(rows, targets=targets)
+        other_styles = [s for s in styles if s != 'aglc4']
+        style_results = format_styles(rows, other_styles) if other_styles else None
+        entries = []
+        error_count = 0
+        for row, result in zip(rows, results):
+            if result.error:
+                error_count += 1
+            entry = {
+                "id": row['id'],
+                "type": row['type'],
+                "section": section_title(row['type']),
+                "formatted_citation": result.formatted_citation,
+                "error": result.error
+            }
+            if targets:
+                entry["rendered"] = result.rendered
+            styled = next(style_results) if style_results is not None else {}
+            # AGLC4 is the formatting above
+            styled['aglc4'] = result
+            entry["styles"] = {
+                name: {"formatted_citation": styled[name].formatted_citation, "error": styled[name].error}
+                for name in styles
+            }
+            entries.append(entry)
+        return jsonify({
+            "project_id": project_id,
+            "count": len(entries),
+            "error_count": error_count,
+            "entries": entries
+        }), 200
+    except Exception as e:
+        app.logger.error(f"Error building bibliography for project {project_id}: {str(e)}")
+        return jsonify({"error": "Failed to build project bibliography"}), 500
+
+def reformat_unavailable(project_id):
+    """
+    An error response if the caller may not sweep the project, else None.
+    The sweeper bypasses row level security, so the project must be visible
+    to the caller's own token first.
+    """
+    if formatter_sweeper is None:
+        return jsonify({"error": "Reformat sweeps need SUPABASE_SERVICE_ROLE_KEY"}), 503
+    token = request.headers.get('Authorization').split(' ')[1]
+    supabase.postgrest.auth(token)
+    response = supabase.table('projects').select('id').eq('id', project_id).execute()
+    if not response.data:
+        return jsonify({"error": "Project not found"}), 404
+    return None
+
+@app.route('/api/projects/<string:project_id>/reformat', methods=['POST'])
+@require_auth
+def start_project_reformat(project_id):
+    """
+    Start, or resume, re-rendering the project's citations that were formatted
+    by an older formatter version. Runs in the background; poll GET for progress.
+    """
+    try:
+        unavailable = reformat_unavailable(project_id)
+        if unavailable:
+            return unavailable
+        return jsonify(formatter_sweeper.start(project_id)), 202
+    except Exception as e:
+        app.logger.error(f"Error starting reformat of project {project_id}: {str(e)}")
+        return jsonify({"error": "Failed to start reformat"}), 500
+
+@app.route('/api/projects/<string:project_id>/reformat', methods=['GET'])
+@require_auth
+def get_project_reformat(project_id):
+    """Progress of the project's latest reformat sweep"""
+    unavailable = reformat_unavailable(project_id)
+    if unavailable:
+        return unavailable
+    progress = formatter_sweeper.status(project_id)
+    if progress is None:
+        return jsonify({"error": "No reformat has been started for this project"}), 404
+    return jsonify(progress), 200
+
+@app.route('/api/projects/<string:project_id>/reformat', methods=['DELETE'])
+@require_auth
+def stop_project_reformat(project_id):
+    """Stop the project's reformat sweep after its current chunk; POST resumes it"""
+    unavailable = reformat_unavailable(project_id)
+    if unavailable:
+        return unavailable
+    progress = formatter_sweeper.stop(project_id)
+    if progress is None:
+        return jsonify({"error": "No reformat has been started for this project"}), 404
+    return jsonify(progress), 200
+
+@app.route('/api/projects/<string:project_id>/footnotes', methods=['POST'])
+@require_auth
+def render_project_footnotes(project_id):
+    """
+    Render an ordered list of footnote references to this project's citations,
+    using the full, ibid or subsequent form as AGLC4 requires.
+    Expects {"references": [{"citation_id": ..., "pinpoint": ...}, ...]}
+    """
+    try:
+        data = request.json
+        if not data or 'references' not in data:
+            return jsonify({"error": "references is required"}), 400
+
+        token = request.headers.get('Authorization').split(' ')[1]
+        citation_service.set_access_token(token)
+
+        citations = {
+            record['id']: record
+            for record in citation_service.get_citation_records(project_id=project_id)
+        }
+        references = [(ref['citation_id'], ref.get('pinpoint')) for ref in data['references']]
+        unknown = sorted({cid for cid, _ in references if cid not in citations})
+        if unknown:
+            return jsonify({"error": f"Unknown citations: {', '.join(unknown)}"}), 400
+
+        sequence = FootnoteSequence(citations, references, formatter=aglc_formatter)
+        return jsonify([
+            {
+                "number": position + 1,
+                "citation_id": citation_id,
+                "form": sequence.form(position),
+                "text": sequence[position]
+            }
+            for position, (citation_id, _) in enumerate(sequence.references)
+        ]), 200
+    except KeyError as e:
+        return jsonify({"error": f"Missing required field: {str(e)}"}), 400
+    except Exception as e:
+        app.logger.error(f"Error rendering footnotes for project {project_id}: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/projects/<string:project_id>/references', methods=['GET'])
+@require_auth
+def get_project_references(project_id):
+    """
+    The project's stored references in footnote order, each rendered in its
+    full, ibid or subsequent form. Every cited source is formatted once,
+    however many references with different pinpoints cite it.
+    """
+    try:
+        token = request.headers.get('Authorization').split(' ')[1]
+        citation_service.set_access_token(token)
+        reference_service.set_access_token(token)
+
+        citations = {
+            record['id']: record
+            for record in citation_service.get_citation_records(project_id=project_id)
+        }
+        # References to deleted citations are left out
+        references = [
+            reference for reference in reference_service.get_references(project_id)
+            if reference.citation_id in citations
+        ]
+        sequence = FootnoteSequence(
+            citations,
+            [(reference.citation_id, reference.pinpoint) for reference in references],
+            formatter=aglc_formatter
+        )
+        return jsonify([
+            {
+                **reference.dict(),
+                "number": position + 1,
+                "form": sequence.form(position),
+                "text": sequence[position]
+            }
+            for position, reference in enumerate(references)
+        ]), 200
+    except KeyError as e:
+        return jsonify({"error": f"Missing required field: {str(e)}"}), 400
+    except Exception as e:
+        app.logger.error(f"Error fetching references for project {project_id}: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/projects/<string:project_id>/references', methods=['POST'])
+@require_auth
+def create_reference(project_id):
+    """
+    Cite one of the project's citations again, with its own pinpoint.
+    Expects {"citation_id": ..., "pinpoint": ..., "position": ...}; without a
+    position the reference becomes the last footnote.
+    """
+    try:
+        data = request.json
+        if not data or 'citation_id' not in data:
+            return jsonify({"error": "citation_id is required"}), 400
+
+        token = request.headers.get('Authorization').split(' ')[1]
+        citation_service.set_access_token(token)
+        reference_service.set_access_token(token)
+
+        if citation_service.get_citation_project(data['citation_id']) != project_id:
+            return jsonify({"error": "Citation not found in this project"}), 404
+
+        reference = reference_service.create_reference({**data, 'project_id': project_id})
+        return jsonify(reference.dict()), 201
+    except Exception as e:
+        app.logger.error(f"Error creating reference: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/references/<string:reference_id>', methods=['PUT'])
+@require_auth
+def update_reference(reference_id):
+    """Change a reference's pinpoint or position"""
+    try:
+        token = request.headers.get('Authorization').split(' ')[1]
+        reference_service.set_access_token(token)
+        reference = reference_service.update_reference(reference_id, request.json or {})
+        return jsonify(reference.dict()), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        app.logger.error(f"Error updating reference: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/references/<string:reference_id>', methods=['DELETE'])
+@require_auth
+def delete_reference(reference_id):
+    try:
+        token = request.headers.get('Authorization').split(' ')[1]
+        reference_service.set_access_token(token)
+        reference_service.delete_reference(reference_id)
+        return jsonify({"message": "Reference deleted successfully"}), 200
+    except Exception as e:
+        app.logger.error(f"Error deleting reference: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/citations/<string:citation_id>/tags', methods=['POST'])
 @require_auth
 def add_citation_tag(citation_id):
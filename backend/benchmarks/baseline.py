@@ -0,0 +1,29 @@
+"""
+Backend modules as they were at an earlier git revision, loaded from the
+repository's history for parity checks and benchmarks against the current
+code. Needs a checkout with that history.
+"""
+import importlib.util
+import os
+import subprocess
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def git(*args):
+    return subprocess.run(['git', *args], cwd=BACKEND_DIR, check=True, capture_output=True, text=True).stdout
+
+def first_revision():
+    """The repository's first commit"""
+    return git('rev-list', '--max-parents=0', 'HEAD').split()[0]
+
+def load_module(path, revision):
+    """The backend module at path, e.g. 'utils/citation_extractor.py', as it is at a git revision"""
+    source = git('show', f'{revision}:./{path}')
+    package, _, name = path[:-len('.py')].rpartition('/')
+    # Loaded as a module of its package so any relative imports resolve
+    spec = importlib.util.spec_from_loader(f"{package.replace('/', '.')}._baseline_{name}", loader=None)
+    module = importlib.util.module_from_spec(spec)
+    module.__package__ = package.replace('/', '.')
+    exec(compile(source, f'{revision}:{path}', 'exec'), module.__dict__)
+    return module
@@ -0,0 +1,86 @@
+"""
+Throughput benchmark for CitationExtractor.
+
+Extracts every paste in benchmarks.samples.SAMPLE_PASTES with
+utils/citation_extractor.py as it is at a baseline git revision (by default
+the repository's first commit) and with the current one (result cache
+disabled), reports pastes per second per source type (fastest of --repeat
+runs), and lists any paste whose extracted fields differ. It also times
+source type auto-detection and lists pastes detected as another source.
+
+Usage (from the backend directory):
+    python -m benchmarks.extraction [--baseline REV] [--number N] [--repeat N]
+"""
+import argparse
+import timeit
+
+from utils.citation_extractor import CitationExtractor, detect_source_type
+from benchmarks.baseline import first_revision, git, load_module
+from benchmarks.samples import SAMPLE_PASTES
+
+
+def baseline_extractor(revision):
+    """A CitationExtractor built from utils/citation_extractor.py at a git revision"""
+    return load_module('utils/citation_extractor.py', revision).CitationExtractor()
+
+def run(baseline, number, repeat):
+    legacy, current = baseline_extractor(baseline), CitationExtractor(cache_size=0)
+    results, differences = [], []
+    for source_type, pastes in SAMPLE_PASTES.items():
+        for text in pastes:
+            expected = legacy.extract_citation(source_type, text)
+            actual = current.extract_citation(source_type, text)
+            if expected != actual:
+                differences.append((source_type, text, expected, actual))
+
+        def extract_all(extractor):
+            for text in pastes:
+                extractor.extract_citation(source_type, text)
+
+        count = number * len(pastes)
+        before = min(timeit.repeat(lambda: extract_all(legacy), number=number, repeat=repeat))
+        after = min(timeit.repeat(lambda: extract_all(current), number=number, repeat=repeat))
+        results.append((source_type, count / before, count / after))
+    return results, differences
+
+def run_detection(number, repeat):
+    pastes = [(source_type, text) for source_type, texts in SAMPLE_PASTES.items() for text in texts]
+
+    def detect_all():
+        for _, text in pastes:
+            detect_source_type(text)
+
+    seconds = min(timeit.repeat(detect_all, number=number, repeat=repeat))
+    misdetected = [
+        (source_type, detect_source_type(text), text)
+        for source_type, text in pastes if detect_source_type(text) != source_type
+    ]
+    return seconds / (number * len(pastes)) * 1e6, misdetected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--baseline', help='git revision to compare against (default: the first commit)')
+    parser.add_argument('--number', type=int, default=1000, help='passes over the sample pastes per run')
+    parser.add_argument('--repeat', type=int, default=5, help='runs, of which the fastest is reported')
+    args = parser.parse_args()
+
+    baseline = args.baseline or first_revision()
+    results, differences = run(baseline, args.number, args.repeat)
+    print(f"baseline: {git('log', '-1', '--format=%h %s', baseline).strip()}\n")
+    print(f"{'source type':<20}{'before (/s)':>14}{'after (/s)':>14}{'speed-up':>10}")
+    for source_type, before, after in results:
+        print(f"{source_type:<20}{before:>14.0f}{after:>14.0f}{after / before:>9.1f}x")
+    for source_type, text, expected, actual in differences:
+        print(f"\n{source_type} differs for: {text}")
+        print(f"  before: {expected}")
+        print(f"  after:  {actual}")
+
+    us_per_paste, misdetected = run_detection(args.number, args.repeat)
+    print(f"\nauto-detect: {us_per_paste:.1f} us per paste")
+    for source_type, detected, text in misdetected:
+        print(f"  {source_type} detected as {detected}: {text}")
+
+
+if __name__ == '__main__':
+    main()
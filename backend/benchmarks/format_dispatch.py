@@ -0,0 +1,51 @@
+"""
+Micro-benchmark for AGLC4Citation.format_citation dispatch.
+
+Compares the per-call cost of the original dispatch (formatting table and
+inspect.signature() rebuilt on every call, loaded from git history by
+benchmarks.format_templates) with the import-time FORMATTER_REGISTRY, for
+every citation type. The memo cache is disabled so every call formats.
+
+Usage (from the backend directory):
+    python -m benchmarks.format_dispatch [--number N]
+"""
+import argparse
+import timeit
+
+from utils.formatcitation import AGLC4Citation, FORMATTER_REGISTRY
+from benchmarks.format_templates import LegacyAGLC4Citation
+from benchmarks.samples import sample_row
+
+# The dispatch format_citation used before the registry was introduced
+legacy_format_citation = LegacyAGLC4Citation().format_citation
+
+
+def run(number):
+    formatter = AGLC4Citation(cache_size=0)
+    results = []
+    for citation_type in FORMATTER_REGISTRY:
+        row = sample_row(citation_type)
+        if legacy_format_citation(citation_type, **row) != formatter.format_citation(citation_type, **row):
+            raise AssertionError(f"Output differs for {citation_type}")
+        before = timeit.timeit(lambda: legacy_format_citation(citation_type, **row), number=number)
+        after = timeit.timeit(lambda: formatter.format_citation(citation_type, **row), number=number)
+        results.append((citation_type, before / number * 1e6, after / number * 1e6))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=2000, help='calls per citation type')
+    args = parser.parse_args()
+
+    results = run(args.number)
+    print(f"{'citation type':<36}{'before (us)':>12}{'after (us)':>12}{'speed-up':>10}")
+    for citation_type, before, after in results:
+        print(f"{citation_type:<36}{before:>12.2f}{after:>12.2f}{before / after:>9.1f}x")
+    total_before = sum(r[1] for r in results)
+    total_after = sum(r[2] for r in results)
+    print(f"{'all types':<36}{total_before:>12.2f}{total_after:>12.2f}{total_before / total_after:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark for the declarative citation templates.
+
+For every citation type, formats a full sample row and a sparse one (every
+other field removed) with the hand-written function the template replaced and
+with the compiled template, and reports the per-call cost of each. The
+functions are loaded from utils/formatcitation.py at the repository's first
+commit. Rows whose output differs are marked: the templates fix the functions'
+date handling (see utils/dates.py), so sparse rows of a few types are expected
+to differ. The specialisation cost of a template (paid once per presence
+pattern) is reported separately.
+
+Usage (from the backend directory):
+    python -m benchmarks.format_templates [--number N]
+"""
+import argparse
+import ast
+import inspect
+import time
+import timeit
+
+from utils.formatcitation import FORMATTER_REGISTRY, finalize_citation
+from utils.templates import Template
+from benchmarks.baseline import first_revision, git, load_module
+from benchmarks.samples import SAMPLE_CITATIONS
+
+LEGACY_PATH = 'utils/formatcitation.py'
+_legacy_revision = first_revision()
+_legacy = load_module(LEGACY_PATH, _legacy_revision)
+
+# The hand-written formatter class, with its original format_citation dispatch
+LegacyAGLC4Citation = _legacy.AGLC4Citation
+
+
+def _legacy_functions():
+    # The formatting_functions table LegacyAGLC4Citation.format_citation builds on
+    # every call. It formats the online legal encyclopedia inline instead, so that
+    # type is left to the class.
+    tree = ast.parse(git('show', f'{_legacy_revision}:./{LEGACY_PATH}'))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], 'id', None) == 'formatting_functions':
+            return {
+                key.value: getattr(_legacy, value.id)
+                for key, value in zip(node.value.keys, node.value.values)
+                if key.value != 'online_legal_encyclopedia'
+            }
+    raise ValueError(f"No formatting_functions table in {LEGACY_PATH} at {_legacy_revision}")
+
+# The formatting function for each citation type
+LEGACY_FUNCTIONS = _legacy_functions()
+
+
+def legacy_formatter(citation_type):
+    """The hand-written formatter for citation_type, taking the row's fields as kwargs"""
+    function = LEGACY_FUNCTIONS.get(citation_type)
+    if function is None:
+        legacy = LegacyAGLC4Citation()
+        return lambda **fields: legacy.format_citation(citation_type, **fields)
+    params = inspect.signature(function).parameters
+
+    def format_legacy(**fields):
+        return finalize_citation(function(**{k: v for k, v in fields.items() if k in params}))
+    return format_legacy
+
+
+def variants(citation_type):
+    full = SAMPLE_CITATIONS[citation_type]
+    sparse = {name: value for i, (name, value) in enumerate(full.items()) if i % 2 == 0}
+    return (('full', full), ('sparse', sparse))
+
+
+def run(number):
+    results = []
+    for citation_type, entry in FORMATTER_REGISTRY.items():
+        legacy = legacy_formatter(citation_type)
+        for variant, row in variants(citation_type):
+            same = legacy(**row) == entry.format(row)
+            before = timeit.timeit(lambda: legacy(**row), number=number)
+            after = timeit.timeit(lambda: entry.format(row), number=number)
+            results.append((f"{citation_type} ({variant})", before / number * 1e6, after / number * 1e6, same))
+    return results
+
+
+def specialisation_cost():
+    """Mean cost in microseconds of compiling a template for a new presence pattern"""
+    count = 0
+    start = time.perf_counter()
+    for citation_type, entry in FORMATTER_REGISTRY.items():
+        for _, row in variants(citation_type):
+            template = Template(*entry.template.elements, transforms=entry.template.transforms)
+            template.render(row)
+            count += 1
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=2000, help='calls per citation type and variant')
+    args = parser.parse_args()
+
+    results = run(args.number)
+    print(f"{'citation type':<46}{'function (us)':>14}{'template (us)':>14}{'speed-up':>10}")
+    for label, before, after, same in results:
+        marker = '' if same else '  (output differs)'
+        print(f"{label:<46}{before:>14.2f}{after:>14.2f}{before / after:>9.1f}x{marker}")
+    total_before = sum(r[1] for r in results)
+    total_after = sum(r[2] for r in results)
+    print(f"{'all types':<46}{total_before:>14.2f}{total_after:>14.2f}{total_before / total_after:>9.1f}x")
+    print(f"specialisation per presence pattern: {specialisation_cost():.1f} us (once per pattern)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+"""
+Benchmark suite for utils.formatcitation across every citation type.
+
+Each type in FORMATTER_REGISTRY is formatted with three inputs:
+    sparse        only the first field the type's template reads
+    full          every field the template reads (benchmarks.samples)
+    pathological  every field, with 50 names in name lists and 2000 character
+                  strings, to show how cost grows with input size
+
+For each type and input it measures the latency per call (median of
+--repeat runs of --number calls, memo cache disabled) and, under tracemalloc,
+the peak memory one call allocates. Runs offline; nothing touches Supabase.
+
+The report is printed as a table and can be saved as JSON with --json. Pass
+a saved report to --compare to print the change per type and input; runs
+slower than --threshold (default 10%) are listed as regressions and the
+process exits with status 1.
+
+Usage (from the backend directory):
+    python -m benchmarks.formatter_suite [--number N] [--repeat N] [--types a,b]
+        [--json report.json] [--compare baseline.json] [--threshold 0.1]
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+import tracemalloc
+
+from utils.formatcitation import AGLC4Citation, FORMATTER_REGISTRY, FORMATTER_VERSION
+from benchmarks.samples import SAMPLE_CITATIONS
+
+VARIANTS = ('sparse', 'full', 'pathological')
+
+PATHOLOGICAL_NAMES = 50
+PATHOLOGICAL_LENGTH = 2000
+
+
+def sparse_fields(citation_type):
+    sample = SAMPLE_CITATIONS[citation_type]
+    first = next((name for name in FORMATTER_REGISTRY[citation_type].params if sample.get(name)), None)
+    return {first: sample[first]} if first else {}
+
+def full_fields(citation_type):
+    return dict(SAMPLE_CITATIONS[citation_type])
+
+def pathological_fields(citation_type):
+    fields = {}
+    for name, value in SAMPLE_CITATIONS[citation_type].items():
+        if isinstance(value, list):
+            fields[name] = [f"Given{i} Middle{i} Family-Name{i}" for i in range(PATHOLOGICAL_NAMES)]
+        elif isinstance(value, str) and value and not name.endswith('date'):
+            # Repeated with accents and markup characters so escaping paths are exercised too
+            fields[name] = ('Ünïcödé & <markup> ' + value + ' ') * (PATHOLOGICAL_LENGTH // (len(value) + 21) + 1)
+            fields[name] = fields[name][:PATHOLOGICAL_LENGTH]
+        else:
+            fields[name] = value
+    return fields
+
+INPUTS = {'sparse': sparse_fields, 'full': full_fields, 'pathological': pathological_fields}
+
+
+def measure(formatter, citation_type, fields, number, repeat):
+    def call():
+        return formatter.format_citation(citation_type, **fields)
+
+    try:
+        call()
+    except Exception as e:
+        return {'error': f"{type(e).__name__}: {e}"}
+
+    timings = timeit.repeat(call, number=number, repeat=repeat)
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        output = call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'us_per_call': statistics.median(timings) / number * 1e6,
+        'min_us_per_call': min(timings) / number * 1e6,
+        'peak_bytes': peak - before,
+        'output_length': len(output),
+    }
+
+def run(types, number, repeat):
+    formatter = AGLC4Citation(cache_size=0)
+    results = {}
+    for citation_type in types:
+        results[citation_type] = {
+            variant: measure(formatter, citation_type, INPUTS[variant](citation_type), number, repeat)
+            for variant in VARIANTS
+        }
+    return {
+        'meta': {
+            'commit': _commit(),
+            'formatter_version': FORMATTER_VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'number': number,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+def _commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report):
+    print(f"{'citation type':<36}{'input':<14}{'us/call':>10}{'peak bytes':>12}")
+    for citation_type, variants in report['results'].items():
+        for variant, result in variants.items():
+            if 'error' in result:
+                print(f"{citation_type:<36}{variant:<14}  error: {result['error']}")
+                continue
+            print(f"{citation_type:<36}{variant:<14}{result['us_per_call']:>10.2f}{result['peak_bytes']:>12}")
+
+def compare(baseline, report, threshold):
+    """Print the change against a baseline report; returns the regressions"""
+    print(f"\ncompared with {baseline['meta'].get('commit') or 'baseline'}")
+    print(f"{'citation type':<36}{'input':<14}{'before':>10}{'after':>10}{'change':>9}{'peak change':>13}")
+    regressions = []
+    for citation_type, variants in report['results'].items():
+        for variant, result in variants.items():
+            before = baseline['results'].get(citation_type, {}).get(variant)
+            if not before or 'error' in before or 'error' in result:
+                continue
+            change = result['us_per_call'] / before['us_per_call'] - 1
+            peak_change = result['peak_bytes'] - before['peak_bytes']
+            flag = ' !' if change > threshold else ''
+            print(
+                f"{citation_type:<36}{variant:<14}{before['us_per_call']:>10.2f}{result['us_per_call']:>10.2f}"
+                f"{change:>+9.0%}{peak_change:>+13}{flag}"
+            )
+            if change > threshold:
+                regressions.append((citation_type, variant, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=500, help='calls per timing run')
+    parser.add_argument('--repeat', type=int, default=5, help='timing runs per type and input')
+    parser.add_argument('--types', help='comma-separated citation types (default: all)')
+    parser.add_argument('--json', dest='json_path', help='write the report to this file')
+    parser.add_argument('--compare', help='baseline report to compare with')
+    parser.add_argument('--threshold', type=float, default=0.1, help='slow-down reported as a regression')
+    args = parser.parse_args()
+
+    types = [t.strip() for t in args.types.split(',')] if args.types else list(FORMATTER_REGISTRY)
+    unknown = [t for t in types if t not in FORMATTER_REGISTRY]
+    if unknown:
+        parser.error(f"Unsupported citation type: {', '.join(unknown)}")
+
+    report = run(types, args.number, args.repeat)
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressions over {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
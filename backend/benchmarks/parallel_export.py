@@ -0,0 +1,76 @@
+"""
+Benchmark for process-pool bibliography exports.
+
+Formats a synthetic bibliography of padded rows (distinct citations cycling
+through every type) in-process and with ParallelFormatter at increasing worker
+counts, checks the results match, and reports the wall time and speed-up.
+Worker start-up is excluded by warming each pool first.
+
+Usage (from the backend directory):
+    python -m benchmarks.parallel_export [--count N] [--chunk-size N] [--workers 1,2,4,8,16]
+"""
+import argparse
+import os
+import time
+
+from utils.formatcitation import AGLC4Citation, FORMATTER_REGISTRY
+from utils.parallel_format import DEFAULT_CHUNK_SIZE, ParallelFormatter
+from benchmarks.samples import sample_row
+
+
+def bibliography(count):
+    types = list(FORMATTER_REGISTRY)
+    rows = []
+    for i in range(count):
+        row = sample_row(types[i % len(types)])
+        row['id'] = str(i)
+        # Make every citation distinct so the memo caches do not help
+        row['pinpoint'] = str(i)
+        rows.append(row)
+    return rows
+
+
+def timed(format_many, rows):
+    start = time.perf_counter()
+    results = format_many(rows)
+    return time.perf_counter() - start, results
+
+
+def run(count, chunk_size, worker_counts):
+    rows = bibliography(count)
+    baseline, expected = timed(lambda r: list(AGLC4Citation().format_many(r)), rows)
+    results = [('in-process', baseline)]
+    for workers in worker_counts:
+        formatter = ParallelFormatter(AGLC4Citation(), workers=workers, chunk_size=chunk_size, threshold=0)
+        try:
+            formatter.format_many(rows[:workers * chunk_size])
+            elapsed, actual = timed(formatter.format_many, rows)
+        finally:
+            formatter.shutdown()
+        if actual != expected:
+            raise AssertionError(f"Results differ with {workers} workers")
+        results.append((f"{workers} workers", elapsed))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=50000, help='citations in the bibliography')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='citations per work unit')
+    parser.add_argument('--workers', default=None, help='comma-separated worker counts')
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    worker_counts = [int(w) for w in args.workers.split(',')] if args.workers \
+        else [w for w in (2, 4, 8, 16) if w <= cpus] or [2]
+
+    results = run(args.count, args.chunk_size, worker_counts)
+    baseline = results[0][1]
+    print(f"{args.count} citations, chunks of {args.chunk_size}, {cpus} CPUs")
+    print(f"{'path':<16}{'time (s)':>10}{'speed-up':>10}")
+    for label, elapsed in results:
+        print(f"{label:<16}{elapsed:>10.3f}{baseline / elapsed:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+"""
+Representative citation fields for every supported citation type.
+Shared by the benchmarks in this package; run them from the backend directory.
+"""
+
+SAMPLE_CITATIONS = {
+    'case_reported': {
+        'case_name': 'Mabo v Queensland (No 2)', 'year': '(1992)', 'volume': '175',
+        'law_report_series': 'CLR', 'starting_page': '1', 'pinpoint': '42',
+    },
+    'case_unreported_medium_neutral': {
+        'case_name': 'Pell v The Queen', 'year': '[2020]', 'court_identifier': 'HCA',
+        'judgment_number': '12', 'pinpoint': '[5]',
+    },
+    'case_unreported_no_medium_neutral': {
+        'case_name': 'R v Smith', 'court': 'Supreme Court of Victoria', 'judge': 'Vincent J',
+        'full_date': '05 March 1998', 'pinpoint': '4',
+    },
+    'act': {
+        'title': 'Competition and Consumer Act', 'year': '2010', 'jurisdiction': 'Cth', 'pinpoint': 's 4',
+    },
+    'bill': {
+        'title': 'Online Safety Bill', 'year': '2021', 'jurisdiction': 'Cth', 'pinpoint': 'cl 5',
+    },
+    'explanatory_memorandum': {
+        'explanatory_type': 'Explanatory Memorandum', 'bill_citation': 'Online Safety Bill 2021 (Cth)',
+        'pinpoint': '12',
+    },
+    'hansard': {
+        'jurisdiction': 'Commonwealth', 'chamber': 'House of Representatives',
+        'full_date': '1 January 2024', 'pinpoint': '18', 'name_of_speaker': 'Anthony Albanese',
+    },
+    'treaty': {
+        'treaty_title': 'Vienna Convention on the Law of Treaties', 'parties_names': '',
+        'signature_date': '23 May 1969', 'treaty_series': '1155 UNTS 331',
+        'entry_force_date': '27 January 1980', 'pinpoint': 'art 31',
+    },
+    'journal_article': {
+        'authors': ['Cheryl Saunders', 'Adrienne Stone'], 'title': 'Reference to Foreign Precedents',
+        'year': '(2014)', 'volume': '38', 'issue': '2', 'journal': 'Melbourne University Law Review',
+        'starting_page': '457', 'pinpoint': '460',
+    },
+    'book': {
+        'authors': ['Peter Hanks', 'Frances Gordon', 'Graeme Hill'], 'title': 'Constitutional Law in Australia',
+        'publisher': 'LexisNexis Butterworths', 'edition': '4th', 'year': '2018', 'volume': '1', 'pinpoint': '55',
+    },
+    'book_chapter': {
+        'authors': ['Kristen Rundle'], 'chapter_title': 'Legal Forms', 'editors': ['Cheryl Saunders', 'Adrienne Stone'],
+        'book_title': 'The Oxford Handbook of the Australian Constitution', 'publisher': 'Oxford University Press',
+        'edition': '1st', 'year': '2018', 'volume': '2', 'starting_page': '85', 'pinpoint': '90',
+    },
+    'report': {
+        'author': 'Australian Law Reform Commission', 'title': 'Traditional Rights and Freedoms',
+        'document_type': 'Report', 'series_no': 'ALRC Report', 'document_number': '129',
+        'full_date': '2 March 2016', 'pinpoint': '[4.1]',
+    },
+    'online_dictionary': {
+        'title': 'Macquarie Dictionary', 'retrieval_date': '1 January 2024', 'entry_title': 'law',
+        'definition_number': '2',
+    },
+    'hardcopy_dictionary': {
+        'title': 'Oxford English Dictionary', 'edition': '2nd', 'year': '1989', 'entry_title': 'citation',
+        'definition_number': '3',
+    },
+    'online_legal_encyclopedia': {
+        'publisher': 'LexisNexis', 'title': 'Halsbury’s Laws of Australia', 'retrieval_date': '1 January 2024',
+        'title_number': '90', 'title_name': 'Courts and Judicial System', 'chapter_number': 'I',
+        'chapter_name': 'Introduction', 'paragraph': '90-1',
+    },
+    'hardcopy_legal_encyclopedia': {
+        'publisher': 'LexisNexis', 'title': 'Halsbury’s Laws of Australia', 'volume': '10',
+        'full_date': '1 January 2024', 'title_number': '90', 'title_name': 'Courts and Judicial System',
+        'chapter_number': 'I', 'chapter_name': 'Introduction', 'paragraph': '90-1',
+    },
+    'online_looseleaf': {
+        'author': 'Ian Spry', 'publisher': 'Thomson Reuters', 'title': 'Equitable Remedies',
+        'retrieval_date': '1 January 2024', 'pinpoint': '[3.10]',
+    },
+    'hardcopy_looseleaf': {
+        'author': 'Ian Spry', 'publisher': 'Thomson Reuters', 'title': 'Equitable Remedies', 'volume': '1',
+        'service_number': 'Service 120', 'full_date': '1 January 2024', 'pinpoint': '[3.10]',
+    },
+    'online_newspaper': {
+        'author': 'Jane Smith', 'title': 'High Court Rules on Native Title', 'newspaper': 'The Age',
+        'full_date': '4 June 2023', 'pinpoint': '3', 'url': 'https://www.theage.com.au/article',
+    },
+    'printed_newspaper': {
+        'author': 'Jane Smith', 'title': 'High Court Rules on Native Title', 'newspaper': 'The Age',
+        'place': 'Melbourne', 'full_date': '4 June 2023', 'starting_page': '1', 'pinpoint': '3',
+    },
+    'internet_material': {
+        'author': 'Attorney-General’s Department', 'document_title': 'Privacy Act Review',
+        'web_page_title': 'Attorney-General’s Department', 'document_type': 'Web Page',
+        'full_date': '16 February 2023', 'pinpoint': '2', 'url': 'https://www.ag.gov.au/privacy',
+    },
+    'proceeding': {
+        'case_name': 'Smith v Jones', 'court': 'Federal Court of Australia', 'proceeding_number': 'VID123/2023',
+        'full_date': '1 March 2023',
+    },
+    'court_order': {
+        'judicial_officers': 'Mortimer J', 'case_name': 'Smith v Jones', 'court': 'Federal Court of Australia',
+        'proceeding_number': 'VID123/2023', 'full_date': '1 March 2023',
+    },
+    'arbitration': {
+        'case_name': 'Methanex Corporation v United States of America', 'award_description': 'Final Award',
+        'forum': 'UNCITRAL', 'case_award_number': 'No 1', 'full_date': '3 August 2005', 'pinpoint': '[12]',
+    },
+    'transcript_of_proceedings': {
+        'case_name': 'R v Smith', 'court': 'Supreme Court of Victoria', 'proceeding_number': 'S CR 2023 0001',
+        'judicial_officers': 'Beach J', 'full_date': '1 March 2023', 'pinpoint': '12',
+    },
+    'high_court_transcript': {
+        'case_name': 'Love v Commonwealth', 'year': '2019', 'number': '135', 'pinpoint': '10',
+    },
+    'submission': {
+        'party_name': 'Commonwealth', 'title': 'Outline of Submissions', 'case_name': 'Love v Commonwealth',
+        'proceeding_number': 'B43/2018', 'full_date': '1 March 2019', 'pinpoint': '[12]',
+    },
+    'delegated_legislation': {
+        'title': 'Corporations Regulations', 'year': '2001', 'jurisdiction': 'Cth', 'pinpoint': 'reg 1.0.02',
+    },
+    'gazette': {
+        'authors': ['Department of Health'], 'title_of_notice': 'Notice of Determination',
+        'jurisdiction': 'Commonwealth', 'gazette_title': 'Commonwealth of Australia Gazette',
+        'gazette_number': 'GN 12', 'full_date': '1 March 2023', 'starting_page': '101', 'pinpoint': '102',
+    },
+    'order_or_ruling': {
+        'instrumentality_officer': 'Australian Taxation Office', 'instrument_title': 'Taxation Ruling',
+        'document_number': 'TR 2023/1', 'full_date': '1 March 2023', 'pinpoint': '[12]',
+    },
+    'court_practice_direction': {
+        'court': 'Federal Court of Australia', 'practice_direction': 'Practice Note',
+        'number_identifier': 'GPN-1', 'title': 'Central Practice Note', 'citation_report_series': '',
+        'full_date': '25 October 2016', 'pinpoint': '[4]',
+    },
+    'symposium': {
+        'title': 'The Future of Federalism', 'year': '(2019)', 'volume': '47', 'issue': '1',
+        'journal': 'Federal Law Review', 'starting_page': '1', 'pinpoint': '3',
+    },
+    'book_with_editor': {
+        'authors': ['John Locke'], 'title': 'Two Treatises of Government', 'editors': ['Peter Laslett'],
+        'publisher': 'Cambridge University Press', 'edition': '2nd', 'year': '1967', 'pinpoint': '15',
+    },
+    'translated_book': {
+        'authors': ['Hans Kelsen'], 'translation_title': 'Pure Theory of Law', 'translator': 'Max Knight',
+        'publisher': 'University of California Press', 'edition': '2nd', 'year': '1967', 'pinpoint': '8',
+    },
+    'audiobook': {
+        'authors': ['Michael Kirby'], 'title': 'A Private Life', 'publisher': 'Audible', 'year': '2011', 'pinpoint': '2:10',
+    },
+    'research_paper': {
+        'author': 'Jane Smith', 'title': 'Judicial Review in Australia', 'document_type': 'Research Paper',
+        'document_number': '21-04', 'institution': 'University of Melbourne', 'full_date': '1 March 2021',
+        'pinpoint': '7',
+    },
+    'speech': {
+        'author': 'Susan Kiefel', 'title': 'The Rule of Law', 'speech_or_lecture': 'Speech',
+        'institution_forum': 'Law Council of Australia', 'full_date': '1 March 2021', 'pinpoint': '4',
+    },
+    'press_and_media_release': {
+        'author': 'Attorney-General', 'title': 'New Federal Court Judges', 'release_type': 'Media Release',
+        'document_number': 'MR 12', 'body': 'Attorney-General’s Department', 'full_date': '1 March 2021',
+        'pinpoint': '2',
+    },
+    'periodical': {
+        'author': 'Jane Smith', 'title': 'Reforming Defamation', 'date_month_season': 'Winter 2021',
+        'periodical_name': 'Law Society Journal', 'pinpoint': '22',
+    },
+    'interview': {
+        'format': 'Interview', 'interviewee': 'Michael Kirby', 'interviewer': 'Jane Smith',
+        'interview_forum': 'ABC Radio National', 'full_date': '1 March 2021',
+    },
+    'film_television_media': {
+        'episode_title': 'The Verdict', 'film_series_title': 'Rake', 'version_details': 'Season 1',
+        'studio_producer': 'ABC', 'year': '2010', 'pinpoint': '00:12:30',
+    },
+    'social_media_post': {
+        'username': '@HCA', 'title': 'Judgment in Love v Commonwealth', 'platform': 'X',
+        'full_date': '11 February 2020', 'time': '10.15 am', 'url': 'https://x.com/hca/status/1',
+    },
+    'written_correspondence': {
+        'correspondence_type': 'Letter', 'author': 'Jane Smith', 'recipient': 'John Doe',
+        'full_date': '1 March 2021', 'pinpoint': '2',
+    },
+    'custom': {
+        'formatted_citation': 'Custom citation text',
+    },
+}
+
+# Number of unrelated columns on a stored citation row; format_citation is
+# called with the whole row, so the benchmarks pad the samples to match.
+ROW_PADDING = 100
+
+def sample_row(citation_type):
+    """Return the sample for citation_type shaped like a stored citation row"""
+    row = {f'column_{i}': None for i in range(ROW_PADDING)}
+    row.update({'id': f'sample-{citation_type}', 'project_id': 'sample-project', 'type': citation_type})
+    row.update(SAMPLE_CITATIONS[citation_type])
+    return row
+
+
+# Pasted citations as copied from each supported source, by source type
+SAMPLE_PASTES = {
+    'westlaw_case': [
+        'Mabo v Queensland (No 2) (1992) 175 CLR 1, 42',
+        'Pell v The Queen [2020] HCA 12, 5',
+        'Commonwealth v Tasmania (1983) 158 CLR 1',
+        'Donoghue v Stevenson [1932] AC 562, 580',
+        'Australian Capital Television Pty Ltd v Commonwealth (1992) 177 CLR 106, 138',
+        'R v Tang [2008] HCA 39',
+        'Lange v Australian Broadcasting Corporation (1997) 189 CLR 520',
+        'Smith v Jones (2019) 93 ALJR 1, 14',
+    ],
+    'lexisnexis_case': [
+        'Mabo v Queensland (No 2) (1992) 175 CLR 1; 107 ALR 1; [1992] HCA 23; BC9202681',
+        'Pell v The Queen [2020] HCA 12; (2020) 268 CLR 123; 376 ALR 478; BC202002455',
+        'R v Smith BC201912345',
+        'Kable v Director of Public Prosecutions (NSW) (1996) 189 CLR 51; 138 ALR 577; BC9604462',
+        'Re Wakim; Ex parte McNally [1999] HCA 27; BC9903140',
+        'Doe v Roe [2021] NSWSC 1001; BC202108123',
+    ],
+    'jade_case': [
+        'Mabo v Queensland (No 2) [1992] HCA 23; (1992) 175 CLR 1; [1992] JADE 36',
+        'Pell v The Queen [2020] HCA 12; [2020] JADE 4',
+        'Commonwealth v Tasmania [1983] HCA 21; (1983) 158 CLR 1',
+        'Smith v Jones [2001] HCA 5; (2001) 205 CLR 1',
+        'Re Application [2015] JADE 77',
+    ],
+    'ssrn_article': [
+        'Saunders, Cheryl and Stone, Adrienne, Reference to Foreign Precedents (March 1, 2014). '
+        '38 Melbourne University Law Review 449 (2014), Available at SSRN: https://ssrn.com/abstract=2412345',
+        'Krygier, Martin, Rule of Law (and Rechtsstaat) (May 2, 2013). The Hague Journal on the Rule of Law, '
+        'Vol. 1, 2010, Available at SSRN: https://ssrn.com/abstract=2311874 or http://dx.doi.org/10.2139/ssrn.2311874',
+        'Doe, Jane, A Title (June 3, 2019). Law & Social Inquiry, vol. 44, no 4: 957-986, 2019',
+    ],
+    'scholar_article': [
+        'Saunders, Cheryl, and Adrienne Stone. "Reference to foreign precedents." '
+        'Melbourne University Law Review 38, no. 2 (2014): 449-480.',
+        'Krygier, Martin. "The rule of law: legality, teleology, sociology." Relocating the rule of law 45 (2009): 45-69.',
+    ],
+    'scholar_book': [
+        'Hanks, Peter, Frances Gordon, and Graeme Hill. Constitutional Law in Australia. Vol. 1. LexisNexis Butterworths, 2018.',
+        'Crawford, James. Brownlie\'s principles of public international law. Oxford University Press, 2019.',
+    ],
+}
@@ -0,0 +1,90 @@
+"""
+Throughput and memory benchmark for utils.citation_scanner.
+
+Builds documents of growing size from a judgment-like paragraph, scans each
+with scan_chunks() and reports megabytes per second, citations found and, under
+tracemalloc, the peak memory the scan allocates beyond the document itself.
+Linear time shows as a flat MB/s column and bounded memory as a flat peak.
+First it checks that chunking does not change the result: a sample document
+scanned in chunks of several sizes, down to one character, must give the same
+citations as the document scanned whole.
+
+Usage (from the backend directory):
+    python -m benchmarks.scanner [--sizes 1,2,4,8] [--chunk-size N]
+"""
+import argparse
+import time
+import tracemalloc
+
+from utils.citation_scanner import MAX_CITATION_LENGTH, scan_chunks
+
+PARAGRAPH = (
+    "In Mabo v Queensland (No 2) (1992) 175 CLR 1, 42 the Court considered native title, "
+    "a question later taken up in Wik Peoples v Queensland (1996) 187 CLR 1 and in the "
+    "Native Title Act 1993 (Cth) s 223. See also Pell v The Queen [2020] HCA 12, [42]; "
+    "Re Wakim; Ex parte McNally [1999] HCA 27. The Corporations Regulations 2001 (Cth) "
+    "reg 7.1.04 were not in issue, and nothing turned on the evidence given in 1992 (at "
+    "pages 12 to 40) or on the submissions of the parties about the TRANSCRIPT at 3.\n\n"
+)
+
+# Parallel medium neutral citations, where '[2020]' opens the second citation
+# rather than being a paragraph pinpoint of the first, followed by more text
+# without citations than the scanner's lookahead margin
+STRADDLING_PARAGRAPH = (
+    "Compare Smith v Jones [2019] HCA 1, [2020] HCA 2, where the question was left open "
+    "and the parties were content to argue the appeal on the footing that nothing turned "
+    "on it, a course the court accepted without deciding whether it was correct.\n\n"
+)
+
+# Chunk sizes around the scanner's lookahead margin, where a match straddles chunks
+PARITY_CHUNK_SIZES = (1, 2, 7, MAX_CITATION_LENGTH - 1, MAX_CITATION_LENGTH, MAX_CITATION_LENGTH + 1, 4096)
+
+
+def document(megabytes):
+    return PARAGRAPH * (megabytes * 1_000_000 // len(PARAGRAPH) + 1)
+
+def chunks(text, chunk_size):
+    for i in range(0, len(text), chunk_size):
+        yield text[i:i + chunk_size]
+
+def chunk_size_differences(text):
+    """Chunk sizes whose scan of text differs from scanning it whole"""
+    whole = list(scan_chunks([text]))
+    return [size for size in PARITY_CHUNK_SIZES if list(scan_chunks(chunks(text, size))) != whole]
+
+def measure(text, chunk_size):
+    started = time.perf_counter()
+    found = sum(1 for _ in scan_chunks(chunks(text, chunk_size)))
+    seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        for _ in scan_chunks(chunks(text, chunk_size)):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, found, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1,2,4,8', help='comma-separated document sizes in MB')
+    parser.add_argument('--chunk-size', type=int, default=1 << 16, help='characters per chunk')
+    args = parser.parse_args()
+
+    differences = chunk_size_differences((PARAGRAPH + STRADDLING_PARAGRAPH) * 10)
+    if differences:
+        print(f"chunk-size parity: FAILED for chunk sizes {', '.join(map(str, differences))}\n")
+    else:
+        print("chunk-size parity: ok\n")
+
+    print(f"{'size (MB)':>10}{'seconds':>10}{'MB/s':>8}{'citations':>12}{'peak bytes':>12}")
+    for megabytes in (int(size) for size in args.sizes.split(',')):
+        text = document(megabytes)
+        seconds, found, peak = measure(text, args.chunk_size)
+        print(f"{len(text) / 1e6:>10.1f}{seconds:>10.2f}{len(text) / 1e6 / seconds:>8.1f}{found:>12}{peak:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Differential replay of a citation corpus through two formatter engines.
+
+Formats every citation with the current AGLC4Citation (memo cache disabled)
+and with a candidate engine, then prints per-type byte-level differences and
+the throughput of each engine. The corpus is a JSON array or JSON lines file
+of stored citation rows, e.g. an export of the citations table. Without one,
+every type's sample fields are replayed with each combination of fields
+present, up to --variants per type.
+
+Usage (from the backend directory):
+    python -m benchmarks.shadow_replay --candidate module:attribute
+        [--corpus rows.jsonl] [--variants N] [--json report.json]
+
+Exits with status 1 when any output differs.
+"""
+import argparse
+import itertools
+import json
+import random
+import sys
+
+from utils.formatcitation import AGLC4Citation
+from utils.shadow import compare_engines, load_engine
+from benchmarks.samples import SAMPLE_CITATIONS
+
+
+def load_corpus(path):
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    if text.lstrip().startswith('['):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def sample_corpus(variants, seed=0):
+    """Each type's sample fields with subsets of them present"""
+    rng = random.Random(seed)
+    corpus = []
+    for citation_type, fields in SAMPLE_CITATIONS.items():
+        names = list(fields)
+        if 2 ** len(names) <= variants:
+            masks = itertools.product((False, True), repeat=len(names))
+        else:
+            masks = ([rng.random() < 0.5 for _ in names] for _ in range(variants))
+        for i, mask in enumerate(masks):
+            row = {name: fields[name] for name, present in zip(names, mask) if present}
+            corpus.append({'id': f"{citation_type}-{i}", 'type': citation_type, **row})
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--candidate', required=True, help='candidate engine as module:attribute')
+    parser.add_argument('--corpus', help='JSON or JSON lines file of citation rows')
+    parser.add_argument('--variants', type=int, default=512, help='field combinations per type without a corpus')
+    parser.add_argument('--json', dest='json_path', help='also write the full report to this file')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else sample_corpus(args.variants)
+    report = compare_engines(corpus, AGLC4Citation(cache_size=0), load_engine(args.candidate))
+
+    print(f"{'citation type':<36}{'count':>7}{'diffs':>7}{'current/s':>12}{'candidate/s':>13}")
+    for citation_type, result in report['types'].items():
+        print(
+            f"{citation_type:<36}{result['count']:>7}{result['diffs']:>7}"
+            f"{result['current_per_second'] or 0:>12.0f}{result['candidate_per_second'] or 0:>13.0f}"
+        )
+    print(
+        f"{'all types':<36}{report['count']:>7}{report['diffs']:>7}"
+        f"{report['current_per_second'] or 0:>12.0f}{report['candidate_per_second'] or 0:>13.0f}"
+    )
+    for citation_type, result in report['types'].items():
+        for example in result['examples']:
+            print(f"\n{citation_type} {example['citation_id']} differs at byte {example['offset']}:")
+            print(f"  current:   {example['expected']}")
+            print(f"  candidate: {example['actual']}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, default=str)
+    sys.exit(1 if report['diffs'] else 0)
+
+
+if __name__ == '__main__':
+    main()
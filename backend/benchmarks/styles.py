@@ -0,0 +1,58 @@
+"""
+Benchmark for multi-style formatting.
+
+Formats padded sample rows of the types every style supports in AGLC4 alone,
+then in AGLC4, OSCOLA and Bluebook in one pass (normalising each citation
+once), and in the three styles one pass at a time. Reports the fastest of
+--repeat runs, per citation and relative to AGLC4 alone.
+
+Rendering is per style, so it dominates both multi-style paths; one pass
+saves only the repeated normalisation.
+
+Usage (from the backend directory):
+    python -m benchmarks.styles [--number N] [--repeat N]
+"""
+import argparse
+import timeit
+
+from utils.styles import STYLES, format_styles
+from benchmarks.samples import sample_row
+
+
+def run(number, repeat):
+    types = [t for t in STYLES['aglc4'].entries if all(style.supports(t) for style in STYLES.values())]
+    rows = [sample_row(t) for t in types]
+    names = list(STYLES)
+
+    def one_pass(style_names):
+        for _ in format_styles(rows, style_names):
+            pass
+
+    def separate_passes():
+        for name in names:
+            one_pass([name])
+
+    timings = [
+        ('aglc4 only', min(timeit.repeat(lambda: one_pass(['aglc4']), number=number, repeat=repeat))),
+        (f"{len(names)} styles, one pass", min(timeit.repeat(lambda: one_pass(names), number=number, repeat=repeat))),
+        (f"{len(names)} styles, separate passes", min(timeit.repeat(separate_passes, number=number, repeat=repeat))),
+    ]
+    per_citation = number * len(rows)
+    return len(rows), [(label, elapsed / per_citation * 1e6) for label, elapsed in timings]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=2000, help='passes over the sample rows')
+    parser.add_argument('--repeat', type=int, default=5, help='runs, of which the fastest is reported')
+    args = parser.parse_args()
+
+    count, results = run(args.number, args.repeat)
+    print(f"{count} citation types supported by every style")
+    print(f"{'path':<32}{'per citation (us)':>18}{'vs aglc4':>10}")
+    for label, micros in results:
+        print(f"{label:<32}{micros:>18.2f}{micros / results[0][1]:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -37,6 +37,14 @@ class Citation(TimestampedModel):
     project_id: str
     type: str
     formatted_citation: Optional[str] = None
+    # FORMATTER_VERSION that produced formatted_citation
+    formatter_version: Optional[int] = None
+    # Bibliography sort key, see utils.bibliography.collation_key
+    collation_key: Optional[str] = None
+    # Parsed author and editor names, see utils.names.structured_names
+    author_names: List[Dict[str, str]] = []
+    editor_names: List[Dict[str, str]] = []
+    name_search: Optional[str] = None
     order: Optional[int] = None
     source: Optional[str] = None
     
@@ -210,6 +218,22 @@ class Citation(TimestampedModel):
         # Remove date conversion since we're storing as strings
         return d
 
+class Reference(TimestampedModel):
+    """
+    One use of a source citation: the footnote it appears in and its own pinpoint.
+    The source's fields stay on its citation row and are formatted once for
+    every reference to it.
+    """
+    id: str = Field(default_factory=lambda: str(uuid4()))
+    project_id: str
+    citation_id: str
+    pinpoint: Optional[str] = None
+    # Order of the reference among the project's footnotes, 0-based
+    position: int
+
+    class Config:
+        from_attributes = True
+
 # Update forward references
 Citation.update_forward_refs()
 Project.update_forward_refs() 
\ No newline at end of file
@@ -1,5 +1,7 @@
-from .citation_service import CitationService
+from .citation_service import CitationChanged, CitationService
+from .formatter_sweeper import FormatterSweeper
 from .project_service import ProjectService
+from .reference_service import ReferenceService
 from .tag_service import TagService
 
-__all__ = ['CitationService', 'ProjectService', 'TagService'] 
\ No newline at end of file
+__all__ = ['CitationChanged', 'CitationService', 'FormatterSweeper', 'ProjectService', 'ReferenceService', 'TagService'] 
\ No newline at end of file
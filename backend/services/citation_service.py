@@ -1,22 +1,62 @@
-from typing import List, Optional, Dict, Any
+from typing import List, NamedTuple, Optional, Dict, Any, Tuple
 from datetime import datetime
+import time
 from supabase.client import Client
 import os
 from dotenv import load_dotenv
 
 from models.base import Citation, Tag
 from config.supabase import supabase
+from utils.bibliography import ProjectBibliography, collation_key
+from utils.cache import LRUCache
+from utils.formatcitation import AGLC4Citation, FORMATTER_VERSION, is_stale
+from utils.names import structured_names
 
 load_dotenv()  # Load environment variables
 
+# Citations kept in the row cache used to reformat updates without a fetch
+ROW_CACHE_SIZE = 2048
+
+# Re-rendered rows checked and written back per pair of requests, see write_back_formatted
+WRITE_BACK_CHUNK_SIZE = 100
+
+# (user, project) pairs whose sorted bibliography is kept in memory, see get_bibliography
+BIBLIOGRAPHY_CACHE_SIZE = 256
+
+# Seconds a held bibliography is used before it is rebuilt from scratch, bounding
+# how long a change that leaves the project's version as it was can go unseen
+BIBLIOGRAPHY_TTL_SECONDS = 300
+
+class CitationChanged(Exception):
+    """Raised when a conditional update finds the citation changed since it was read"""
+
+
+class HeldBibliography(NamedTuple):
+    bibliography: ProjectBibliography
+    # (citation count, latest updated_at) of the project when last checked
+    version: Tuple[int, Optional[str]]
+    expires_at: float
+
 class CitationService:
-    def __init__(self, supabase_client: Client = supabase):
+    def __init__(self, supabase_client: Client = supabase, formatter: Optional[AGLC4Citation] = None):
         self.supabase = supabase_client
+        self.formatter = formatter or AGLC4Citation()
+        # Citation id -> the raw row as last read or written. The Citation model
+        # drops template fields it does not declare, so it cannot stand in here
+        self._rows = LRUCache(ROW_CACHE_SIZE)
+        # (user id, project id) -> HeldBibliography
+        self._bibliographies = LRUCache(BIBLIOGRAPHY_CACHE_SIZE)
         self._access_token = None
+        self._user_id = None
         self.anon_key = os.getenv('SUPABASE_ANON_KEY')  # Get from environment variable
 
-    def set_access_token(self, token: str):
-        """Set the access token for Supabase requests"""
+    def set_access_token(self, token: str, user_id: Optional[str] = None):
+        """
+        Set the access token for Supabase requests, and the id of its user if
+        known, which keys the held bibliographies this service's writes update
+        """
+        if token != self._access_token or user_id is not None:
+            self._user_id = user_id
         self._access_token = token
         # Instead of using set_session, we'll use the token directly in requests
 
@@ -27,19 +67,145 @@ class CitationService:
         order_by: str = "created_at"
     ) -> List[Citation]:
         """
-        Retrieve citations with optional filtering by project_id and type
+        Retrieve citations with optional filtering by project_id and type.
+        Rows formatted by an older formatter version are re-rendered and
+        written back. Order by 'collation_key' for bibliography order.
+        """
+        return [
+            Citation(**record)
+            for record in self.get_citation_records(project_id=project_id, type=type, order_by=order_by)
+        ]
+
+    def get_citation_records(
+        self,
+        project_id: Optional[str] = None,
+        type: Optional[str] = None,
+        order_by: str = "created_at",
+        updated_since: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        The raw rows get_citations() returns as Citations. Format from these:
+        they keep the template fields the Citation model does not declare.
         """
+        if self._access_token:
+            self.supabase.postgrest.auth(self._access_token)
         query = self.supabase.table('citations').select('*, tags(*)')
         
         if project_id:
             query = query.eq('project_id', project_id)
         if type:
             query = query.eq('type', type)
+        if updated_since:
+            query = query.gte('updated_at', updated_since)
             
         query = query.order(order_by)
         
         response = query.execute()
-        return [Citation(**record) for record in response.data]
+        rerendered = self.rerender_stale(response.data)
+        if rerendered:
+            try:
+                self.write_back_formatted(rerendered)
+            except Exception as e:
+                # The re-rendered text is still returned; the rows are retried on the next read
+                print(f"Error writing back re-rendered citations: {str(e)}")
+            if order_by == 'collation_key':
+                # Re-rendered rows may have had no key when the database sorted them
+                response.data.sort(key=lambda record: record.get('collation_key') or '')
+        for record in response.data:
+            self._remember(record)
+        return response.data
+
+    def get_stale_citation_records(
+        self,
+        project_id: str,
+        after_id: Optional[str] = None,
+        limit: int = 500
+    ) -> List[Dict[str, Any]]:
+        """
+        Raw rows of a project formatted by an older formatter version,
+        in id order after after_id
+        """
+        query = self._stale_query(self.supabase.table('citations').select('*'), project_id)
+        if after_id:
+            query = query.gt('id', after_id)
+        response = query.order('id').limit(limit).execute()
+        return response.data
+
+    def count_stale_citations(self, project_id: str) -> int:
+        """Number of a project's rows formatted by an older formatter version"""
+        response = self._stale_query(
+            self.supabase.table('citations').select('id', count='exact'), project_id
+        ).execute()
+        return response.count or 0
+
+    def _stale_query(self, query, project_id: str):
+        # Mirrors is_stale()
+        return query.eq('project_id', project_id).or_(
+            f'formatter_version.is.null,formatter_version.lt.{FORMATTER_VERSION},collation_key.is.null'
+        )
+
+    def rerender_stale(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Re-render, in place, the records formatted by an older formatter version.
+        Returns the records that were re-rendered; rows that fail to format keep
+        their stored text and stay stale.
+        """
+        rerendered = []
+        for record in records:
+            if not is_stale(record):
+                continue
+            try:
+                record.update(structured_names(record))
+                record['formatted_citation'] = self.formatter.format_citation(record['type'].lower(), **record)
+                record['collation_key'] = collation_key(record['type'], record)
+            except Exception as e:
+                print(f"Error re-rendering citation {record.get('id')}: {str(e)}")
+                continue
+            record['formatter_version'] = FORMATTER_VERSION
+            rerendered.append(record)
+        return rerendered
+
+    def write_back_formatted(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Persist the formatted text, formatter version and collation key of
+        re-rendered records, WRITE_BACK_CHUNK_SIZE rows at a time: one read of
+        the chunk's rows, then one upsert of those still stale whose updated_at
+        is the one that was read. An edit made since the read is never
+        overwritten; such rows are left for the next read or sweep. Only an edit
+        landing between a chunk's two requests, a few milliseconds, is not seen.
+        Written rows get a new updated_at, so held bibliographies see the change.
+        Returns the records that were written.
+        """
+        if self._access_token:
+            self.supabase.postgrest.auth(self._access_token)
+        written = []
+        for start in range(0, len(records), WRITE_BACK_CHUNK_SIZE):
+            chunk = {record['id']: record for record in records[start:start + WRITE_BACK_CHUNK_SIZE]}
+            current = self.supabase.table('citations')\
+                .select('*')\
+                .in_('id', list(chunk))\
+                .execute()
+            updated_at = datetime.utcnow().isoformat()
+            rows = []
+            for row in current.data:
+                record = chunk[row['id']]
+                if not is_stale(row) or row.get('updated_at') != record.get('updated_at'):
+                    continue
+                rows.append({
+                    **row,
+                    'formatted_citation': record['formatted_citation'],
+                    'formatter_version': record['formatter_version'],
+                    'collation_key': record['collation_key'],
+                    'updated_at': updated_at,
+                })
+            if not rows:
+                continue
+            response = self.supabase.table('citations').upsert(rows, returning='representation').execute()
+            for row in response.data:
+                record = chunk[row['id']]
+                record['updated_at'] = row['updated_at']
+                written.append(record)
+        return written
 
     def get_citation(self, citation_id: str) -> Optional[Citation]:
         """
@@ -51,7 +217,106 @@ class CitationService:
             .single()\
             .execute()
             
-        return Citation(**response.data) if response.data else None
+        return self._remember(response.data) if response.data else None
+
+    def get_citation_fields(self, citation_id: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        The citation's raw row as last read or written by this service, with
+        every template field, fetching the row only when it is not cached or
+        refresh is set
+        """
+        fields = None if refresh else self._rows.get(citation_id)
+        if fields is None and self.get_citation(citation_id) is not None:
+            fields = self._rows.get(citation_id)
+        return dict(fields) if fields is not None else None
+
+    def get_citation_project(self, citation_id: str) -> Optional[str]:
+        """
+        The project of a citation visible to the current access token, read
+        from the database rather than the row cache so row level security applies
+        """
+        if self._access_token:
+            self.supabase.postgrest.auth(self._access_token)
+        response = self.supabase.table('citations')\
+            .select('project_id')\
+            .eq('id', citation_id)\
+            .execute()
+        return response.data[0]['project_id'] if response.data else None
+
+    def _remember(self, record: Dict[str, Any]) -> Citation:
+        """Cache a row read or written, returning it as a Citation"""
+        self._rows.put(record['id'], {k: v for k, v in record.items() if k != 'tags'})
+        return Citation(**record)
+
+    def get_bibliography(self, project_id: str, user_id: str) -> ProjectBibliography:
+        """
+        The project's bibliography in collation key order, as the current access
+        token sees it, held in memory per user and project.
+
+        Citations this service creates, updates or deletes are applied to the
+        writer's held bibliography as they are written, see _apply_write. Every
+        call still reads the project's version, its citation count and latest
+        updated_at, with the caller's token, so access is checked and changes
+        from other writers are noticed. When the version has moved on, the rows
+        updated since are fetched and applied in place; if the count still
+        differs, as after a deletion or a citation moving project, the
+        bibliography is rebuilt. It is also rebuilt BIBLIOGRAPHY_TTL_SECONDS
+        after it was built.
+        """
+        key = (user_id, project_id)
+        version = self._bibliography_version(project_id)
+        held = self._bibliographies.get(key)
+        if held is not None and time.monotonic() < held.expires_at:
+            if held.version == version:
+                return held.bibliography
+            if held.version[1] is not None:
+                for record in self.get_citation_records(project_id=project_id, updated_since=held.version[1]):
+                    held.bibliography.upsert(record)
+                if len(held.bibliography) == version[0]:
+                    self._bibliographies.put(key, held._replace(version=version))
+                    return held.bibliography
+
+        bibliography = ProjectBibliography(
+            self.get_citation_records(project_id=project_id, order_by='collation_key')
+        )
+        self._bibliographies.put(
+            key, HeldBibliography(bibliography, version, time.monotonic() + BIBLIOGRAPHY_TTL_SECONDS)
+        )
+        return bibliography
+
+    def _bibliography_version(self, project_id: str) -> Tuple[int, Optional[str]]:
+        if self._access_token:
+            self.supabase.postgrest.auth(self._access_token)
+        response = self.supabase.table('citations')\
+            .select('updated_at', count='exact')\
+            .eq('project_id', project_id)\
+            .order('updated_at', desc=True, nullsfirst=False)\
+            .limit(1)\
+            .execute()
+        latest = response.data[0]['updated_at'] if response.data else None
+        return response.count or 0, latest
+
+    def _apply_write(self, project_id: Optional[str], record: Optional[Dict[str, Any]] = None,
+                     removed_id: Optional[str] = None) -> None:
+        """
+        Apply a citation this service wrote, or the id of one it deleted, to the
+        current user's held bibliography of its project, in O(log n), and move
+        the held version on to match so the next read does not fetch it again.
+        A write by another writer landing between the last check and this one
+        then goes unseen until the bibliography expires.
+        """
+        key = (self._user_id, project_id)
+        held = self._bibliographies.get(key) if self._user_id and project_id else None
+        if held is None:
+            return
+        latest = held.version[1]
+        if record is not None:
+            held.bibliography.upsert(record)
+            if record.get('updated_at') and (latest is None or record['updated_at'] > latest):
+                latest = record['updated_at']
+        else:
+            held.bibliography.remove(removed_id)
+        self._bibliographies.put(key, held._replace(version=(len(held.bibliography), latest)))
 
     def create_citation(self, citation_data: Dict[str, Any]) -> Citation:
         """Create a new citation"""
@@ -93,7 +358,10 @@ class CitationService:
                         .execute()
             
             # Fetch the complete citation with tags
-            return self.get_citation(citation_id)
+            citation = self.get_citation(citation_id)
+            if citation is not None:
+                self._apply_write(citation.project_id, self._rows.get(citation_id))
+            return citation
             
         except Exception as e:
             print(f"Error creating citation: {str(e)}")
@@ -103,10 +371,13 @@ class CitationService:
     def update_citation(
         self, 
         citation_id: str, 
-        citation_data: Dict[str, Any]
+        citation_data: Dict[str, Any],
+        based_on: Optional[Dict[str, Any]] = None
     ) -> Citation:
         """
-        Update an existing citation
+        Update an existing citation. With based_on, the row the update was
+        computed from, it is written only if the citation's updated_at is still
+        that row's; otherwise CitationChanged is raised and nothing is written.
         """
         try:
             print(f"Updating citation {citation_id} with data: {citation_data}")
@@ -117,17 +388,25 @@ class CitationService:
             
             # Extract tags before updating
             tags = citation_data.pop('tags', None)
+            previous = self._rows.get(citation_id)
                 
             # Add updated_at timestamp
             citation_data['updated_at'] = datetime.utcnow().isoformat()
             
             # Update citation
-            response = self.supabase.table('citations')\
+            query = self.supabase.table('citations')\
                 .update(citation_data)\
-                .eq('id', citation_id)\
-                .execute()
+                .eq('id', citation_id)
+            if based_on is not None:
+                if based_on.get('updated_at') is None:
+                    query = query.is_('updated_at', 'null')
+                else:
+                    query = query.eq('updated_at', based_on['updated_at'])
+            response = query.execute()
                 
             if not response.data:
+                if based_on is not None:
+                    raise CitationChanged(citation_id)
                 raise ValueError("No data returned from update operation")
                 
             # Update tags if provided
@@ -144,8 +423,13 @@ class CitationService:
                 
             if not updated_response.data:
                 raise ValueError("Failed to fetch updated citation")
-                
-            return Citation(**updated_response.data)
+
+            citation = self._remember(updated_response.data)
+            project_id = updated_response.data.get('project_id')
+            if previous is not None and previous.get('project_id') != project_id:
+                self._apply_write(previous.get('project_id'), removed_id=citation_id)
+            self._apply_write(project_id, self._rows.get(citation_id))
+            return citation
             
         except Exception as e:
             print(f"Error in update_citation: {str(e)}")
@@ -163,6 +447,7 @@ class CitationService:
             
             # Remove tag associations first
             self._remove_citation_tags(citation_id)
+            self._rows.pop(citation_id)
             
             # Delete the citation
             response = self.supabase.table('citations')\
@@ -172,6 +457,9 @@ class CitationService:
             
             if not response:
                 raise ValueError("No response from delete operation")
+
+            for record in response.data or []:
+                self._apply_write(record.get('project_id'), removed_id=record['id'])
             
         except Exception as e:
             print(f"Error in delete_citation: {str(e)}")
@@ -293,13 +581,14 @@ class CitationService:
         type: Optional[str] = None
     ) -> List[Citation]:
         """
-        Search citations by title, notes, or other relevant fields
+        Search citations by title, notes, author or editor names, or other relevant fields
         """
         query = self.supabase.table('citations')\
             .select('*, tags(*)')\
             .or_(
                 f'title.ilike.%{search_term}%,'
                 f'notes.ilike.%{search_term}%,'
+                f'name_search.ilike.%{search_term}%,'
                 f'formatted_citation.ilike.%{search_term}%'
             )
             
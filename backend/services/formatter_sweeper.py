@@ -0,0 +1,109 @@
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from utils.formatcitation import FORMATTER_VERSION
+from .citation_service import CitationService
+
+# Rows fetched, re-rendered and written back per step of a sweep
+SWEEP_CHUNK_SIZE = 500
+
+class FormatterSweeper:
+    """
+    Brings a project's stored formatted citations up to the current
+    FORMATTER_VERSION in a background thread, one chunk at a time.
+
+    Only stale rows are selected, in id order after a cursor, so a sweep that
+    is stopped or fails resumes from where it left off when started again.
+    Rows that cannot be formatted are counted and skipped. Progress is kept
+    per project and reported by status().
+
+    The sweep runs outside any request, so its citation_service should have a
+    client of its own, such as a service-role one, rather than the shared
+    service that holds the token of whichever user made the last request.
+    """
+
+    def __init__(self, citation_service: CitationService, chunk_size: int = SWEEP_CHUNK_SIZE):
+        self.citation_service = citation_service
+        self.chunk_size = chunk_size
+        self._progress: Dict[str, Dict[str, Any]] = {}
+        self._stop_events: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def start(self, project_id: str) -> Dict[str, Any]:
+        """Start or resume the sweep of a project; returns its progress"""
+        with self._lock:
+            progress = self._progress.get(project_id)
+            if progress and progress['state'] == 'running':
+                return dict(progress)
+            resume = progress is not None and progress['state'] in ('stopped', 'failed') \
+                and progress['formatter_version'] == FORMATTER_VERSION
+            progress = {
+                'project_id': project_id,
+                'formatter_version': FORMATTER_VERSION,
+                'state': 'running',
+                'total': self.citation_service.count_stale_citations(project_id),
+                'processed': progress['processed'] if resume else 0,
+                'updated': progress['updated'] if resume else 0,
+                'failed': progress['failed'] if resume else 0,
+                'cursor': progress['cursor'] if resume else None,
+                'error': None,
+                'started_at': datetime.utcnow().isoformat(),
+                'finished_at': None,
+            }
+            if resume:
+                # total counts what is left, so report it alongside the work already done
+                progress['total'] += progress['processed'] - progress['failed']
+            self._progress[project_id] = progress
+            stop_event = threading.Event()
+            self._stop_events[project_id] = stop_event
+            threading.Thread(
+                target=self._run,
+                args=(project_id, stop_event),
+                name=f"formatter-sweep-{project_id}",
+                daemon=True
+            ).start()
+            return dict(progress)
+
+    def stop(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """Ask a running sweep to stop after its current chunk"""
+        with self._lock:
+            stop_event = self._stop_events.get(project_id)
+            if stop_event:
+                stop_event.set()
+            progress = self._progress.get(project_id)
+            return dict(progress) if progress else None
+
+    def status(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """Progress of the project's latest sweep, or None if it was never swept"""
+        with self._lock:
+            progress = self._progress.get(project_id)
+            return dict(progress) if progress else None
+
+    def _run(self, project_id: str, stop_event: threading.Event) -> None:
+        progress = self._progress[project_id]
+        try:
+            while not stop_event.is_set():
+                records = self.citation_service.get_stale_citation_records(
+                    project_id, after_id=progress['cursor'], limit=self.chunk_size
+                )
+                if not records:
+                    self._finish(progress, 'completed')
+                    return
+                rerendered = self.citation_service.rerender_stale(records)
+                written = self.citation_service.write_back_formatted(rerendered) if rerendered else []
+                with self._lock:
+                    progress['processed'] += len(records)
+                    progress['updated'] += len(written)
+                    progress['failed'] += len(records) - len(rerendered)
+                    progress['cursor'] = records[-1]['id']
+            self._finish(progress, 'stopped')
+        except Exception as e:
+            print(f"Error sweeping citations of project {project_id}: {str(e)}")
+            self._finish(progress, 'failed', str(e))
+
+    def _finish(self, progress: Dict[str, Any], state: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            progress['state'] = state
+            progress['error'] = error
+            progress['finished_at'] = datetime.utcnow().isoformat()
@@ -0,0 +1,145 @@
+from typing import List, Optional, Dict, Any
+from supabase.client import Client
+
+from models.base import Reference
+from config.supabase import supabase
+
+# Fields of a reference that can be changed after it is created
+UPDATABLE_FIELDS = ('pinpoint', 'position')
+
+class ReferenceService:
+    """
+    References to source citations, stored in the citation_references table.
+    Citing a source again with a different pinpoint adds a reference row rather
+    than another copy of the citation.
+    """
+
+    def __init__(self, supabase_client: Client = supabase):
+        self.supabase = supabase_client
+        self._access_token = None
+
+    def set_access_token(self, token: str):
+        self._access_token = token
+
+    def _auth(self):
+        if self._access_token:
+            self.supabase.postgrest.auth(self._access_token)
+
+    def get_references(self, project_id: str) -> List[Reference]:
+        """
+        Retrieve a project's references in footnote order
+        """
+        self._auth()
+        response = self.supabase.table('citation_references')\
+            .select('*')\
+            .eq('project_id', project_id)\
+            .order('position')\
+            .order('created_at')\
+            .execute()
+        return [Reference(**record) for record in response.data]
+
+    def create_reference(self, reference_data: Dict[str, Any]) -> Reference:
+        """
+        Create a reference to a citation. Without a position it is added after
+        the project's last reference; with one, the references from that
+        position on move down one place.
+        """
+        try:
+            self._auth()
+            data = {
+                'project_id': reference_data['project_id'],
+                'citation_id': reference_data['citation_id'],
+                'pinpoint': reference_data.get('pinpoint') or None,
+                'position': reference_data.get('position'),
+            }
+            if data['position'] is None:
+                data['position'] = self._next_position(data['project_id'])
+
+            response = self.supabase.table('citation_references').insert(data).execute()
+            if not response.data:
+                raise ValueError("No data returned from insert operation")
+            record = response.data[0]
+            if reference_data.get('position') is not None:
+                record['position'] = self._place(record['project_id'], record['id'], record['position'])
+            return Reference(**record)
+        except Exception as e:
+            print(f"Error in create_reference: {str(e)}")
+            raise
+
+    def update_reference(self, reference_id: str, reference_data: Dict[str, Any]) -> Reference:
+        """
+        Change a reference's pinpoint or position. Moving a reference shifts
+        the references between its old and new positions by one place.
+        """
+        try:
+            self._auth()
+            update_fields = {k: reference_data[k] for k in UPDATABLE_FIELDS if k in reference_data}
+            if not update_fields:
+                raise ValueError("No valid update fields provided")
+            if 'pinpoint' in update_fields:
+                update_fields['pinpoint'] = update_fields['pinpoint'] or None
+
+            response = self.supabase.table('citation_references')\
+                .update(update_fields)\
+                .eq('id', reference_id)\
+                .execute()
+            if not response.data:
+                raise ValueError("No data returned from update operation")
+            record = response.data[0]
+            if 'position' in update_fields:
+                record['position'] = self._place(record['project_id'], record['id'], record['position'])
+            return Reference(**record)
+        except Exception as e:
+            print(f"Error in update_reference: {str(e)}")
+            raise
+
+    def delete_reference(self, reference_id: str) -> None:
+        """
+        Delete a reference; its citation is kept and later references move up
+        """
+        try:
+            self._auth()
+            response = self.supabase.table('citation_references')\
+                .delete()\
+                .eq('id', reference_id)\
+                .execute()
+            for record in response.data or []:
+                self._place(record['project_id'])
+        except Exception as e:
+            print(f"Error in delete_reference: {str(e)}")
+            raise
+
+    def _next_position(self, project_id: str) -> int:
+        response = self.supabase.table('citation_references')\
+            .select('position')\
+            .eq('project_id', project_id)\
+            .order('position', desc=True)\
+            .limit(1)\
+            .execute()
+        return response.data[0]['position'] + 1 if response.data else 0
+
+    def _place(self, project_id: str, reference_id: Optional[str] = None, position: int = 0) -> int:
+        """
+        Renumber the project's references 0, 1, 2, ... in footnote order, with
+        reference_id, if given, moved to position (clamped to the list). Older
+        references come first among equal positions. Only rows whose position
+        changes are written. Returns reference_id's new position.
+        """
+        response = self.supabase.table('citation_references')\
+            .select('id, position')\
+            .eq('project_id', project_id)\
+            .order('position')\
+            .order('created_at')\
+            .execute()
+        current = {record['id']: record['position'] for record in response.data}
+        order = [record['id'] for record in response.data]
+        if reference_id in current:
+            order.remove(reference_id)
+            order.insert(max(0, min(position, len(order))), reference_id)
+        for index, record_id in enumerate(order):
+            if current[record_id] != index:
+                self.supabase.table('citation_references')\
+                    .update({'position': index})\
+                    .eq('id', record_id)\
+                    .execute()
+        return order.index(reference_id) if reference_id in current else position
@@ -0,0 +1,84 @@
+"""Bibliography order: AGLC4 sections, then collation keys"""
+import pytest
+
+from benchmarks.samples import SAMPLE_CITATIONS
+from utils.bibliography import SECTION_TITLES, ProjectBibliography, collation_key, section_title
+
+
+def key(citation_type, **fields):
+    return collation_key(citation_type, fields)
+
+
+def test_sections_come_in_aglc4_order():
+    types = ['treaty', 'act', 'case_reported', 'journal_article', 'online_dictionary']
+    ordered = sorted(types, key=lambda t: collation_key(t, SAMPLE_CITATIONS[t]))
+    assert [section_title(t) for t in ordered] == list(SECTION_TITLES)
+
+
+def test_authors_sort_by_family_name_then_title_then_year():
+    keys = [
+        key('book', authors=['Ann Smithers'], title='A Law', year='2019'),
+        key('book', authors=['Ann Smith'], title='The Law', year='2020'),
+        key('book', authors=['Ann Smith'], title='Law', year='2019'),
+        key('book', authors=['Bob Jones'], title='Zebra', year='2019'),
+    ]
+    assert sorted(keys) == [keys[3], keys[2], keys[1], keys[0]]
+
+
+@pytest.mark.parametrize('a,b', [
+    # A leading article, markup, accents and punctuation are not sorted on
+    ({'case_name': 'The Queen v Smith'}, {'case_name': 'Queen v Smith'}),
+    ({'case_name': '<i>Réne</i> v Smith'}, {'case_name': 'Rene v Smith'}),
+    ({'case_name': 'Mabo v Queensland (No 2)'}, {'case_name': 'Mabo v Queensland No 2'}),
+])
+def test_case_names_are_normalised(a, b):
+    assert key('case_reported', **a) == key('case_reported', **b)
+
+
+def test_fields_the_template_does_not_read_are_ignored():
+    fields = dict(SAMPLE_CITATIONS['book'])
+    assert collation_key('book', {**fields, 'notes': 'A note'}) == collation_key('book', fields)
+
+
+def row(citation_id, citation_type, **fields):
+    return {
+        'id': citation_id, 'type': citation_type, 'formatted_citation': f'{citation_id}.',
+        'collation_key': collation_key(citation_type, fields), **fields,
+    }
+
+
+def ids(bibliography):
+    return [entry['id'] for entry in bibliography.entries()]
+
+
+def test_project_bibliography_order():
+    bibliography = ProjectBibliography([
+        row('act', 'act', title='Zebra Act', year='2010'),
+        row('case', 'case_reported', case_name='Mabo v Queensland'),
+        row('book', 'book', authors=['Ann Smith'], title='Law'),
+        row('same', 'case_reported', case_name='Mabo v Queensland'),
+    ])
+    # Equal keys are ordered by id
+    assert ids(bibliography) == ['book', 'case', 'same', 'act']
+    assert bibliography.entries()[0]['section'] == 'Articles/Books/Reports'
+
+
+def test_project_bibliography_upsert_and_remove():
+    bibliography = ProjectBibliography([
+        row('a', 'case_reported', case_name='Alpha v Beta'),
+        row('b', 'case_reported', case_name='Gamma v Delta'),
+    ])
+    bibliography.upsert(row('c', 'case_reported', case_name='Beta v Alpha'))
+    assert ids(bibliography) == ['a', 'c', 'b']
+    # A changed key moves the entry
+    bibliography.upsert(row('a', 'case_reported', case_name='Zeta v Eta'))
+    assert ids(bibliography) == ['c', 'b', 'a']
+    assert bibliography.remove('b')
+    assert not bibliography.remove('b')
+    assert ids(bibliography) == ['c', 'a']
+    assert len(bibliography) == 2 and 'b' not in bibliography
+
+
+def test_unformatted_entries_report_an_error():
+    bibliography = ProjectBibliography([{**row('a', 'act', title='X Act'), 'formatted_citation': None}])
+    assert bibliography.entries()[0]['error'] == 'Citation has not been formatted'
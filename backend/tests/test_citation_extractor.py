@@ -0,0 +1,112 @@
+"""Fields extracted from case citations pasted from Westlaw, LexisNexis and Jade"""
+import pytest
+
+from benchmarks.samples import SAMPLE_PASTES
+from utils.citation_extractor import CitationExtractor, detect_source_type
+
+
+@pytest.fixture
+def extractor():
+    return CitationExtractor(cache_size=0)
+
+
+@pytest.mark.parametrize('source_type,text,citation_type,expected', [
+    ('westlaw_case', 'Mabo v Queensland (No 2) (1992) 175 CLR 1, 42', 'case_reported', {
+        'case_name': 'Mabo v Queensland', 'year': '(1992)', 'volume': '175',
+        'law_report_series': 'CLR', 'starting_page': '1', 'pinpoint': '42',
+    }),
+    ('westlaw_case', 'Donoghue v Stevenson [1932] AC 562, 580', 'case_reported', {
+        'case_name': 'Donoghue v Stevenson', 'year': '[1932]', 'volume': '',
+        'law_report_series': 'AC', 'starting_page': '562', 'pinpoint': '580',
+    }),
+    ('lexisnexis_case', 'Mabo v Queensland (No 2) (1992) 175 CLR 1; 107 ALR 1; [1992] HCA 23; BC9202681', 'case_reported', {
+        'case_name': 'Mabo v Queensland (No 2)', 'year': '(1992)', 'volume': '175',
+        'law_report_series': 'CLR', 'starting_page': '1', 'unique_court_identifier': '', 'judgment_number': '',
+    }),
+    ('lexisnexis_case', 'Pell v The Queen [2020] HCA 12; (2020) 268 CLR 123; 376 ALR 478; BC202002455', 'case_reported', {
+        'case_name': 'Pell v The Queen', 'year': '(2020)', 'volume': '268',
+        'law_report_series': 'CLR', 'starting_page': '123', 'unique_court_identifier': '', 'judgment_number': '',
+    }),
+    ('lexisnexis_case', 'R v Smith BC201912345', 'case_unreported_no_medium_neutral', {
+        'case_name': 'R v Smith', 'year': '', 'volume': '', 'law_report_series': '',
+        'starting_page': '', 'unique_court_identifier': '', 'judgment_number': '',
+    }),
+    ('lexisnexis_case', 'Re Wakim; Ex parte McNally [1999] HCA 27; BC9903140', 'case_unreported_medium_neutral', {
+        'case_name': 'Re Wakim', 'year': '[1999]', 'volume': '', 'law_report_series': '',
+        'starting_page': '', 'unique_court_identifier': 'HCA', 'judgment_number': '27',
+    }),
+    ('jade_case', 'Mabo v Queensland (No 2) [1992] HCA 23; (1992) 175 CLR 1; [1992] JADE 36', 'case_unreported_medium_neutral', {
+        'case_name': 'Mabo v Queensland (No 2)', 'year': '1992', 'volume': '', 'law_report_series': '',
+        'starting_page': '', 'unique_court_identifier': 'HCA', 'judgment_number': '23', 'jade_identifier': '36',
+    }),
+    ('jade_case', 'Smith v Jones (2001) 205 CLR 1', 'case_reported', {
+        'case_name': 'Smith v Jones', 'year': '2001', 'volume': '', 'law_report_series': '',
+        'starting_page': '', 'unique_court_identifier': '', 'judgment_number': '', 'jade_identifier': '',
+    }),
+    ('jade_case', 'Re Application [2015] JADE 77', 'case_unreported_medium_neutral', {
+        'case_name': 'Re Application', 'year': '2015', 'volume': '', 'law_report_series': '',
+        'starting_page': '', 'unique_court_identifier': 'JADE', 'judgment_number': '77', 'jade_identifier': '77',
+    }),
+])
+def test_extract_case(extractor, source_type, text, citation_type, expected):
+    assert extractor.extract_citation(source_type, text) == (citation_type, expected)
+
+
+def test_lexis_case_name_stops_at_bc_number(extractor):
+    _, fields = extractor.extract_citation('lexisnexis_case', '107 ALR BC9202681 ; 175 CLR 1 [2021] NSWSC 1001')
+    assert fields['case_name'] == '107 ALR'
+
+
+def test_jade_report_citation_without_medium_neutral(extractor):
+    citation_type, fields = extractor.extract_citation('jade_case', 'Donoghue v Stevenson [1932] AC 562')
+    assert citation_type == 'case_reported'
+    assert (fields['year'], fields['law_report_series'], fields['starting_page']) == ('1932', 'AC', '562')
+    assert fields['unique_court_identifier'] == ''
+
+
+@pytest.mark.parametrize('source_type', ['westlaw_case', 'lexisnexis_case', 'jade_case'])
+@pytest.mark.parametrize('text,field,value', [
+    ('Re A [1990] Ch 1', 'law_report_series', 'Ch'),
+    ('X v Y [2019] EWCA Civ 123', 'unique_court_identifier', 'EWCA Civ'),
+    ('X v Y [1990] 2 Qd R 100', 'law_report_series', 'Qd R'),
+])
+def test_mixed_case_and_multi_word_abbreviations(extractor, source_type, text, field, value):
+    _, fields = extractor.extract_citation(source_type, text)
+    assert fields[field] == value
+
+
+@pytest.mark.parametrize('source_type', ['westlaw_case', 'lexisnexis_case', 'jade_case'])
+def test_unlisted_abbreviations_are_not_read(extractor, source_type):
+    _, fields = extractor.extract_citation(source_type, 'Smith v Jones [2019] ZZZ 5')
+    assert not fields.get('unique_court_identifier')
+    _, fields = extractor.extract_citation(source_type, 'Smith v Jones (2019) 12 NOISE 5')
+    assert not fields.get('law_report_series')
+
+
+def test_square_bracketed_report_citation(extractor):
+    for source_type in ('lexisnexis_case', 'jade_case'):
+        _, fields = extractor.extract_citation(source_type, 'X v Y [1990] 2 Qd R 100')
+        assert (fields['case_name'], fields['volume'], fields['starting_page']) == ('X v Y', '2', '100')
+
+
+def test_westlaw_case_name_stops_at_line_break(extractor):
+    _, fields = extractor.extract_citation('westlaw_case', 'Smith v Jones\n[2020] HCA 12, 5')
+    assert fields['case_name'] == 'Smith v Jones'
+    assert fields['pinpoint'] == '5'
+
+
+@pytest.mark.parametrize('source_type,text', [
+    (source_type, text) for source_type, texts in SAMPLE_PASTES.items() for text in texts
+])
+def test_sample_pastes_are_detected_as_their_source(source_type, text):
+    assert detect_source_type(text) == source_type
+
+
+@pytest.mark.parametrize('text,source_type', [
+    ('Commonwealth v Tasmania [1983] HCA 21; (1983) 158 CLR 1', 'jade_case'),
+    ('Pell v The Queen [2020] HCA 12; (2020) 268 CLR 123; 376 ALR 478', 'lexisnexis_case'),
+    ('Commonwealth v Tasmania (1983) 158 CLR 1', 'westlaw_case'),
+    ('R v Tang [2008] HCA 39', 'westlaw_case'),
+])
+def test_parallel_and_single_citations(text, source_type):
+    assert detect_source_type(text) == source_type
@@ -0,0 +1,49 @@
+"""Scanning whole documents for citations, whole or a chunk at a time"""
+import pytest
+
+from benchmarks.scanner import PARAGRAPH, PARITY_CHUNK_SIZES, STRADDLING_PARAGRAPH, chunks
+from utils.citation_scanner import scan_chunks, scan_text
+
+DOCUMENT = (PARAGRAPH + STRADDLING_PARAGRAPH) * 10
+
+
+def test_citations_and_fields():
+    text = (
+        'See Mabo v Queensland (No 2) (1992) 175 CLR 1, 42 and Pell v The Queen [2020] HCA 12, [42]; '
+        'also Donoghue v Stevenson [1932] AC 562 under the Native Title Act 1993 (Cth) s 223.'
+    )
+    citations = list(scan_text(text))
+    assert [c.citation_type for c in citations] == [
+        'case_reported', 'case_unreported_medium_neutral', 'case_reported', 'act',
+    ]
+    assert citations[0].text == 'Mabo v Queensland (No 2) (1992) 175 CLR 1, 42'
+    assert citations[0].fields['pinpoint'] == '42'
+    assert citations[1].fields['unique_court_identifier'] == 'HCA'
+    assert citations[1].fields['pinpoint'] == '[42]'
+    assert citations[2].fields['law_report_series'] == 'AC'
+    assert citations[3].fields['title'] == 'Native Title Act'
+    for citation in citations:
+        assert text[citation.start:citation.end] == citation.text
+
+
+@pytest.mark.parametrize('chunk_size', PARITY_CHUNK_SIZES)
+def test_chunked_scan_matches_whole_scan(chunk_size):
+    assert list(scan_chunks(chunks(DOCUMENT, chunk_size))) == list(scan_chunks([DOCUMENT]))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 4096])
+def test_parallel_citations_are_both_reported(chunk_size):
+    # '[2020]' opens the second citation; it is not a paragraph pinpoint of the first
+    texts = [c.text for c in scan_chunks(chunks(STRADDLING_PARAGRAPH, chunk_size))]
+    assert texts == ['Smith v Jones [2019] HCA 1', '[2020] HCA 2']
+
+
+def test_paragraph_pinpoint():
+    citation, = scan_text('Pell v The Queen [2020] HCA 12, [42] The Court held in 1990 that')
+    assert citation.fields['pinpoint'] == '[42]'
+
+
+def test_mixed_case_and_multi_word_abbreviations():
+    text = 'In Re A [1990] Ch 1, X v Y [2019] EWCA Civ 123 and P v Q [1990] 2 Qd R 100, but not [2019] Smith 5, [2019] ZZZ 5 or (2019) 12 NOISE 5.'
+    fields = [c.fields for c in scan_text(text)]
+    assert [f.get('law_report_series') or f.get('unique_court_identifier') for f in fields] == ['Ch', 'EWCA Civ', 'Qd R']
@@ -0,0 +1,88 @@
+"""The tokenizer the case extractors read their fields from"""
+import pytest
+
+from benchmarks.samples import SAMPLE_PASTES
+from utils.citation_tokens import YEAR_PATTERN, CitationTokens, tokenize
+
+CASE_PASTES = [
+    text for source_type in ('westlaw_case', 'lexisnexis_case', 'jade_case')
+    for text in SAMPLE_PASTES[source_type]
+]
+
+
+def kinds(text):
+    return [kind for kind, _ in tokenize(text)]
+
+
+def test_tokens_in_order():
+    tokens = CitationTokens('Mabo v Queensland (No 2) (1992) 175 CLR 1, 42; [1992] HCA 23; 107 ALR 1; BC9202681')
+    assert tokens.kinds == ['reported', 'pinpoint', 'medium_neutral', 'report', 'bc']
+    reported = tokens.first('reported')
+    assert reported.group('reported_year', 'volume', 'series', 'page') == ('1992', '175', 'CLR', '1')
+    assert tokens.first('report').group('volume', 'series', 'page') == ('107', 'ALR', '1')
+    assert tokens.first_report() is reported
+    assert tokens.first('pinpoint')['pin'] == '42'
+    assert tokens.first('bc')['bc_number'] == '9202681'
+
+
+def test_tokens_are_scanned_as_they_are_read():
+    tokens = tokenize('X v Y [2020] HCA 12; [2020] HCA 13')
+    kind, token = next(tokens)
+    assert (kind, token['mn_number']) == ('medium_neutral', '12')
+
+
+def test_first_year_includes_medium_neutral_year():
+    tokens = CitationTokens('Pell v The Queen [2020] HCA 12, 5')
+    assert tokens.first_year() == (17, '[2020]')
+    assert tokens.medium_neutral_spaced()
+
+
+@pytest.mark.parametrize('text,expected', [
+    ('Pell v The Queen [2020] HCA 12; (2020) 268 CLR 123', ['medium_neutral', 'reported']),
+    ('X v Y (1992) 175 CLR 1; [1990] 2 Qd R 100', ['reported', 'reported']),
+    # An unlisted series between the year and the report: the year stands alone
+    ('X v Y (1990) 107 Re X 175 CLR 1', ['year', 'report']),
+    ('X v Y (1990) 1, 175 CLR 1', ['year', 'pinpoint']),
+])
+def test_reported_citation(text, expected):
+    assert kinds(text) == expected
+
+
+@pytest.mark.parametrize('text', CASE_PASTES)
+def test_year_search_finds_first_year(text):
+    # The year opening a medium neutral or reported token is found by the year pattern too
+    year, match = CitationTokens(text).first_year(), YEAR_PATTERN.search(text)
+    assert (year and year[1]) == (match and match.group())
+
+
+@pytest.mark.parametrize('text,kind,abbreviation', [
+    ('[1990] Ch 1', 'medium_neutral', 'Ch'),
+    ('[2019] EWCA Civ 123', 'medium_neutral', 'EWCA Civ'),
+    ('[2021] FamCA 5', 'medium_neutral', 'FamCA'),
+    ('[2022] FedCFamC1A 7', 'medium_neutral', 'FedCFamC1A'),
+    ('[2001] NSWIRComm 12', 'medium_neutral', 'NSWIRComm'),
+    ('[1990] 2 Qd R 100', 'reported', 'Qd R'),
+    ('(1880) 5 App Cas 1', 'reported', 'App Cas'),
+    ('[1990] 1 All ER 5', 'reported', 'All ER'),
+    ('(1984) 9 FamLR 1', 'reported', 'FamLR'),
+    ('(1950) 50 SR (NSW) 1', 'reported', 'SR (NSW)'),
+    ('60 F 3d 5', 'report', 'F 3d'),
+])
+def test_mixed_case_and_multi_word_abbreviations(text, kind, abbreviation):
+    token = CitationTokens(text).first(kind)
+    assert token['mn_court' if kind == 'medium_neutral' else 'series'] == abbreviation
+
+
+def test_unlisted_mixed_case_abbreviations_are_dropped():
+    assert kinds('[2019] Smith 5; (1990) 2 The Court 5') == ['year', 'year']
+
+
+def test_scan_resumes_inside_a_dropped_report():
+    report = CitationTokens('107 Re X 175 CLR 1').first('report')
+    assert report.group() == '175 CLR 1'
+
+
+def test_unlisted_capitals_are_dropped():
+    assert kinds('Smith v Jones [2019] ZZZ 5') == ['year']
+    assert kinds('(2019) 12 NOISE 5') == ['year']
+    assert CitationTokens('[2024] NSWCATEN 3').first('medium_neutral')['mn_court'] == 'NSWCATEN'
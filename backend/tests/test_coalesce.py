@@ -0,0 +1,67 @@
+"""Coalescing identical concurrent work and skipping superseded requests"""
+import threading
+import time
+
+import pytest
+
+from utils.coalesce import LatestRequests, SingleFlight
+
+
+def test_concurrent_callers_share_one_computation():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'formatted'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do('key', compute)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do('key', compute))) for _ in range(3)]
+    for follower in followers:
+        follower.start()
+    # Followers are waiting once they have been counted as shared
+    deadline = time.monotonic() + 5
+    while flight.shared < len(followers) and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert sorted(results) == [('formatted', False)] + [('formatted', True)] * 3
+
+
+def test_errors_propagate_and_keys_are_released():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError('bad citation')
+
+    with pytest.raises(ValueError):
+        flight.do('key', fail)
+    # A finished key computes afresh
+    assert flight.do('key', lambda: 'ok') == ('ok', False)
+
+
+def test_only_the_latest_request_of_a_client_is_current():
+    requests = LatestRequests()
+    first = requests.begin('form')
+    second = requests.begin('form')
+    other = requests.begin('other form')
+    assert not requests.is_latest('form', first)
+    assert requests.is_latest('form', second)
+    assert requests.is_latest('other form', other)
+    assert requests.superseded == 1
+
+
+def test_forgotten_clients_are_current():
+    requests = LatestRequests(max_clients=1)
+    ticket = requests.begin('form')
+    requests.begin('other form')
+    assert requests.is_latest('form', ticket)
@@ -0,0 +1,44 @@
+"""Citation dates read and written in AGLC form"""
+from datetime import date, datetime
+
+import pytest
+
+from utils.dates import normalise_date, parse_date
+from utils.formatcitation import AGLC4Citation
+
+
+@pytest.mark.parametrize('value,expected', [
+    ('2024-01-05', '5 January 2024'),
+    ('2024-01-05T10:30:00+00:00', '5 January 2024'),
+    ('05 Jan 2024', '5 January 2024'),
+    ('1 Sept. 2023', '1 September 2023'),
+    (date(2024, 1, 5), '5 January 2024'),
+    (datetime(2024, 1, 5, 10, 30), '5 January 2024'),
+    ('Spring 2020', 'Spring 2020'),
+    ('2024-02-30', '2024-02-30'),
+    ('', ''),
+    (None, ''),
+])
+def test_normalise_date(value, expected):
+    assert normalise_date(value) == expected
+
+
+def test_parse_date_keeps_text_that_is_not_a_date():
+    assert parse_date(' 2019 ') == '2019'
+    assert parse_date('2024-01-05') == date(2024, 1, 5)
+
+
+@pytest.mark.parametrize('citation_type,fields', [
+    ('online_dictionary', {
+        'title': 'Macquarie Dictionary', 'retrieval_date': '2024-01-05', 'entry_title': 'law',
+        'definition_number': '2',
+    }),
+    ('online_legal_encyclopedia', {
+        'publisher': 'LexisNexis', 'title_of_encyclopedia': 'Halsbury', 'retrieval_date': '2024-01-05',
+        'title_number': '1', 'chapter_name': 'Courts', 'paragraph': '[1]',
+    }),
+])
+def test_iso_retrieval_dates_are_formatted(citation_type, fields):
+    # These types used to call a get_month_name method that did not exist
+    formatted = AGLC4Citation(cache_size=0).format_citation(citation_type, **fields)
+    assert '(online at 5 January 2024)' in formatted
@@ -0,0 +1,46 @@
+"""Whitespace normalisation and the extraction result cache"""
+from utils.citation_extractor import CitationExtractor, normalise_text
+
+PASTE = 'Pell v The Queen [2020] HCA 12, 5'
+
+
+def test_normalise_text_keeps_line_breaks():
+    assert normalise_text('  Smith \t v  Jones ') == 'Smith v Jones'
+    assert normalise_text(' Smith  v Jones \r\n\n  [2020]  HCA 12, 5 \n') == 'Smith v Jones\n[2020] HCA 12, 5'
+
+
+def test_hit_for_the_same_normalised_text():
+    extractor = CitationExtractor(cache_size=8)
+    first = extractor.extract_citation('westlaw_case', PASTE)
+    assert extractor.extract_citation('westlaw_case', f'  {PASTE}  ') == first
+    stats = extractor.cache_stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 1, 1)
+
+
+def test_callers_get_their_own_fields():
+    extractor = CitationExtractor(cache_size=8)
+    _, fields = extractor.extract_citation('lexisnexis_case', PASTE)
+    fields['case_name'] = 'changed'
+    assert extractor.extract_citation('lexisnexis_case', PASTE)[1]['case_name'] == 'Pell v The Queen'
+
+
+def test_auto_hit_skips_detection():
+    extractor = CitationExtractor(cache_size=8)
+    assert extractor.extract('auto', PASTE)[0] == 'westlaw_case'
+    assert extractor.cached('auto', PASTE)[0] == 'westlaw_case'
+    assert extractor.cached('westlaw_case', PASTE) is None
+
+
+def test_long_pastes_are_not_cached():
+    extractor = CitationExtractor(cache_size=8, max_cached_length=100)
+    text = PASTE + ' word' * 40
+    extractor.extract_citation('westlaw_case', text)
+    extractor.extract_citation('westlaw_case', text)
+    assert extractor.cache_stats()['size'] == 0
+    assert extractor.cached('westlaw_case', text) is None
+
+
+def test_disabled_cache():
+    extractor = CitationExtractor(cache_size=0)
+    assert extractor.extract_citation('westlaw_case', PASTE)[0] == 'case_unreported_medium_neutral'
+    assert extractor.cache_stats() == {'enabled': False}
@@ -0,0 +1,54 @@
+"""Extraction in worker processes, with results cached in the request's process"""
+import pytest
+
+from utils.citation_extractor import CitationExtractor
+from utils.extraction_pool import ExtractionPool, PoolBusy
+
+ENTRIES = [
+    'Pell v The Queen [2020] HCA 12, 5',
+    'Mabo v Queensland (No 2) (1992) 175 CLR 1, 42',
+    'not a citation',
+    'Doe v Roe [2021] NSWSC 1001; BC202100001',
+]
+
+
+@pytest.fixture(scope='module')
+def pool():
+    # A low inline threshold sends all but the shortest work to the worker
+    pool = ExtractionPool(CitationExtractor(), workers=1, inline_threshold=60, chunk_size=2)
+    yield pool
+    pool.shutdown()
+
+
+def test_large_paste_is_detected_and_extracted_in_the_pool(pool):
+    text = 'Smith v Jones\n[2020] HCA 12, 5' + ' ' * 100
+    pooled = pool.stats()['pooled']
+    source_type, citation_type, fields = pool.extract('auto', text)
+    assert (source_type, citation_type, fields['case_name']) == ('westlaw_case', 'case_unreported_medium_neutral', 'Smith v Jones')
+    assert pool.stats()['pooled'] == pooled + 1
+
+
+def test_batch_is_split_extracted_and_cached(pool):
+    entries = pool.split('\n\n'.join(ENTRIES * 2), limit=len(ENTRIES))
+    assert entries == ENTRIES
+
+    outcomes = list(pool.extract_many('auto', entries))
+    assert [o.source_type for o in outcomes] == ['westlaw_case', 'westlaw_case', None, 'lexisnexis_case']
+    assert outcomes[2].error == 'Could not detect the source type of the text'
+
+    # Results from the worker are cached here; only the failed entry is extracted again
+    pooled = pool.stats()['pooled']
+    assert list(pool.extract_many('auto', entries)) == outcomes
+    assert pool.stats()['pooled'] == pooled
+    assert pool.extractor.cached('auto', ENTRIES[0])[1] == 'case_unreported_medium_neutral'
+
+
+def test_busy_pool_rejects_work(pool):
+    for _ in range(pool.max_pending):
+        pool._slots.acquire()
+    try:
+        with pytest.raises(PoolBusy):
+            pool.extract('auto', 'x' * 100)
+    finally:
+        for _ in range(pool.max_pending):
+            pool._slots.release()
@@ -0,0 +1,63 @@
+"""Footnotes in full, ibid and subsequent reference form"""
+import pytest
+
+from benchmarks.samples import SAMPLE_CITATIONS
+from utils.formatcitation import AGLC4Citation
+from utils.footnotes import FootnoteSequence
+
+CITATIONS = {
+    'mabo': {'type': 'case_reported', **SAMPLE_CITATIONS['case_reported'], 'short_title': 'Mabo'},
+    'article': {'type': 'journal_article', **SAMPLE_CITATIONS['journal_article']},
+    'act': {'type': 'act', **SAMPLE_CITATIONS['act']},
+}
+
+REFERENCES = [
+    ('mabo', '42'), ('mabo', '42'), ('mabo', '45'), ('article', '460'),
+    ('mabo', None), ('act', 's 4'), ('act', 's 5'), ('article', None),
+]
+
+
+@pytest.fixture
+def formatter():
+    return AGLC4Citation(cache_size=0)
+
+
+def sequence(formatter, references=REFERENCES):
+    return FootnoteSequence(dict(CITATIONS), references, formatter=formatter)
+
+
+def test_forms(formatter):
+    footnotes = sequence(formatter)
+    assert [footnotes.form(i) for i in range(len(footnotes))] == [
+        'full', 'ibid', 'ibid', 'full', 'subsequent', 'full', 'ibid', 'subsequent',
+    ]
+    assert footnotes[0].endswith("175 CLR 1, 42 ('<i>Mabo</i>').")
+    assert footnotes[1:3] == ['Ibid.', 'Ibid 45.']
+    assert footnotes[3].endswith('457, 460.')
+    assert footnotes[4] == '<i>Mabo</i> (n 1).'
+    assert footnotes[6] == 'Ibid s 5.'
+    assert footnotes[7] == 'Saunders and Stone (n 4).'
+    assert footnotes.first_occurrence('article') == 4
+
+
+def test_legislation_has_no_cross_reference(formatter):
+    footnotes = sequence(formatter, [('act', 's 4'), ('mabo', None), ('act', 's 5')])
+    assert footnotes[2] == '<i>Competition and Consumer Act</i> s 5.'
+
+
+@pytest.mark.parametrize('edit,args', [
+    ('insert', (1, 'article', '1')),
+    ('delete', (3,)),
+    ('move', (6, 0)),
+    ('set_pinpoint', (2, '42')),
+])
+def test_edits_match_a_sequence_built_afresh(formatter, edit, args):
+    footnotes = sequence(formatter)
+    getattr(footnotes, edit)(*args)
+    assert footnotes.footnotes() == sequence(formatter, footnotes.references).footnotes()
+
+
+def test_only_changed_footnotes_are_re_rendered(formatter):
+    footnotes = sequence(formatter)
+    assert footnotes.set_pinpoint(2, '42') == [2]
+    assert footnotes[2] == 'Ibid.'
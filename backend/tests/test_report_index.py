@@ -0,0 +1,30 @@
+"""The memory-mapped index of report series and court identifiers"""
+from utils.report_index import (
+    COURT_IDENTIFIER, COURT_IDENTIFIERS, REPORT_SERIES, REPORT_SERIES_ABBREVIATIONS,
+    ReportIndex, build_index_bytes, report_index
+)
+
+
+def test_lookup():
+    index = ReportIndex(build_index_bytes())
+    assert index.lookup('CLR') == REPORT_SERIES
+    assert index.lookup('EWCA Civ') == COURT_IDENTIFIER
+    assert index.lookup('Smith') == 0
+    assert index.lookup('x' * 40) == 0
+    assert index.reads_as_report('AC')
+    assert not index.reads_as_report('HCA')
+
+
+def test_every_abbreviation_is_listed():
+    index = ReportIndex(build_index_bytes())
+    assert set(index.abbreviations()) == set(REPORT_SERIES_ABBREVIATIONS) | set(COURT_IDENTIFIERS)
+    assert all(index.is_report_series(a) for a in REPORT_SERIES_ABBREVIATIONS)
+    assert all(index.is_court_identifier(a) for a in COURT_IDENTIFIERS)
+
+
+def test_index_file_is_built_and_mapped(tmp_path):
+    path = str(tmp_path / 'report_index.bin')
+    index = report_index(path)
+    assert len(index) == len(set(REPORT_SERIES_ABBREVIATIONS) | set(COURT_IDENTIFIERS))
+    with open(path, 'rb') as f:
+        assert f.read() == build_index_bytes()
@@ -0,0 +1,37 @@
+"""Splitting pasted reference lists into entries"""
+import time
+
+import pytest
+
+from utils.citation_extractor import split_entries
+
+
+def test_one_entry_per_line():
+    text = 'Mabo v Queensland (No 2) (1992) 175 CLR 1\n  \nPell v The Queen [2020] HCA 12\r\n'
+    assert list(split_entries(text)) == ['Mabo v Queensland (No 2) (1992) 175 CLR 1', 'Pell v The Queen [2020] HCA 12']
+
+
+def test_blank_lines_separate_entries():
+    text = 'Mabo v Queensland (No 2)\n(1992) 175 CLR 1\n\n\t\nPell v The Queen\n[2020] HCA 12\n'
+    assert list(split_entries(text)) == ['Mabo v Queensland (No 2) (1992) 175 CLR 1', 'Pell v The Queen [2020] HCA 12']
+
+
+def test_entries_are_whitespace_normalised():
+    assert list(split_entries('  Smith   v\tJones  ')) == ['Smith v Jones']
+
+
+def test_whitespace_only_text_has_no_entries():
+    assert list(split_entries(' \n\t\n \n')) == []
+
+
+@pytest.mark.parametrize('text', [
+    ' ' * 1_000_000,
+    ' \n' * 500_000,
+    ('x' + ' ' * 1000 + '\n') * 1000,
+    ('x\n' + ' ' * 1000 + '\n\n') * 500,
+], ids=['spaces', 'blank-lines', 'trailing-spaces', 'blocks'])
+def test_splits_in_linear_time(text):
+    # The patterns this replaced took seconds on 32 KB of whitespace
+    start = time.perf_counter()
+    list(split_entries(text))
+    assert time.perf_counter() - start < 1.0
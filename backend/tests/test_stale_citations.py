@@ -0,0 +1,94 @@
+"""Rows formatted by an older formatter version, re-rendered and written back"""
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from utils.formatcitation import FORMATTER_VERSION, is_stale
+
+
+@pytest.mark.parametrize('record,stale', [
+    ({'formatter_version': FORMATTER_VERSION, 'collation_key': 'k'}, False),
+    ({'formatter_version': FORMATTER_VERSION - 1, 'collation_key': 'k'}, True),
+    ({'formatter_version': None, 'collation_key': 'k'}, True),
+    ({'collation_key': 'k'}, True),
+    ({'formatter_version': FORMATTER_VERSION, 'collation_key': None}, True),
+    ({'formatter_version': FORMATTER_VERSION, 'collation_key': ''}, True),
+])
+def test_is_stale(record, stale):
+    assert is_stale(record) is stale
+
+
+class FakeTable:
+    """The few query builder calls write_back_formatted makes, over rows held in memory"""
+
+    def __init__(self, rows, requests):
+        self.rows = rows
+        self.requests = requests
+        self.result = None
+
+    def select(self, columns):
+        return self
+
+    def in_(self, column, values):
+        self.result = [dict(self.rows[value]) for value in values if value in self.rows]
+        return self
+
+    def upsert(self, rows, returning=None):
+        for row in rows:
+            self.rows[row['id']] = dict(row)
+        self.result = [dict(row) for row in rows]
+        return self
+
+    def execute(self):
+        self.requests.append(self.result)
+        return SimpleNamespace(data=self.result)
+
+
+class FakeClient:
+    def __init__(self, rows):
+        self.rows = {row['id']: dict(row) for row in rows}
+        self.requests = []
+        self.postgrest = SimpleNamespace(auth=lambda token: None)
+
+    def table(self, name):
+        return FakeTable(self.rows, self.requests)
+
+
+@pytest.fixture
+def citation_service_module():
+    pytest.importorskip('supabase')
+    os.environ.setdefault('SUPABASE_URL', 'http://localhost')
+    os.environ.setdefault('SUPABASE_ANON_KEY', 'test.anon.key')
+    from services import citation_service
+    return citation_service
+
+
+def stale_row(citation_id, updated_at='2024-01-01T00:00:00'):
+    return {
+        'id': citation_id, 'project_id': 'p', 'type': 'act', 'title': f'Act {citation_id}',
+        'year': '2010', 'jurisdiction': 'Cth', 'formatted_citation': 'old', 'formatter_version': 1,
+        'collation_key': None, 'updated_at': updated_at,
+    }
+
+
+def test_write_back_is_chunked_and_guarded(citation_service_module):
+    rows = [stale_row(f'{i:04}') for i in range(citation_service_module.WRITE_BACK_CHUNK_SIZE + 1)]
+    client = FakeClient(rows)
+    service = citation_service_module.CitationService(client)
+    records = service.rerender_stale([dict(row) for row in rows])
+    assert len(records) == len(rows)
+    assert all(record['formatter_version'] == FORMATTER_VERSION for record in records)
+
+    # Edited since it was read: its updated_at no longer matches
+    client.rows['0000']['updated_at'] = '2024-06-01T00:00:00'
+    # Already re-rendered elsewhere: no longer stale
+    client.rows['0001'].update(formatter_version=FORMATTER_VERSION, collation_key='k')
+
+    written = service.write_back_formatted(records)
+    assert [record['id'] for record in written] == [row['id'] for row in rows[2:]]
+    # One read and one upsert per chunk
+    assert len(client.requests) == 4
+    assert client.rows['0000']['formatted_citation'] == 'old'
+    assert client.rows['0002']['formatted_citation'] == records[2]['formatted_citation']
+    assert not is_stale(client.rows['0002'])
@@ -0,0 +1,31 @@
+"""Compiled citation templates against the hand-written formatters they replaced"""
+import pytest
+
+from benchmarks.format_templates import legacy_formatter, variants
+from utils.formatcitation import FORMATTER_REGISTRY
+
+# Sparse rows whose output the templates deliberately changed: a date the
+# legacy function dropped when another field was missing, and a stray comma
+EXPECTED_DIFFERENCES = {
+    ('printed_newspaper', 'sparse'),
+    ('internet_material', 'sparse'),
+    ('social_media_post', 'sparse'),
+}
+
+CASES = [
+    (citation_type, variant, row)
+    for citation_type in FORMATTER_REGISTRY
+    for variant, row in variants(citation_type)
+    if (citation_type, variant) not in EXPECTED_DIFFERENCES
+]
+
+
+@pytest.mark.parametrize('citation_type,variant,row', CASES, ids=[f'{t}-{v}' for t, v, _ in CASES])
+def test_template_matches_legacy_formatter(citation_type, variant, row):
+    assert FORMATTER_REGISTRY[citation_type].format(row) == legacy_formatter(citation_type)(**row)
+
+
+def test_template_fixes_sparse_dates():
+    row = dict(variants('printed_newspaper'))['sparse']
+    assert '(4 June 2023)' in FORMATTER_REGISTRY['printed_newspaper'].format(row)
+    assert '(4 June 2023)' not in legacy_formatter('printed_newspaper')(**row)
@@ -0,0 +1,184 @@
+import bisect
+import re
+import threading
+import unicodedata
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from .formatcitation import FIELD_DEPENDENCIES
+from .names import parse_name
+
+# AGLC4 rule 1.13 bibliography sections, in order
+SECTIONS = (
+    ('Articles/Books/Reports', frozenset({
+        'journal_article', 'symposium', 'book', 'book_chapter', 'book_with_editor',
+        'translated_book', 'audiobook', 'report', 'research_paper',
+    })),
+    ('Cases', frozenset({
+        'case_reported', 'case_unreported_medium_neutral', 'case_unreported_no_medium_neutral',
+        'proceeding', 'court_order', 'arbitration', 'transcript_of_proceedings',
+        'high_court_transcript', 'submission',
+    })),
+    ('Legislation', frozenset({'act', 'bill', 'delegated_legislation'})),
+    ('Treaties', frozenset({'treaty'})),
+)
+OTHER_SECTION = 'Other'
+SECTION_TITLES = tuple(title for title, _ in SECTIONS) + (OTHER_SECTION,)
+
+_SECTION_INDEX = {
+    citation_type: index for index, (_, types) in enumerate(SECTIONS) for citation_type in types
+}
+
+# Fields naming who is responsible for a work, tried in order
+_NAME_FIELDS = ('authors', 'author', 'username', 'party_name', 'instrumentality_officer')
+
+# Fields holding a work's title, tried in order
+_TITLE_FIELDS = (
+    'case_name', 'treaty_title', 'title', 'chapter_title', 'book_title', 'translation_title',
+    'document_title', 'web_page_title', 'title_of_notice', 'instrument_title', 'episode_title',
+    'film_series_title', 'bill_citation', 'practice_direction', 'formatted_citation',
+    'interviewee', 'jurisdiction',
+)
+
+# Separates the parts of a collation key. It sorts below every character of a
+# normalised part, so a shorter name sorts before a longer one that extends it.
+KEY_SEPARATOR = '\t'
+
+_TAGS = re.compile(r'<[^>]*>')
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+_LEADING_ARTICLE = re.compile(r'^(?:the|a|an) ')
+_YEAR = re.compile(r'\d{4}')
+
+def section_index(citation_type: str) -> int:
+    """Index into SECTION_TITLES of the section a citation type is listed under"""
+    return _SECTION_INDEX.get((citation_type or '').lower(), len(SECTIONS))
+
+def section_title(citation_type: str) -> str:
+    return SECTION_TITLES[section_index(citation_type)]
+
+def normalise_for_collation(text: Any) -> str:
+    """
+    Lowercase ASCII words of text for sorting: markup, accents, punctuation and a
+    leading 'The', 'A' or 'An' are dropped
+    """
+    if not text:
+        return ''
+    text = _TAGS.sub('', str(text))
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii').lower()
+    text = _NON_ALNUM.sub(' ', text).strip()
+    return _LEADING_ARTICLE.sub('', text)
+
+def sort_name(name: Any) -> str:
+    """
+    A name in sort order: personal names are inverted to family name first
+    (see utils.names), names of bodies are kept as written
+    """
+    return normalise_for_collation(parse_name(str(name or '')).sort)
+
+def collation_key(citation_type: str, fields: Dict[str, Any]) -> str:
+    """
+    The key a citation is sorted by in a bibliography: its section, then the
+    author's surname (or the case name or title when there is no author),
+    then the title, then the year. Only fields the citation type's template
+    reads are used, so the key changes exactly when the formatted citation can.
+    Keys of different citations compare correctly as plain strings.
+    """
+    citation_type = (citation_type or '').lower()
+    consumed = FIELD_DEPENDENCIES.get(citation_type, ())
+
+    def value(name: str) -> Any:
+        return fields.get(name) if name in consumed else None
+
+    section = section_index(citation_type)
+    # Cases, legislation and treaties are listed by name, everything else by author
+    names = _names(value) if section in (0, len(SECTIONS)) else ''
+    title = next((normalise_for_collation(value(name)) for name in _TITLE_FIELDS if value(name)), '')
+    year = ''
+    for name in ('year', 'full_date', 'signature_date'):
+        match = _YEAR.search(str(value(name) or ''))
+        if match:
+            year = match.group()
+            break
+
+    primary = names or title
+    secondary = title if names else ''
+    return KEY_SEPARATOR.join((str(section), primary, secondary, year))
+
+def _names(value: Callable[[str], Any]) -> str:
+    for name in _NAME_FIELDS:
+        names = value(name)
+        if not names:
+            continue
+        if isinstance(names, str):
+            names = [names]
+        return ' '.join(sort_name(n) for n in names if n)
+    return ''
+
+
+def bibliography_entry(citation: Dict[str, Any]) -> Dict[str, Any]:
+    """A citation's entry in a project bibliography, from its stored row"""
+    formatted = citation.get('formatted_citation')
+    return {
+        "id": citation['id'],
+        "type": citation['type'],
+        "section": section_title(citation['type']),
+        "formatted_citation": formatted,
+        "error": None if formatted else "Citation has not been formatted"
+    }
+
+
+class ProjectBibliography:
+    """
+    A project's bibliography entries kept in collation key order, so that a
+    created, updated or deleted citation is applied without sorting or
+    formatting the rest. Entries are ordered by (collation_key, id); the
+    position of a change is found by binary search in O(log n). Python lists
+    still shift the entries after it, an O(n) memmove, which stays well
+    under a microsecond per thousand entries.
+    """
+
+    def __init__(self, citations: Iterable[Dict[str, Any]] = ()):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._positions: Dict[str, Tuple[str, str]] = {}
+        for citation in citations:
+            self._store(citation)
+        self._order: List[Tuple[str, str]] = sorted(self._positions.values())
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, citation_id: str) -> bool:
+        return citation_id in self._positions
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Every entry, in bibliography order"""
+        with self._lock:
+            return [self._entries[citation_id] for _, citation_id in self._order]
+
+    def upsert(self, citation: Dict[str, Any]) -> None:
+        """Add a citation's entry, or replace it, moving it if its collation key changed"""
+        with self._lock:
+            citation_id = citation['id']
+            old = self._positions.get(citation_id)
+            new = self._store(citation)
+            if old == new:
+                return
+            if old is not None:
+                del self._order[bisect.bisect_left(self._order, old)]
+            bisect.insort(self._order, new)
+
+    def remove(self, citation_id: str) -> bool:
+        """Remove a citation's entry; returns whether it was present"""
+        with self._lock:
+            position = self._positions.pop(citation_id, None)
+            if position is None:
+                return False
+            del self._entries[citation_id]
+            del self._order[bisect.bisect_left(self._order, position)]
+            return True
+
+    def _store(self, citation: Dict[str, Any]) -> Tuple[str, str]:
+        position = (citation.get('collation_key') or '', citation['id'])
+        self._entries[citation['id']] = bibliography_entry(citation)
+        self._positions[citation['id']] = position
+        return position
@@ -0,0 +1,91 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+_MISSING = object()
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache bounded by entry count.
+    Keeps hit, miss and eviction counters and an estimate of the memory
+    held by its keys and values so the bound can be sized in production.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.resident_bytes = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, marking it as most recently used"""
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, size: Optional[int] = None) -> None:
+        """
+        Store value under key, evicting the least recently used entries if full.
+        size overrides the shallow estimate for values that hold other objects.
+        """
+        if size is None:
+            size = sys.getsizeof(key) + sys.getsizeof(value)
+        with self._lock:
+            if key in self._data:
+                self.resident_bytes -= self._sizes[key]
+                self._data.move_to_end(key)
+            self._data[key] = value
+            self._sizes[key] = size
+            self.resident_bytes += size
+            while len(self._data) > self.maxsize:
+                old_key, _ = self._data.popitem(last=False)
+                self.resident_bytes -= self._sizes.pop(old_key)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value, or default if it is not cached"""
+        with self._lock:
+            value = self._data.pop(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self.resident_bytes -= self._sizes.pop(key)
+            return value
+
+    def clear(self) -> None:
+        """Drop every entry, keeping the counters"""
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.resident_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """Counters and sizing information for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else None,
+                'resident_bytes': self.resident_bytes,
+            }
@@ -1,8 +1,149 @@
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Iterator, Tuple, Optional
 import re
+import sys
+
+from .cache import LRUCache
+from .citation_tokens import CitationTokens, tokenize
+from .coalesce import SingleFlight
+from .names import parse_name
+from .report_index import REPORT_SERIES, report_index
+
+# SSRN: the posted date in parentheses that follows the title
+_SSRN_DATE = re.compile(r'\((?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},\s+\d{4}\)')
+# SSRN journal details, tried in order:
+# "24 Mich. St. Int'l L. Rev. 449 (2016)"
+_SSRN_VOLUME_JOURNAL_PAGE = re.compile(r'(\d+)\s+([^,]+)\s+(\d+)(?:-(\d+))?\s*\((\d{4})\)')
+# "Law & Social Inquiry, vol. 44, no 4: 957-986, 2019"
+_SSRN_JOURNAL_VOLUME_PAGES = re.compile(r'([^,]+),\s*(?:vol\.|volume)\s*(\d+)(?:,\s*(?:no|number)\s*(\d+))?:\s*(\d+)(?:-(\d+))?,\s*(\d{4})')
+# "The Hague Journal on the Rule of Law, Vol. 1, 2010"
+_SSRN_JOURNAL_VOLUME = re.compile(r'([^,]+),\s*(?:Vol\.|Volume)\s*(\d+),\s*(\d{4})')
+# "Hague Journal on The Rule of Law, 2024"
+_SSRN_JOURNAL_YEAR = re.compile(r'([^,]+),\s*(\d{4})')
+_SSRN_URL = re.compile(r'https://ssrn\.com/abstract=(\d+)')
+_SSRN_DOI = re.compile(r'http://dx\.doi\.org/(\S+)')
+
+# Google Scholar
+_SCHOLAR_VOLUME = re.compile(r'(\d+)(?:,\s*(?:no\.|issue)\s*(?:supplement\s*)?(\d+))?\s*\((\d{4})\):\s*(\d+)(?:-(\d+))?')
+_SCHOLAR_BOOK_TITLE = re.compile(r'(?<!Mr)(?<!Dr)(?<![A-Z])\.\s+([^.]+)\.')
+_SCHOLAR_BOOK_VOLUME = re.compile(r'Vol\.\s*(\d+)', re.IGNORECASE)
+_SCHOLAR_BOOK_YEAR = re.compile(r',?\s*(\d{4})\s*\.?$')
+_WHITESPACE_RUN = re.compile(r'\s+')
+
+# Entries in a pasted reference list are separated by blank lines, if it has any
+_BLANK_LINE = re.compile(r'\n\s*\n')
+
+def split_entries(text: str) -> Iterator[str]:
+    """
+    Split a pasted reference list into entries, in order. When the list has
+    blank lines between entries, each block is an entry and its lines are joined;
+    otherwise each non-empty line is an entry. Each run of whitespace in an
+    entry is one space, so entries are already normalised for extraction.
+    Runs in time linear in the text.
+    """
+    blocks = _BLANK_LINE.split(text)
+    if len(blocks) == 1:
+        for line in text.splitlines():
+            entry = ' '.join(line.split())
+            if entry:
+                yield entry
+        return
+    for block in blocks:
+        entry = ' '.join(block.split())
+        if entry:
+            yield entry
+
+AUTO_SOURCE_TYPE = 'auto'
+
+# Signatures of each source's pastes, as one alternation named by source type.
+# A paste can show several; the first source in SOURCE_PRIORITY wins. Signatures
+# that can sit next to another source's stay short (or lookaheads) so they do not
+# consume it. Jade gives a medium neutral citation then the authorised report,
+# e.g. '[1983] HCA 21; (1983) 158 CLR 1', ending the paste or followed by its
+# JADE identifier; LexisNexis adds a BC number or more parallel reports; Westlaw
+# gives one citation, with any pinpoint after a comma.
+_SOURCE_SIGNATURES = re.compile(r"""
+    (?P<ssrn_article>Available\ at\ SSRN | ssrn\.com/abstract=
+        | \((?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},\s+\d{4}\)\.)
+  | (?P<scholar_article>\(\d{4}\):\s*\d)
+  | (?P<jade_case>\[\d{4}\]\s*JADE\s*\d
+        | \[\d{4}\]\s*[A-Z][A-Za-z]*(?:\s+[A-Z][A-Za-z]*)?\s*\d+;\s*[\[(]\d{4}[\])]\s*\d+\s*[A-Z][A-Za-z']*(?:\s+[A-Z][A-Za-z']*)*\s*\d+
+          \s*(?=$|;\s*\[\d{4}\]\s*JADE))
+  | (?P<lexisnexis_case>\bBC\d{7} | ;(?=\s*(?:[\[(]\d{4}[\])]|\d+\s+[A-Z])))
+  | (?P<westlaw_case>(?:\[\d{4}\]\s*[A-Z][A-Za-z]*(?:\s+[A-Z][A-Za-z]*)?
+        | [\[(]\d{4}[\])]\s*\d+\s*[A-Z][A-Za-z']*(?:\s+[A-Z][A-Za-z']*)*)\s*\d+,\s*\d+\s*$)
+  | (?P<case>\[\d{4}\]\s*[A-Z][A-Za-z]*(?:\s+[A-Z][A-Za-z]*)?\s*\d | [\[(]\d{4}[\])]\s*\d+\s*[A-Z] | \sv\s)
+  | (?P<scholar_book>\.\s+[^.]+,\s*\d{4}\.?\s*$)
+""", re.VERBOSE)
+SOURCE_PRIORITY = ('ssrn_article', 'scholar_article', 'jade_case', 'lexisnexis_case', 'westlaw_case', 'case', 'scholar_book')
+_SOURCE_RANK = {source: rank for rank, source in enumerate(SOURCE_PRIORITY)}
+
+def detect_source_type(text: str) -> Optional[str]:
+    """
+    Classify a paste by the source it was copied from, in one scan for the
+    signatures of every source. A case with nothing specific to LexisNexis or
+    Jade, a single citation, is read as Westlaw.
+    Returns None when no source matches.
+    """
+    best = None
+    for match in _SOURCE_SIGNATURES.finditer(text):
+        rank = _SOURCE_RANK[match.lastgroup]
+        if best is None or rank < best:
+            best = rank
+            if rank == 0:
+                break
+    if best is None:
+        return None
+    source = SOURCE_PRIORITY[best]
+    return 'westlaw_case' if source == 'case' else source
+
+def _is_report(medium_neutral) -> bool:
+    """Whether a '[year] ABC 123' token is a report citation, e.g. [1932] AC 562"""
+    return report_index().flags[medium_neutral['mn_court']] == REPORT_SERIES
+
+DEFAULT_EXTRACT_CACHE_SIZE = 2048
+# Longer pastes, in characters, are not cached: the cache is bounded by entry
+# count and each entry holds its text, so a few multi-megabyte pastes would
+# hold far more memory than thousands of citations. They are the pastes
+# ExtractionPool sends to its workers, where extraction costs far more than a lookup.
+DEFAULT_MAX_CACHED_LENGTH = 4000
+
+def normalise_text(text: str) -> str:
+    """
+    Pasted text with each run of whitespace within a line as one space, each
+    line stripped and blank lines dropped. Line breaks are kept: a Westlaw case
+    name runs to the first one.
+    """
+    if text.isprintable() and '  ' not in text and text.strip() == text:
+        # Already normal: printable text has no whitespace but single spaces
+        return text
+    if '\n' not in text:
+        return ' '.join(text.split())
+    return '\n'.join(filter(None, (' '.join(line.split()) for line in text.split('\n'))))
+
+def copy_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """A copy of extracted fields, with its own lists, for a caller of a shared result"""
+    return {name: list(value) if isinstance(value, list) else value for name, value in fields.items()}
+
+def _resident_size(key: Tuple[str, str], result: Tuple[str, str, Dict[str, Any]]) -> int:
+    size = sys.getsizeof(key) + sum(sys.getsizeof(part) for part in key)
+    size += sys.getsizeof(result) + sum(sys.getsizeof(part) for part in result)
+    for name, value in result[2].items():
+        size += sys.getsizeof(value)
+        if isinstance(value, list):
+            size += sum(sys.getsizeof(item) for item in value)
+    return size
 
 class CitationExtractor:
-    def __init__(self):
+    def __init__(
+        self,
+        cache_size: Optional[int] = DEFAULT_EXTRACT_CACHE_SIZE,
+        max_cached_length: int = DEFAULT_MAX_CACHED_LENGTH
+    ):
+        # Results by requested source type and normalised text, disabled when
+        # cache_size is 0 or None; identical extractions running at the same time are done once
+        self.cache = LRUCache(cache_size) if cache_size else None
+        self.max_cached_length = max_cached_length
+        self._flight = SingleFlight()
         self.extractors = {
             'westlaw_case': self._extract_westlaw,
             'lexisnexis_case': self._extract_lexis_case,
@@ -14,179 +155,262 @@ class CitationExtractor:
 
     def extract_citation(self, source_type: str, text: str) -> Tuple[str, Dict[str, Any]]:
         """
-        Extract citation details from text based on the source type.
+        Extract citation details from text based on the source type, or on the
+        detected source type when it is 'auto'. Whitespace in the text is normalised first.
         Returns a tuple of (detected_citation_type, extracted_fields)
         """
+        extractor = self.extractors.get(source_type)
+        if self.cache is None and extractor is not None:
+            # Nothing to look up or remember, and no source type to detect
+            return extractor(normalise_text(text))
+        _, citation_type, fields = self.extract(source_type, text)
+        return citation_type, fields
+
+    def extract(self, source_type: str, text: str) -> Tuple[str, str, Dict[str, Any]]:
+        """
+        Like extract_citation, also returning the source type extracted with:
+        (source_type, citation_type, fields). The cache is keyed by the requested
+        source type, so a hit for 'auto' skips detection too. Texts longer than
+        max_cached_length are not cached.
+        """
+        text = normalise_text(text)
+        if self.cache is None:
+            return self._extract(source_type, text)
+
+        key = (source_type, text)
+        if len(text) > self.max_cached_length:
+            result, _ = self._flight.do(key, lambda: self._extract(*key))
+            return result[0], result[1], copy_fields(result[2])
+
+        result = self.cache.get(key)
+        if result is None:
+            result, _ = self._flight.do(key, lambda: self._extract_and_cache(key))
+        return result[0], result[1], copy_fields(result[2])
+
+    def cached(self, source_type: str, text: str) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        """The cached result of extract() for already normalised text, or None"""
+        if self.cache is None or len(text) > self.max_cached_length:
+            return None
+        result = self.cache.get((source_type, text))
+        return None if result is None else (result[0], result[1], copy_fields(result[2]))
+
+    def remember(self, source_type: str, text: str, result: Tuple[str, str, Dict[str, Any]]) -> None:
+        """Cache a result of extract() obtained elsewhere, e.g. in a worker process, for normalised text"""
+        if self.cache is not None and len(text) <= self.max_cached_length:
+            key = (source_type, text)
+            self.cache.put(key, result, size=_resident_size(key, result))
+
+    def _extract(self, source_type: str, text: str) -> Tuple[str, str, Dict[str, Any]]:
+        extractor = self.extractors.get(source_type)
+        if extractor is None:
+            source_type = self.resolve_source_type(source_type, text)
+            extractor = self.extractors[source_type]
+        citation_type, fields = extractor(text)
+        return source_type, citation_type, fields
+
+    def _extract_and_cache(self, key: Tuple[str, str]) -> Tuple[str, str, Dict[str, Any]]:
+        result = self._extract(*key)
+        self.remember(*key, result)
+        return result
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit rate and resident size of the result cache, and how many extractions were shared"""
+        if self.cache is None:
+            return {"enabled": False}
+        return {
+            "enabled": True,
+            **self.cache.stats(),
+            "max_cached_length": self.max_cached_length,
+            "shared": self._flight.shared
+        }
+
+    def resolve_source_type(self, source_type: str, text: str) -> str:
+        """
+        The source type to extract text with: source_type itself, or the detected
+        one for 'auto'. Raises ValueError when it is unsupported or undetectable.
+        """
+        if source_type == AUTO_SOURCE_TYPE:
+            detected = detect_source_type(text)
+            if detected is None:
+                raise ValueError("Could not detect the source type of the text")
+            return detected
         if source_type not in self.extractors:
             raise ValueError(f"Unsupported source type: {source_type}")
-        
-        return self.extractors[source_type](text)
+        return source_type
 
     def _extract_westlaw(self, text: str) -> Tuple[str, Dict[str, Any]]:
         """Extract citation details from Westlaw text"""
-        # Initialize with empty values
-        extracted = {
-            'case_name': '',
-            'year': '',
-            'volume': '',
-            'law_report_series': '',
-            'starting_page': '',
-            'pinpoint': ''
-        }
-        
-        # Try to identify if it's a medium neutral citation
-        if re.search(r'\[\d{4}]\s+[A-Z]+\s+\d+', text):
-            citation_type = 'case_unreported_medium_neutral'
-            # Extract medium neutral specific fields
-            extracted = {
-                'case_name': self._extract_case_name(text),
-                'year': self._extract_year(text),
-                'unique_court_identifier': self._extract_court_id(text),
-                'judgment_number': self._extract_judgment_number(text),
-                'pinpoint': self._extract_pinpoint(text)
+        tokens = CitationTokens(text)
+        pinpoint = tokens.first('pinpoint')
+        year = tokens.first_year()
+
+        medium_neutral = tokens.first('medium_neutral')
+        if medium_neutral and _is_report(medium_neutral):
+            return 'case_reported', {
+                'case_name': text[:medium_neutral.start()].strip().rstrip(','),
+                'year': f"[{medium_neutral['mn_year']}]",
+                'volume': '',
+                'law_report_series': medium_neutral['mn_court'],
+                'starting_page': medium_neutral['mn_number'],
+                'pinpoint': pinpoint['pin'] if pinpoint else ''
             }
-        else:
-            citation_type = 'case_reported'
-            # Extract reported case fields
-            extracted = {
-                'case_name': self._extract_case_name(text),
-                'year': self._extract_year(text),
-                'volume': self._extract_volume(text),
-                'law_report_series': self._extract_series(text),
-                'starting_page': self._extract_page(text),
-                'pinpoint': self._extract_pinpoint(text)
+
+        if tokens.medium_neutral_spaced():
+            return 'case_unreported_medium_neutral', {
+                'case_name': tokens.case_name(),
+                'year': year[1] if year else '',
+                'unique_court_identifier': medium_neutral['mn_court'],
+                'judgment_number': medium_neutral['mn_number'],
+                'pinpoint': pinpoint['pin'] if pinpoint else ''
             }
-        
-        return citation_type, extracted
 
-    def _extract_lexis_case(self, text: str) -> Tuple[str, Dict[str, Any]]:
-        """Extract citation details from a LexisNexis case citation"""
-        extracted = {
-            'case_name': '',
-            'year': '',
-            'volume': '',
-            'law_report_series': '',
-            'starting_page': '',
-            'unique_court_identifier': '',
-            'judgment_number': ''
+        report = tokens.first_report()
+        return 'case_reported', {
+            'case_name': tokens.case_name(),
+            'year': year[1] if year else '',
+            'volume': report['volume'] if report else '',
+            'law_report_series': report['series'] if report else '',
+            'starting_page': report['page'] if report else '',
+            'pinpoint': pinpoint['pin'] if pinpoint else ''
         }
 
+    def _extract_lexis_case(self, text: str) -> Tuple[str, Dict[str, Any]]:
+        """Extract citation details from a LexisNexis case citation"""
         try:
-            # Split into case name and citations
-            parts = text.split(';')
-            
-            # Extract case name from the first part
-            first_part = parts[0].strip()
-            
-            # Look for the first year pattern as the boundary for case name
-            year_match = re.search(r'(?:\[|\()\d{4}(?:\]|\))', first_part)
-            if year_match:
-                extracted['case_name'] = first_part[:year_match.start()].strip().rstrip(',')
-            else:
-                # If no year found, look for BC number
-                bc_match = re.search(r'BC\d+', first_part)
-                if bc_match:
-                    extracted['case_name'] = first_part[:bc_match.start()].strip().rstrip(',')
+            # One pass over the tokens, up to the first reported citation. The case
+            # name is the first part, up to its first year or else its first BC number
+            first_part_end = text.find(';')
+            if first_part_end < 0:
+                first_part_end = len(text)
+            year = bc = medium_neutral = reported = None
+            for kind, token in tokenize(text):
+                if kind == 'reported':
+                    reported = token
+                elif kind == 'medium_neutral':
+                    if medium_neutral is None:
+                        medium_neutral = token
+                elif kind != 'year':
+                    if kind == 'bc' and bc is None and token.start() < first_part_end:
+                        bc = token
+                    continue
+                # A year, alone or opening a citation
+                if year is None and token.start() < first_part_end:
+                    year = token
+                if reported:
+                    break
+            boundary = year.start() if year else (bc.start() if bc else first_part_end)
+
+            # A reported citation has the highest priority, then a medium neutral one,
+            # otherwise it is unreported, with or without a BC number
+            citation_year = volume = series = page = court = number = ''
+            if reported:
+                citation_type = 'case_reported'
+                citation_year = reported.group()[:6]
+                volume, series, page = reported.group('volume', 'series', 'page')
+            elif medium_neutral:
+                citation_year = f"[{medium_neutral['mn_year']}]"
+                if _is_report(medium_neutral):
+                    citation_type = 'case_reported'
+                    series, page = medium_neutral.group('mn_court', 'mn_number')
                 else:
-                    # If neither found, use the whole first part
-                    extracted['case_name'] = first_part.strip().rstrip(',')
-            
-            # Look for reported citation first (has highest priority)
-            reported_pattern = r'\((\d{4})\)\s*(\d+)\s*([A-Z]+(?:\s+[A-Z]+)*)\s*(\d+)'
-            medium_neutral_pattern = r'\[(\d{4})\]\s*([A-Z]+)\s*(\d+)'
-            bc_pattern = r'BC\d+'
-            
-            found_reported = False
-            found_medium_neutral = False
-            
-            # First pass: Look for reported citations (highest priority)
-            for part in parts:
-                reported_match = re.search(reported_pattern, part.strip())
-                if reported_match:
-                    found_reported = True
-                    extracted['year'] = f"({reported_match.group(1)})"
-                    extracted['volume'] = reported_match.group(2)
-                    extracted['law_report_series'] = reported_match.group(3)
-                    extracted['starting_page'] = reported_match.group(4)
-                    return 'case_reported', extracted
-            
-            # Second pass: Look for medium neutral citations
-            if not found_reported:
-                for part in parts:
-                    medium_neutral_match = re.search(medium_neutral_pattern, part.strip())
-                    if medium_neutral_match:
-                        found_medium_neutral = True
-                        extracted['year'] = f"[{medium_neutral_match.group(1)}]"
-                        extracted['unique_court_identifier'] = medium_neutral_match.group(2)
-                        extracted['judgment_number'] = medium_neutral_match.group(3)
-                        return 'case_unreported_medium_neutral', extracted
-            
-            # If no reported or medium neutral citation found, it's unreported
-            if not found_reported and not found_medium_neutral:
-                for part in parts:
-                    bc_match = re.search(bc_pattern, part.strip())
-                    if bc_match:
-                        return 'case_unreported_no_medium_neutral', extracted
-            
-            # Default to unreported if no patterns match
-            return 'case_unreported_no_medium_neutral', extracted
+                    citation_type = 'case_unreported_medium_neutral'
+                    court, number = medium_neutral.group('mn_court', 'mn_number')
+            else:
+                citation_type = 'case_unreported_no_medium_neutral'
+
+            return citation_type, {
+                'case_name': text[:boundary].strip().rstrip(','),
+                'year': citation_year,
+                'volume': volume,
+                'law_report_series': series,
+                'starting_page': page,
+                'unique_court_identifier': court,
+                'judgment_number': number
+            }
 
         except Exception as e:
             print(f"Error extracting LexisNexis case details: {e}")
-            return 'case_unreported_no_medium_neutral', extracted
+            return 'case_unreported_no_medium_neutral', {
+                'case_name': '',
+                'year': '',
+                'volume': '',
+                'law_report_series': '',
+                'starting_page': '',
+                'unique_court_identifier': '',
+                'judgment_number': ''
+            }
 
     def _extract_jade_case(self, text: str) -> Tuple[str, Dict[str, Any]]:
         """Extract citation details from a JadeProfessional case citation"""
-        extracted = {
-            'case_name': '',
-            'year': '',
-            'volume': '',
-            'law_report_series': '',
-            'starting_page': '',
-            'unique_court_identifier': '',
-            'judgment_number': '',
-            'jade_identifier': ''
-        }
-
         try:
-            # Split into case name and citations
-            parts = text.split(';')
-            
-            # Extract case name from the first part
-            first_part = parts[0].strip()
-            
-            # Look for the first year pattern as the boundary for case name
-            year_match = re.search(r'(?:\[|\()\d{4}(?:\]|\))', first_part)
-            if year_match:
-                extracted['case_name'] = first_part[:year_match.start()].strip().rstrip(',')
-                extracted['year'] = year_match.group(0)[1:-1]  # Extract year without brackets
-            
-            # Look for Jade identifier (e.g., [2023] JADE 123)
-            jade_pattern = r'\[(\d{4})\]\s*JADE\s*(\d+)'
-            for part in parts:
-                jade_match = re.search(jade_pattern, part)
-                if jade_match:
-                    extracted['year'] = jade_match.group(1)
-                    extracted['jade_identifier'] = jade_match.group(2)
-                    citation_type = 'case_reported'
-                    break
-            
-            # Look for medium neutral citation if present
-            medium_neutral_pattern = r'\[(\d{4})\]\s*([A-Z]+)\s*(\d+)'
-            for part in parts:
-                mn_match = re.search(medium_neutral_pattern, part)
-                if mn_match:
-                    extracted['year'] = mn_match.group(1)
-                    extracted['unique_court_identifier'] = mn_match.group(2)
-                    extracted['judgment_number'] = mn_match.group(3)
-                    citation_type = 'case_unreported_medium_neutral'
-                    break
-            
-            return citation_type, extracted
-            
+            # One pass over the tokens. The case name runs to the first year in the
+            # first part. The Jade identifier (e.g., [2023] JADE 123) and report citations
+            # in the same form, e.g. [1932] AC 562, are kept apart from the medium neutral
+            # ones, as is the first reported citation with its year in square brackets
+            first_part_end = text.find(';')
+            if first_part_end < 0:
+                first_part_end = len(text)
+            flags = report_index().flags
+            year = jade = report = reported = medium_neutral = None
+            for kind, token in tokenize(text):
+                if kind == 'medium_neutral':
+                    court = token['mn_court']
+                    if court == 'JADE' and jade is None:
+                        jade = token
+                    # As _is_report
+                    if flags[court] == REPORT_SERIES:
+                        if report is None:
+                            report = token
+                    elif medium_neutral is None:
+                        medium_neutral = token
+                elif kind == 'reported':
+                    if reported is None and token.group()[:6:5] == '[]':
+                        reported = token
+                elif kind != 'year':
+                    continue
+                # A year, alone or opening a citation
+                if year is None and token.start() < first_part_end:
+                    year = token
+
+            # The year is that of the citation read below, else the first year. The
+            # medium neutral citation if present; a Jade identifier also has this form.
+            # Otherwise the first report citation: [1932] AC 562, or one with a volume
+            # in form, e.g. [1990] 2 Qd R 100
+            citation_type = 'case_reported'
+            citation_year = volume = series = page = court = number = ''
+            if medium_neutral:
+                citation_type = 'case_unreported_medium_neutral'
+                citation_year, court, number = medium_neutral.group('mn_year', 'mn_court', 'mn_number')
+            elif reported and not (report and report.start() < reported.start()):
+                citation_year, volume, series, page = reported.group('reported_year', 'volume', 'series', 'page')
+            elif report:
+                citation_year, series, page = report.group('mn_year', 'mn_court', 'mn_number')
+            elif year:
+                citation_year = year.group()[1:5]
+
+            return citation_type, {
+                'case_name': text[:year.start()].strip().rstrip(',') if year else '',
+                'year': citation_year,
+                'volume': volume,
+                'law_report_series': series,
+                'starting_page': page,
+                'unique_court_identifier': court,
+                'judgment_number': number,
+                'jade_identifier': jade['mn_number'] if jade else ''
+            }
+
         except Exception as e:
-            # If extraction fails, return empty fields with reported case type
-            return 'case_reported', extracted
+            print(f"Error extracting JadeProfessional case details: {e}")
+            return 'case_reported', {
+                'case_name': '',
+                'year': '',
+                'volume': '',
+                'law_report_series': '',
+                'starting_page': '',
+                'unique_court_identifier': '',
+                'judgment_number': '',
+                'jade_identifier': ''
+            }
 
     def _extract_ssrn_authors(self, text: str) -> list:
         """Extract authors specifically from SSRN citation format"""
@@ -198,18 +422,8 @@ class CitationExtractor:
         author_parts = text.split(' and ')
         
         for part in author_parts:
-            # Remove any trailing/leading whitespace, commas, and periods
-            author = part.strip().rstrip(',')
-            
-            # Split on comma to separate last name from rest
-            name_parts = author.split(',')
-            if len(name_parts) == 2:
-                last_name = name_parts[0].strip()
-                # Remove periods and extra spaces from first/middle names
-                first_parts = [p.strip().rstrip('.') for p in name_parts[1].strip().split()]
-                # Reconstruct as "First Middle Last"
-                author = ' '.join(first_parts + [last_name])
-            
+            # "Last, First Middle" names are reordered to "First Middle Last"
+            author = parse_name(part.strip().rstrip(',')).display
             if author:
                 authors.append(author)
         
@@ -236,7 +450,7 @@ class CitationExtractor:
 
         try:
             # First split on the date in parentheses which typically appears after title
-            date_split = re.split(r'\((?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},\s+\d{4}\)', text)
+            date_split = _SSRN_DATE.split(text)
             
             if len(date_split) >= 2:
                 first_part = date_split[0].strip()
@@ -258,21 +472,15 @@ class CitationExtractor:
                 # Process the citation part which contains journal info
                 # Look for common patterns in the remaining text
                 
-                # Pattern 1: Volume Journal Page (Year)
-                # e.g., "24 Mich. St. Int'l L. Rev. 449 (2016)"
-                p1 = re.search(r'(\d+)\s+([^,]+)\s+(\d+)(?:-(\d+))?\s*\((\d{4})\)', remaining)
-                
-                # Pattern 2: Journal, vol. X, no Y: Page-Page, Year
-                # e.g., "Law & Social Inquiry, vol. 44, no 4: 957-986, 2019"
-                p2 = re.search(r'([^,]+),\s*(?:vol\.|volume)\s*(\d+)(?:,\s*(?:no|number)\s*(\d+))?:\s*(\d+)(?:-(\d+))?,\s*(\d{4})', remaining)
-                
-                # Pattern 3: Journal, Vol. X, Year
-                # e.g., "The Hague Journal on the Rule of Law, Vol. 1, 2010"
-                p3 = re.search(r'([^,]+),\s*(?:Vol\.|Volume)\s*(\d+),\s*(\d{4})', remaining)
-                
-                # Pattern 4: Journal, Year
-                # e.g., "Hague Journal on The Rule of Law, 2024"
-                p4 = re.search(r'([^,]+),\s*(\d{4})', remaining)
+                # Patterns are tried in order, each only if the previous ones did not match
+                p1 = _SSRN_VOLUME_JOURNAL_PAGE.search(remaining)
+                p2 = p3 = p4 = None
+                if not p1:
+                    p2 = _SSRN_JOURNAL_VOLUME_PAGES.search(remaining)
+                if not (p1 or p2):
+                    p3 = _SSRN_JOURNAL_VOLUME.search(remaining)
+                if not (p1 or p2 or p3):
+                    p4 = _SSRN_JOURNAL_YEAR.search(remaining)
                 
                 if p1:
                     extracted['volume'] = p1.group(1)
@@ -296,13 +504,13 @@ class CitationExtractor:
                     extracted['year'] = f"({p4.group(2)})"
                 
                 # Extract SSRN URL and abstract ID
-                url_match = re.search(r'https://ssrn\.com/abstract=(\d+)', remaining)
+                url_match = _SSRN_URL.search(remaining)
                 if url_match:
                     extracted['url'] = f"https://ssrn.com/abstract={url_match.group(1)}"
                     extracted['abstract_id'] = url_match.group(1)
                 
                 # Extract DOI if present
-                doi_match = re.search(r'http://dx\.doi\.org/(\S+)', remaining)
+                doi_match = _SSRN_DOI.search(remaining)
                 if doi_match:
                     extracted['doi'] = doi_match.group(1)
 
@@ -340,8 +548,7 @@ class CitationExtractor:
                 remaining = parts[2].strip().lstrip('.')
                 
                 # First look for volume and everything after to identify journal boundary
-                volume_pattern = r'(\d+)(?:,\s*(?:no\.|issue)\s*(?:supplement\s*)?(\d+))?\s*\((\d{4})\):\s*(\d+)(?:-(\d+))?'
-                volume_match = re.search(volume_pattern, remaining)
+                volume_match = _SCHOLAR_VOLUME.search(remaining)
                 
                 if volume_match:
                     # Journal is everything before the volume match
@@ -374,7 +581,7 @@ class CitationExtractor:
         try:
             # First find the title by looking for the period after authors
             # that's not part of an initial
-            title_match = re.search(r'(?<!Mr)(?<!Dr)(?<![A-Z])\.\s+([^.]+)\.', text)
+            title_match = _SCHOLAR_BOOK_TITLE.search(text)
             
             if title_match:
                 # Everything before this point contains authors
@@ -388,15 +595,15 @@ class CitationExtractor:
                 remaining = text[title_match.end():].strip().lstrip('.')
                 
                 # Extract volume if present
-                vol_match = re.search(r'Vol\.\s*(\d+)', remaining, re.IGNORECASE)
+                vol_match = _SCHOLAR_BOOK_VOLUME.search(remaining)
                 if vol_match:
                     extracted['volume'] = vol_match.group(1)
                     # Remove volume info from remaining text
                     remaining = remaining[:vol_match.start()].strip() + ' ' + remaining[vol_match.end():].strip()
-                    remaining = re.sub(r'\s+', ' ', remaining).strip().lstrip('.')
+                    remaining = _WHITESPACE_RUN.sub(' ', remaining).strip().lstrip('.')
                 
                 # Extract year (should be at the end)
-                year_match = re.search(r',?\s*(\d{4})\s*\.?$', remaining)
+                year_match = _SCHOLAR_BOOK_YEAR.search(remaining)
                 if year_match:
                     extracted['year'] = year_match.group(1)
                     # Publisher is everything before the year
@@ -434,12 +641,7 @@ class CitationExtractor:
                 parts = first_part.split(',')
                 # First two parts are "Lastname, Firstname" of first author
                 if len(parts) >= 2:
-                    lastname = parts[0].strip()
-                    firstname = parts[1].strip()
-                    # Create the first author's full name
-                    first_author = f"{firstname} {lastname}"
-                    first_author = first_author.replace('.', '')
-                    first_authors.append(first_author)
+                    first_authors.append(parse_name(f"{parts[0]}, {parts[1]}").display)
                     
                     # Any remaining parts are additional authors
                     for author in parts[2:]:
@@ -457,14 +659,7 @@ class CitationExtractor:
             # Process the last author (after 'and')
             if ',' in and_parts[-1]:
                 # Last author is in "Lastname, Firstname" format
-                parts = [p.strip() for p in and_parts[-1].split(',', 1)]
-                if len(parts) == 2:
-                    lastname, firstname = parts
-                    # Handle middle names/initials
-                    names = [n.strip() for n in firstname.split()]
-                    # Remove any periods from names/initials
-                    names = [n.replace('.', '') for n in names]
-                    authors.append(f"{' '.join(names)} {lastname}")
+                authors.append(parse_name(and_parts[-1]).display)
             else:
                 # Last author is already in "Firstname Lastname" format
                 # Remove any periods from names/initials
@@ -474,14 +669,7 @@ class CitationExtractor:
             # Single author
             if ',' in text:
                 # Author is in "Lastname, Firstname" format
-                parts = [p.strip() for p in text.split(',', 1)]
-                if len(parts) == 2:
-                    lastname, firstname = parts
-                    # Handle middle names/initials
-                    names = [n.strip() for n in firstname.split()]
-                    # Remove any periods from names/initials
-                    names = [n.replace('.', '') for n in names]
-                    authors.append(f"{' '.join(names)} {lastname}")
+                authors.append(parse_name(text).display)
             else:
                 # Author is already in "Firstname Lastname" format
                 # Remove any periods from names/initials
@@ -490,54 +678,6 @@ class CitationExtractor:
         
         return authors
 
-    def _extract_case_name(self, text: str) -> str:
-        # Basic pattern for case names (can be improved)
-        pattern = r'^([^(\n]+)'
-        match = re.search(pattern, text)
-        return match.group(1).strip().rstrip(',') if match else ''
-
-    def _extract_year(self, text: str) -> str:
-        # Look for year in brackets or parentheses
-        pattern = r'[\[(](\d{4})[\])]'
-        match = re.search(pattern, text)
-        return match.group(0) if match else ''
-
-    def _extract_volume(self, text: str) -> str:
-        # Look for volume number before law report series
-        pattern = r'(\d+)\s*[A-Z]+'
-        match = re.search(pattern, text)
-        return match.group(1) if match else ''
-
-    def _extract_series(self, text: str) -> str:
-        # Look for common law report series abbreviations
-        pattern = r'\d+\s*([A-Z]+(?:\s+[A-Z]+)*)'
-        match = re.search(pattern, text)
-        return match.group(1).strip() if match else ''
-
-    def _extract_page(self, text: str) -> str:
-        # Look for page number after law report series
-        pattern = r'[A-Z]+\s*(\d+)'
-        match = re.search(pattern, text)
-        return match.group(1) if match else ''
-
-    def _extract_pinpoint(self, text: str) -> str:
-        # Look for pinpoint reference after main citation
-        pattern = r',\s*(\d+)'
-        match = re.search(pattern, text)
-        return match.group(1) if match else ''
-
-    def _extract_court_id(self, text: str) -> str:
-        # Extract court identifier from medium neutral citation
-        pattern = r'\[\d{4}]\s*([A-Z]+)'
-        match = re.search(pattern, text)
-        return match.group(1) if match else ''
-
-    def _extract_judgment_number(self, text: str) -> str:
-        # Extract judgment number from medium neutral citation
-        pattern = r'\[\d{4}]\s*[A-Z]+\s*(\d+)'
-        match = re.search(pattern, text)
-        return match.group(1) if match else ''
-
     def _extract_title(self, text: str) -> str:
         # Look for title in quotes or after authors
         pattern = r'[\'"]([^\'"]+)[\'"]|(?:,\s*|\.\s*)([^,\.]+)'
@@ -0,0 +1,207 @@
+"""
+Scanner for the citations in a whole document, such as a judgment or a thesis
+chapter.
+
+scan_text() and scan_chunks() yield a ScannedCitation for every medium neutral
+citation, reported citation and Act or delegated legislation reference, in
+document order, with character offsets into the whole document:
+    case_unreported_medium_neutral  Pell v The Queen [2020] HCA 12, [42]
+    case_reported                   Mabo v Queensland (No 2) (1992) 175 CLR 1, 42
+    act                             Native Title Act 1993 (Cth) s 223
+    delegated_legislation           Corporations Regulations 2001 (Cth) reg 7.1.04
+Fields use the names and shapes CitationExtractor returns; the case name or
+legislation title is read back from the text just before the citation. A
+'[year] ABC 123' citation is typed by utils.report_index: reported when ABC is
+a law report series, such as [1932] AC 562, and medium neutral otherwise.
+Courts and series, including mixed-case and multi-word ones such as Qd R or
+EWCA Civ, are taken only when the index lists them, as in utils.citation_tokens.
+
+The patterns are those of utils.citation_tokens with every repetition bounded,
+so a match never runs past MAX_CITATION_LENGTH characters and the lookbacks
+read at most MAX_NAME_LENGTH. That keeps the scan linear in the length of the
+text, and lets DocumentScanner hold only one chunk plus those margins in memory.
+"""
+import re
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from .citation_tokens import known_abbreviation
+from .report_index import REPORT_SERIES, report_index
+
+MAX_CITATION_LENGTH = 200
+MAX_NAME_LENGTH = 150
+
+_JURISDICTIONS = 'Cth|NSW|Vic|Qld|WA|SA|Tas|ACT|NT|NZ|UK'
+# Court identifiers, and report series in their place, e.g. HCA, FedCFamC1A, EWCA Civ or Ch
+_COURT = r"[A-Z][A-Za-z]{0,11}(?:\d[A-Z])?(?:[ ]{1,3}[A-Z][A-Za-z]{0,9})?"
+
+CITATION_PATTERN = re.compile(r"""
+  (?=[\[(A-Z]) (?:
+    (?P<case_reported>
+      [\[(](?P<year>\d{4})[\])] \s{0,3} (?P<volume>\d{1,5}) \s{0,3}
+      (?P<series>(?!BC\d)[A-Z][A-Za-z']{0,9}(?:[ ]{1,3}(?:[A-Z][A-Za-z']{0,9}|\d[a-z]{1,2}|\([A-Z][A-Za-z]{0,9}\))){0,3})
+      \s{0,3} (?P<page>\d{1,6}))
+  | (?P<case_unreported_medium_neutral>
+      \[(?P<mn_year>\d{4})\] \s{0,3} (?P<court>""" + _COURT + r""") \s{0,3} (?P<number>\d{1,6}))
+  | (?P<legislation>
+      (?<![\w-])(?P<instrument>Act|Ordinance|Regulations?|Rules|By-laws?) [ ]{1,3} (?P<leg_year>\d{4})
+      \s{0,3} \((?P<jurisdiction>""" + _JURISDICTIONS + r""")\)
+      (?:[ ]{1,3}(?P<provision>(?:ss?|pts?|divs?|schs?|regs?|rr?|cls?)[ ]{1,3}[\d.]{1,10}[A-Z]{0,3}(?:\([0-9A-Za-z]{1,4}\)){0,4}))?)
+  )
+  # A paragraph pinpoint is not the year of a following citation, as in [2019] HCA 1, [2020] HCA 2
+  (?(legislation)|(?:,[ ]{0,3}(?P<pinpoint>
+      \[\d{1,5}\](?!\s{0,3}(?:""" + _COURT + r"""\s{0,3}\d|\d{1,5}\s{0,3}[A-Z]))
+    | \d{1,6}(?:[-–]\d{1,6})?))?)
+""", re.VERBOSE)
+
+# Words that start a sentence or clause rather than a name
+_LEADING_WORDS = (
+    r'In|See|Under|Also|Cf|And|But|As|Per|From|By|Following|Applying|Compare|Contra|'
+    r'Then|Although|While|When|Where|Since|After|Before|Unlike|Like|Section|Part|Pursuant'
+)
+_NAME_WORDS = r"""(?:[ ]{1,3}(?:[A-Z(][\w'’&()-]*|\d+\)|of|the|and|for|on|in|de|v|ex|parte)){0,15}"""
+
+# A case name, e.g. 'Mabo v Queensland (No 2)' or 'Re Wakim; Ex parte McNally', ending the text
+_CASE_NAME = re.compile(
+    r"(?<!\S)(?!(?:" + _LEADING_WORDS + r")\s)(?:Re[ ]{1,3})?[A-Z][\w'’&-]*" + _NAME_WORDS
+    + r"(?:;[ ]{1,3}Ex[ ]{1,3}parte[ ]{1,3}[A-Z][\w'’&-]*" + _NAME_WORDS + r")?[ ]{0,3}$"
+)
+# The words of a legislation title before 'Act' or the instrument, ending the text
+_TITLE = re.compile(r"(?<!\S)(?!(?:" + _LEADING_WORDS + r")\s)[A-Z][\w'’&-]*" + _NAME_WORDS + r"[ ]{1,3}$")
+
+
+class ScannedCitation(NamedTuple):
+    citation_type: str
+    start: int
+    end: int
+    text: str
+    fields: Dict[str, Any]
+
+
+class DocumentScanner:
+    """
+    Incremental scanner: feed() the document a chunk at a time, then close().
+    A match is taken only once MAX_CITATION_LENGTH characters follow its start,
+    so it cannot change as more text arrives; the text before the unscanned
+    part is kept only as far back as the name lookback reads.
+    """
+
+    def __init__(self):
+        self._buffer = ''
+        self._base = 0  # document offset of the buffer's first character
+        self._position = 0  # buffer index the next scan starts at
+        self._previous_end = 0  # document offset where the last citation ended
+
+    def feed(self, chunk: str) -> List[ScannedCitation]:
+        self._buffer += chunk
+        citations = self._scan(len(self._buffer) - MAX_CITATION_LENGTH)
+        keep = max(0, self._position - MAX_NAME_LENGTH)
+        self._buffer = self._buffer[keep:]
+        self._base += keep
+        self._position -= keep
+        return citations
+
+    def close(self) -> List[ScannedCitation]:
+        citations = self._scan(len(self._buffer))
+        self._buffer = ''
+        return citations
+
+    def _scan(self, limit: int) -> List[ScannedCitation]:
+        citations = []
+        if self._position >= limit:
+            return citations
+        # A match taken before limit may end after it; the next scan resumes past it
+        end = limit
+        for match in CITATION_PATTERN.finditer(self._buffer, self._position):
+            if match.start() >= limit:
+                self._position = match.start()
+                return citations
+            # The lookback stops at the previous citation so names are not shared
+            lookback = max(self._previous_end - self._base, match.start() - MAX_NAME_LENGTH, 0)
+            citation = _citation(match, self._buffer, lookback, self._base)
+            if citation is not None:
+                citations.append(citation)
+                self._previous_end = citation.end
+            end = max(limit, match.end())
+        self._position = end
+        return citations
+
+
+def scan_chunks(chunks: Iterable[str]) -> Iterator[ScannedCitation]:
+    """
+    Yield the citations in a document read as a sequence of chunks, e.g. from
+    a file opened in text mode. Offsets are into the whole document.
+    """
+    scanner = DocumentScanner()
+    for chunk in chunks:
+        yield from scanner.feed(chunk)
+    yield from scanner.close()
+
+def scan_text(text: str, chunk_size: int = 1 << 16) -> Iterator[ScannedCitation]:
+    """Yield the citations in text, in order"""
+    return scan_chunks(text[i:i + chunk_size] for i in range(0, len(text), chunk_size))
+
+def _citation(match, buffer: str, lookback: int, base: int) -> Optional[ScannedCitation]:
+    kind = match.lastgroup if match.lastgroup != 'pinpoint' else _kind(match)
+    start, end = match.start(), match.end()
+    before = buffer[lookback:start]
+
+    if kind == 'legislation':
+        title = _TITLE.search(before)
+        if title is None:
+            return None
+        start -= len(before) - title.start()
+        instrument = match['instrument']
+        fields = {
+            'title': f"{title.group().strip()} {instrument}",
+            'year': match['leg_year'],
+            'jurisdiction': match['jurisdiction'],
+            'pinpoint': match['provision'] or '',
+        }
+        citation_type = 'act' if instrument in ('Act', 'Ordinance') else 'delegated_legislation'
+    else:
+        name = _CASE_NAME.search(before)
+        case_name = ''
+        if name is not None and (' v ' in name.group() or name.group().startswith('Re ')):
+            case_name = name.group().strip()
+            start -= len(before) - name.start()
+        if kind == 'case_reported':
+            if not known_abbreviation(match['series'], REPORT_SERIES):
+                return None
+            fields = {
+                'case_name': case_name,
+                'year': match.group()[:6],
+                'volume': match['volume'],
+                'law_report_series': match['series'],
+                'starting_page': match['page'],
+                'pinpoint': match['pinpoint'] or '',
+            }
+        elif not known_abbreviation(match['court']):
+            return None
+        elif report_index().reads_as_report(match['court']):
+            # A report series in medium neutral form, e.g. [1932] AC 562
+            kind = 'case_reported'
+            fields = {
+                'case_name': case_name,
+                'year': f"[{match['mn_year']}]",
+                'volume': '',
+                'law_report_series': match['court'],
+                'starting_page': match['number'],
+                'pinpoint': match['pinpoint'] or '',
+            }
+        else:
+            fields = {
+                'case_name': case_name,
+                'year': f"[{match['mn_year']}]",
+                'unique_court_identifier': match['court'],
+                'judgment_number': match['number'],
+                'pinpoint': match['pinpoint'] or '',
+            }
+        citation_type = kind
+    return ScannedCitation(citation_type, base + start, base + end, buffer[start:end], fields)
+
+def _kind(match) -> str:
+    # With a pinpoint, lastgroup names the pinpoint rather than the citation
+    for kind in ('case_reported', 'case_unreported_medium_neutral'):
+        if match[kind] is not None:
+            return kind
+    return 'legislation'
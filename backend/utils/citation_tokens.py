@@ -0,0 +1,160 @@
+"""
+Tokenizer for pasted case citations.
+
+tokenize() scans a paste once, front to back, with one precompiled
+alternation, and yields its citation tokens in order as they are scanned, so
+an extractor can stop reading once it has what it needs. Each token is the
+re.Match of one alternative; its lastgroup names the kind and its named
+groups hold the values:
+    medium_neutral  [2020] HCA 12     mn_year, mn_court, mn_number
+    reported        (1992) 175 CLR 1  reported_year, volume, series, page
+    year            (1992), [1992]    year_value
+    report          175 CLR 1         volume, series, page
+    bc              BC201912345       bc_number
+    pinpoint        , 42              pin
+A reported citation is a bracketed year directly followed by a report; the
+year of one, or of a medium neutral citation, is not also a year token. A BC
+number is never read as a report series.
+
+Court identifiers and report series may be mixed-case or run to several
+words, e.g. FamCA, EWCA Civ, Ch or Qd R. Every captured abbreviation is looked
+up in utils.report_index: a report's series must be listed as a report series,
+and a medium neutral citation's court as a court identifier or, for
+'[1932] AC 562', a report series. Tokens with any other abbreviation, such as
+'[2019] ZZZ 5', are dropped.
+
+The source-specific extractors in CitationExtractor read these tokens
+instead of searching the paste again for each field; CitationTokens holds all
+of a paste's tokens for the lookups the Westlaw extractor makes.
+"""
+import re
+from typing import Iterator, List, Match, Optional, Tuple
+
+from .report_index import COURT_IDENTIFIER, REPORT_SERIES, report_index
+
+# Court identifiers, e.g. HCA, FamCA, FedCFamC1A or EWCA Civ, and report series in the same position, e.g. Ch
+_COURT = r"[A-Z][A-Za-z]*(?:\d[A-Z])?(?:\s+[A-Z][A-Za-z]*)?"
+# Report series, e.g. CLR, Qd R, All ER, Lloyd's Rep, F 3d or SR (NSW)
+_SERIES = r"(?!BC\d)[A-Z][A-Za-z']*(?:\s+(?:[A-Z][A-Za-z']*|\d[a-z]{1,2}|\([A-Z][A-Za-z]*\)))*"
+_REPORT_BODY = r"(?P<volume>\d+)\s*(?P<series>" + _SERIES + r")\s*(?P<page>\d+)"
+
+# The first character of every token is matched ahead of the alternatives, so re
+# skips straight to the positions a token can start at rather than trying each
+# alternative at every position; each alternative looks behind at that character.
+# A reported citation is tried before a year, so a year directly followed by a
+# report is read with it. A report's volume starts at that first character, so
+# the volume, series and page of a report are matched again with REPORT_PATTERN
+_MEDIUM_NEUTRAL = (
+    r"(?P<medium_neutral>(?<=\[)(?P<mn_year>\d{4})\](?P<mn_sep>\s*)(?P<mn_court>" + _COURT + r")(?P<mn_sep2>\s*)(?P<mn_number>\d+))"
+)
+_REPORTED = r"(?P<reported>(?<=[\[(])(?P<reported_year>\d{4})[\])]\s*" + _REPORT_BODY + ")"
+_YEAR = r"(?P<year>(?<=[\[(])(?P<year_value>\d{4})[\])])"
+_REPORT = r"(?P<report>(?<=\d)\d*\s*" + _SERIES + r"\s*\d+)"
+_BC = r"(?P<bc>(?<=B)C(?P<bc_number>\d+))"
+_PINPOINT = r"(?P<pinpoint>(?<=,)\s*(?P<pin>\d+))"
+
+TOKEN_PATTERN = re.compile(
+    r"[\[(\d,B](?:" + "|".join((_MEDIUM_NEUTRAL, _REPORTED, _YEAR, _REPORT, _BC, _PINPOINT)) + ")", re.ASCII
+)
+
+REPORT_PATTERN = re.compile(r"(?P<report>" + _REPORT_BODY + ")", re.ASCII)
+# Also matches the year opening a medium neutral or reported citation
+YEAR_PATTERN = re.compile(r"(?P<year>[\[(](?P<year_value>\d{4})[\])])", re.ASCII)
+
+# Case names run to the first parenthesis or line break
+CASE_NAME_PATTERN = re.compile(r'^([^(\n]+)')
+
+
+def known_abbreviation(abbreviation: str, flags: int = COURT_IDENTIFIER | REPORT_SERIES) -> bool:
+    """Whether utils.report_index lists a captured abbreviation with any of flags"""
+    return bool(report_index().lookup(abbreviation) & flags)
+
+
+class CitationTokens:
+    """All the tokens of one paste, with the lookups the Westlaw extractor uses"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens: List[Match] = []
+        # Kind of each token, so lookups by kind run as list searches
+        self.kinds: List[str] = []
+        for kind, token in tokenize(text):
+            self.kinds.append(kind)
+            self.tokens.append(token)
+
+    def first(self, kind: str, before: Optional[int] = None) -> Optional[Match]:
+        """The first token of a kind, optionally only if it starts before an offset"""
+        if kind not in self.kinds:
+            return None
+        token = self.tokens[self.kinds.index(kind)]
+        if before is not None and token.start() >= before:
+            return None
+        return token
+
+    def first_report(self) -> Optional[Match]:
+        """The first reported citation or report, e.g. (1992) 175 CLR 1 or 175 CLR 1"""
+        for token, kind in zip(self.tokens, self.kinds):
+            if kind == 'reported' or kind == 'report':
+                return token
+        return None
+
+    def all(self, kind: str) -> List[Match]:
+        return [token for token, token_kind in zip(self.tokens, self.kinds) if token_kind == kind]
+
+    def first_year(self, before: Optional[int] = None) -> Optional[Tuple[int, str]]:
+        """
+        Offset and text, e.g. '(1992)', of the first bracketed year, including
+        the year opening a medium neutral or reported citation
+        """
+        for token, kind in zip(self.tokens, self.kinds):
+            if before is not None and token.start() >= before:
+                return None
+            if kind == 'year' or kind == 'medium_neutral' or kind == 'reported':
+                return token.start(), token.group()[:6]
+        return None
+
+    def medium_neutral_spaced(self) -> bool:
+        """Whether any medium neutral citation is written with spaces, e.g. [2020] HCA 12"""
+        return any(token['mn_sep'] and token['mn_sep2'] for token in self.all('medium_neutral'))
+
+    def case_name(self) -> str:
+        match = CASE_NAME_PATTERN.match(self.text)
+        return match.group(1).strip().rstrip(',') if match else ''
+
+
+def tokenize(text: str) -> Iterator[Tuple[str, Match]]:
+    """
+    (kind, token) of each token of text, in order, scanned as they are read,
+    so a caller can stop once it has what it needs
+    """
+    # Each alternative is one outer group, which closes last, so a token's lastgroup
+    # names its kind. Abbreviations are checked inline: this loop runs for every token
+    flags = report_index().flags
+    position = 0
+    while True:
+        for token in TOKEN_PATTERN.finditer(text, position):
+            kind = token.lastgroup
+            if kind == 'medium_neutral':
+                if not flags[token['mn_court']]:
+                    break
+            elif kind == 'reported':
+                if not flags[token['series']] & REPORT_SERIES:
+                    break
+            elif kind == 'report':
+                token = REPORT_PATTERN.match(text, token.start())
+                if not flags[token['series']] & REPORT_SERIES:
+                    break
+            yield kind, token
+        else:
+            return
+        if kind == 'medium_neutral':
+            # '[2019] Smith 5' is not a citation, but its year is still a year
+            year = YEAR_PATTERN.match(text, token.start())
+            yield 'year', year
+            position = year.end()
+        else:
+            if kind == 'reported':
+                yield 'year', YEAR_PATTERN.match(text, token.start())
+            # A report read with an unknown series, e.g. '107 Re X 175' in '107 Re X 175 CLR 1',
+            # may end inside a real one, so the scan resumes at its series
+            position = token.start('series')
@@ -0,0 +1,83 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Runs at most one computation per key at a time. Callers that ask for a key
+    while it is being computed wait for that computation and share its result
+    (or its exception) instead of repeating the work.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.shared = 0
+
+    def do(self, key: Hashable, compute: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Return compute()'s result for key and whether it was shared with another caller"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = compute()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+
+class LatestRequests:
+    """
+    The newest request from each client, so that requests superseded by a
+    later one from the same client can skip their work. Clients are forgotten
+    least recently used first beyond max_clients.
+    """
+
+    def __init__(self, max_clients: int = 10000):
+        self.max_clients = max_clients
+        self._latest: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counter = 0
+        self.superseded = 0
+
+    def begin(self, client: Hashable) -> int:
+        """Register a new request from client, superseding its earlier ones; returns its ticket"""
+        with self._lock:
+            self._counter += 1
+            self._latest[client] = self._counter
+            self._latest.move_to_end(client)
+            while len(self._latest) > self.max_clients:
+                self._latest.popitem(last=False)
+            return self._counter
+
+    def is_latest(self, client: Hashable, ticket: int) -> bool:
+        with self._lock:
+            latest = self._latest.get(client, ticket) == ticket
+            if not latest:
+                self.superseded += 1
+            return latest
@@ -0,0 +1,85 @@
+import re
+from datetime import date, datetime
+from typing import Any, Union
+
+from .cache import LRUCache
+
+# Number of distinct date values kept in the normalisation memo cache
+DATE_CACHE_SIZE = 1024
+
+MONTHS = (
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December',
+)
+
+# Full month names and their three-letter abbreviations, lowercased
+_MONTH_NUMBERS = {
+    **{name.lower(): number for number, name in enumerate(MONTHS, 1)},
+    **{name[:3].lower(): number for number, name in enumerate(MONTHS, 1)},
+    'sept': 9,
+}
+
+# 2024-01-05, optionally followed by a time as stored by the database
+_ISO_DATE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})(?:[T ][\d:.]+(?:Z|[+-]\d{2}:?\d{2})?)?')
+# 1 January 2024, 05 Jan 2024, 1 January, 2024
+_TEXT_DATE = re.compile(r'(\d{1,2})\s+([A-Za-z]+)\.?,?\s+(\d{4})')
+
+DATE_CACHE = LRUCache(DATE_CACHE_SIZE)
+
+def format_aglc_date(day: int, month: int, year: int) -> str:
+    """A date in AGLC form, e.g. '1 January 2024'"""
+    return f"{day} {MONTHS[month - 1]} {year}"
+
+def parse_date(value: Any) -> Union[date, str]:
+    """
+    Read a citation date. Date and datetime objects, ISO strings ('2024-01-01')
+    and day-month-year text ('01 Jan 2024') become a date. Other text, such as
+    a year or a season, is returned stripped; empty and unsupported values
+    become ''. Results are memoised, as the same dates recur across a bibliography.
+    """
+    if not value or not isinstance(value, (str, date)):
+        return ''
+    parsed = DATE_CACHE.get(value)
+    if parsed is None:
+        parsed = _parse(value)
+        DATE_CACHE.put(value, parsed)
+    return parsed
+
+def normalise_date(value: Any) -> str:
+    """
+    Format a date for a citation in AGLC form, e.g. '1 January 2024'.
+    Accepts anything parse_date does; text that is not a date is returned unchanged.
+    """
+    parsed = parse_date(value)
+    if isinstance(parsed, date):
+        return format_aglc_date(parsed.day, parsed.month, parsed.year)
+    return parsed
+
+def _parse(value) -> Union[date, str]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+
+    text = value.strip()
+    match = _ISO_DATE.fullmatch(text)
+    if match:
+        year, month, day = (int(part) for part in match.groups())
+        if _is_valid(year, month, day):
+            return date(year, month, day)
+        return text
+
+    match = _TEXT_DATE.fullmatch(text)
+    if match:
+        day, month_name, year = match.groups()
+        month = _MONTH_NUMBERS.get(month_name.lower())
+        if month and _is_valid(int(year), month, int(day)):
+            return date(int(year), month, int(day))
+    return text
+
+def _is_valid(year: int, month: int, day: int) -> bool:
+    try:
+        date(year, month, day)
+    except ValueError:
+        return False
+    return True
@@ -0,0 +1,244 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from itertools import islice
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .citation_extractor import CitationExtractor, copy_fields, split_entries
+from .coalesce import SingleFlight
+
+# Pastes shorter than this, in characters, are extracted in the request thread,
+# where pickling and inter-process round trips would cost more than they save
+DEFAULT_INLINE_THRESHOLD = 4000
+# Entries per work unit when a batch is sent to the worker processes
+DEFAULT_CHUNK_SIZE = 50
+# Seconds a request waits for a work unit before giving up on it
+DEFAULT_JOB_TIMEOUT = 10.0
+
+
+class ExtractionOutcome(NamedTuple):
+    source_type: Optional[str]
+    citation_type: Optional[str]
+    fields: Optional[Dict[str, Any]]
+    error: Optional[str]
+
+
+class PoolBusy(Exception):
+    """Raised when the pool already has max_pending requests in flight"""
+
+
+def extract_outcome(extractor: CitationExtractor, source_type: str, text: str) -> ExtractionOutcome:
+    """Extract one entry, reporting a failure as the outcome's error rather than raising"""
+    try:
+        return ExtractionOutcome(*extractor.extract(source_type, text), None)
+    except ValueError as e:
+        return ExtractionOutcome(None, None, None, str(e))
+    except Exception as e:
+        print(f"Error extracting citation: {str(e)}")
+        return ExtractionOutcome(None, None, None, "Failed to extract citation details")
+
+# Each worker process extracts with its own extractor. It keeps no result cache:
+# results come back to the request's process and are cached there.
+_worker_extractor: Optional[CitationExtractor] = None
+
+def _init_worker() -> None:
+    global _worker_extractor
+    _worker_extractor = CitationExtractor(cache_size=None)
+
+def _extract_one(source_type: str, text: str) -> Tuple[str, str, Dict[str, Any]]:
+    return _worker_extractor.extract(source_type, text)
+
+def _extract_chunk(source_type: str, texts: List[str]) -> List[ExtractionOutcome]:
+    return [extract_outcome(_worker_extractor, source_type, text) for text in texts]
+
+def _split(text: str, limit: Optional[int]) -> List[str]:
+    return list(islice(split_entries(text), limit))
+
+
+class ExtractionPool:
+    """
+    Runs large extractions in a pool of worker processes so they do not hold
+    the request thread's CPU; the request only waits for the result.
+
+    Short pastes are extracted in-process by the given extractor. Larger ones
+    are sent to the pool whole, so whitespace normalisation and source type
+    detection run there too; identical ones in flight at once are extracted
+    once. Long reference lists are split into entries in the pool as well.
+    Batch entries are looked up in the extractor's result cache first, and
+    the rest are extracted in-process if they are short in total, and in the
+    pool otherwise, in chunks of chunk_size entries, with their results cached.
+    At most max_pending requests may have work in the pool at once; beyond that
+    extract(), split() and extract_many() raise PoolBusy straight away rather
+    than queueing. A request waits timeout seconds for each work unit and then
+    raises TimeoutError (or, in a batch, reports the unit's entries as timed
+    out). Work that is already running cannot be stopped, so a request's slot
+    is released only when all of its work has finished. The pool is started on
+    first use and uses the spawn start method, like ParallelFormatter.
+    """
+
+    def __init__(
+        self,
+        extractor: CitationExtractor,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        timeout: float = DEFAULT_JOB_TIMEOUT,
+        inline_threshold: int = DEFAULT_INLINE_THRESHOLD,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+        self.extractor = extractor
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.workers
+        self.timeout = timeout
+        self.inline_threshold = inline_threshold
+        self.chunk_size = chunk_size
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.pending = 0
+        self.pooled = 0
+        self.inline = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def extract(self, source_type: str, text: str) -> Tuple[str, str, Dict[str, Any]]:
+        """Extract like CitationExtractor.extract, in the pool for large pastes"""
+        if len(text) < self.inline_threshold:
+            self._count('inline')
+            return self.extractor.extract(source_type, text)
+        result, _ = self._flight.do((source_type, text), lambda: self._run(_extract_one, source_type, text))
+        return result[0], result[1], copy_fields(result[2])
+
+    def split(self, text: str, limit: Optional[int] = None) -> List[str]:
+        """The first limit entries of a pasted reference list, split in the pool if it is large"""
+        if len(text) < self.inline_threshold:
+            return _split(text, limit)
+        return self._run(_split, text, limit)
+
+    def extract_many(self, source_type: str, texts: Sequence[str]) -> Iterator[ExtractionOutcome]:
+        """
+        Extract each of the entries split() returned, yielding outcomes in order
+        as they complete. Work is submitted before this returns, so PoolBusy is
+        raised here, not while iterating.
+        """
+        cached = [self.extractor.cached(source_type, text) for text in texts]
+        missing = [text for text, result in zip(texts, cached) if result is None]
+        if sum(len(text) for text in missing) < self.inline_threshold:
+            self._count('inline')
+            misses = (extract_outcome(self.extractor, source_type, text) for text in missing)
+        else:
+            chunks = [missing[start:start + self.chunk_size] for start in range(0, len(missing), self.chunk_size)]
+            futures = self._submit(_extract_chunk, [(source_type, chunk) for chunk in chunks])
+            outcomes = self._chunk_outcomes(futures, [len(chunk) for chunk in chunks])
+            misses = self._remembered(source_type, missing, outcomes)
+        return self._merged(cached, misses)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size and counters for monitoring"""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'pending': self.pending,
+                'pooled': self.pooled,
+                'inline': self.inline,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; the pool is restarted on next use"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def _run(self, function, *args) -> Any:
+        future, = self._submit(function, [args])
+        return self._wait(future)
+
+    def _remembered(
+        self, source_type: str, texts: List[str], outcomes: Iterator[ExtractionOutcome]
+    ) -> Iterator[ExtractionOutcome]:
+        # Results from the workers are cached here, where later requests look them up
+        for text, outcome in zip(texts, outcomes):
+            if outcome.error is None:
+                result = (outcome.source_type, outcome.citation_type, copy_fields(outcome.fields))
+                self.extractor.remember(source_type, text, result)
+            yield outcome
+
+    @staticmethod
+    def _merged(cached: List[Optional[tuple]], misses: Iterator[ExtractionOutcome]) -> Iterator[ExtractionOutcome]:
+        for result in cached:
+            yield next(misses) if result is None else ExtractionOutcome(*result, None)
+
+    def _chunk_outcomes(self, futures: List[Future], sizes: List[int]) -> Iterator[ExtractionOutcome]:
+        for future, size in zip(futures, sizes):
+            try:
+                outcomes = self._wait(future)
+            except TimeoutError:
+                outcomes = [ExtractionOutcome(None, None, None, "Extraction timed out")] * size
+            yield from outcomes
+
+    def _wait(self, future: Future) -> Any:
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # Cancelling only stops work that has not started yet
+            future.cancel()
+            self._count('timeouts')
+            raise TimeoutError(f"Extraction did not finish within {self.timeout} seconds")
+
+    def _submit(self, function, calls: List[tuple]) -> List[Future]:
+        """Submit one request's work, holding one slot until all of it has finished"""
+        if not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            raise PoolBusy(f"Extraction pool is busy ({self.max_pending} requests pending)")
+        with self._lock:
+            self.pending += 1
+            self.pooled += 1
+
+        remaining = [len(calls)]
+
+        def finished(_):
+            with self._lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+                self.pending -= 1
+            self._slots.release()
+
+        futures = []
+        try:
+            pool = self._pool()
+            for args in calls:
+                futures.append(pool.submit(function, *args))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            # Release the slot for the calls that were never submitted
+            for _ in range(len(calls) - len(futures)):
+                finished(None)
+            for future in futures:
+                future.add_done_callback(finished)
+            raise
+        for future in futures:
+            future.add_done_callback(finished)
+        return futures
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker
+                )
+            return self._executor
@@ -0,0 +1,222 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .formatcitation import AGLC4Citation, CitationSource
+from .names import parse_names
+
+# Citation types whose titles are italicised, so their short titles are too
+ITALIC_TITLE_TYPES = frozenset({
+    'case_reported', 'case_unreported_medium_neutral', 'case_unreported_no_medium_neutral',
+    'proceeding', 'arbitration', 'high_court_transcript',
+    'act', 'bill', 'delegated_legislation', 'treaty',
+    'book', 'book_with_editor', 'translated_book', 'audiobook', 'report',
+})
+
+# Legislation is referred to by its short title alone, never with '(n X)'
+NO_CROSS_REFERENCE_TYPES = frozenset({'act', 'bill', 'delegated_legislation'})
+
+# Fields tried, in order, when a citation has no short title
+_TITLE_FIELDS = ('case_name', 'treaty_title', 'title', 'book_title', 'translation_title')
+
+
+class FootnoteSequence:
+    """
+    An ordered list of footnote references rendered in AGLC4 form.
+
+    Each reference is a (citation_id, pinpoint) pair. A footnote is rendered as
+    a full citation on the source's first occurrence, 'Ibid' when the preceding
+    footnote cites the same source, and a subsequent reference such as
+    'Short Title (n 12) 45' otherwise. Footnote numbers are 1-based; positions
+    passed to the editing methods are 0-based indexes into the sequence.
+
+    The sequence keeps the index of each source's first occurrence. After an
+    insert, delete or move only footnotes whose form actually changed are
+    re-rendered, and the editing methods return their positions. Each source
+    is formatted once; full citations compose it with their own pinpoint.
+    """
+
+    def __init__(
+        self,
+        citations: Dict[str, Dict[str, Any]],
+        references: Iterable[Tuple[str, Optional[str]]] = (),
+        formatter: Optional[AGLC4Citation] = None
+    ):
+        self.citations = citations
+        self.formatter = formatter or AGLC4Citation()
+        self._references: List[Tuple[str, Optional[str]]] = [(cid, pin or None) for cid, pin in references]
+        self._first: Dict[str, int] = {}
+        self._keys: List[Optional[tuple]] = [None] * len(self._references)
+        self._rendered: List[Optional[str]] = [None] * len(self._references)
+        self._sources: Dict[str, CitationSource] = {}
+        self._refresh(0)
+
+    def __len__(self) -> int:
+        return len(self._references)
+
+    def __getitem__(self, position: int) -> str:
+        return self._rendered[position]
+
+    @property
+    def references(self) -> List[Tuple[str, Optional[str]]]:
+        return list(self._references)
+
+    def footnotes(self) -> List[str]:
+        """Rendered text of every footnote, in order"""
+        return list(self._rendered)
+
+    def form(self, position: int) -> str:
+        """The form used for a footnote: 'full', 'ibid' or 'subsequent'"""
+        return self._keys[position][0]
+
+    def first_occurrence(self, citation_id: str) -> Optional[int]:
+        """Footnote number of the first reference to citation_id"""
+        position = self._first.get(citation_id)
+        return position + 1 if position is not None else None
+
+    def insert(self, position: int, citation_id: str, pinpoint: Optional[str] = None) -> List[int]:
+        """Insert a reference before position; returns the positions re-rendered"""
+        position = min(max(position, 0), len(self._references))
+        self._references.insert(position, (citation_id, pinpoint or None))
+        self._keys.insert(position, None)
+        self._rendered.insert(position, None)
+        return self._refresh(position)
+
+    def append(self, citation_id: str, pinpoint: Optional[str] = None) -> List[int]:
+        return self.insert(len(self._references), citation_id, pinpoint)
+
+    def delete(self, position: int) -> List[int]:
+        """Delete the reference at position; returns the positions re-rendered"""
+        del self._references[position]
+        del self._keys[position]
+        del self._rendered[position]
+        return self._refresh(position)
+
+    def move(self, source: int, destination: int) -> List[int]:
+        """Move the reference at source to destination; returns the positions re-rendered"""
+        reference = self._references.pop(source)
+        key = self._keys.pop(source)
+        rendered = self._rendered.pop(source)
+        self._references.insert(destination, reference)
+        self._keys.insert(destination, key)
+        self._rendered.insert(destination, rendered)
+        return self._refresh(min(source, destination))
+
+    def set_pinpoint(self, position: int, pinpoint: Optional[str]) -> List[int]:
+        """Change the pinpoint of one reference; returns the positions re-rendered"""
+        citation_id, _ = self._references[position]
+        self._references[position] = (citation_id, pinpoint or None)
+        return self._refresh(position)
+
+    def update_citation(self, citation_id: str, fields: Dict[str, Any]) -> List[int]:
+        """Replace a source's fields and re-render every footnote that cites it"""
+        self.citations[citation_id] = fields
+        self._sources.pop(citation_id, None)
+        changed = []
+        for position, (cid, _) in enumerate(self._references):
+            if cid == citation_id:
+                self._rendered[position] = self._render(position, self._keys[position])
+                changed.append(position)
+        return changed
+
+    def _refresh(self, start: int) -> List[int]:
+        """
+        Recompute forms from start onwards, re-rendering only footnotes whose
+        form key changed. First occurrences before start are unaffected.
+        """
+        self._first = {cid: i for cid, i in self._first.items() if i < start}
+        first = self._first
+        references = self._references
+        changed = []
+        for position in range(start, len(references)):
+            citation_id, pinpoint = references[position]
+            first.setdefault(citation_id, position)
+            if position and references[position - 1][0] == citation_id:
+                key = ('ibid', citation_id, pinpoint, references[position - 1][1])
+            elif first[citation_id] == position:
+                key = ('full', citation_id, pinpoint)
+            else:
+                key = ('subsequent', citation_id, pinpoint, first[citation_id])
+            if key != self._keys[position]:
+                self._keys[position] = key
+                self._rendered[position] = self._render(position, key)
+                changed.append(position)
+        return changed
+
+    def _render(self, position: int, key: tuple) -> str:
+        form, citation_id, pinpoint = key[0], key[1], key[2]
+        citation = self.citations.get(citation_id)
+        if citation is None:
+            raise ValueError(f"Unknown citation: {citation_id}")
+
+        if form == 'ibid':
+            previous_pinpoint = key[3]
+            if pinpoint and pinpoint != previous_pinpoint:
+                return f"Ibid {pinpoint}."
+            return "Ibid."
+
+        citation_type = citation['type'].lower()
+        if form == 'full':
+            source = self._sources.get(citation_id)
+            if source is None:
+                source = self._sources[citation_id] = self.formatter.format_source(citation_type, **citation)
+            return format_full_reference(self.formatter, source, citation, pinpoint)
+
+        short = short_reference(citation_type, citation)
+        if citation_type not in NO_CROSS_REFERENCE_TYPES:
+            short = f"{short} (n {key[3] + 1})"
+        if pinpoint:
+            short = f"{short} {pinpoint}"
+        return short + '.'
+
+
+def format_full_reference(
+    formatter: AGLC4Citation,
+    source: CitationSource,
+    citation: Dict[str, Any],
+    pinpoint: Optional[str]
+) -> str:
+    """
+    Full first citation of a source (see AGLC4Citation.format_source) with the
+    reference's pinpoint, followed by the short title in parentheses when the
+    citation has one
+    """
+    text = formatter.format_reference(source, pinpoint)
+    short_title = citation.get('short_title')
+    if short_title:
+        text = f"{text.rstrip('.')} ('{_italicise(source.citation_type, short_title)}')."
+    return text
+
+def short_reference(citation_type: str, citation: Dict[str, Any]) -> str:
+    """
+    Name used for subsequent references: the short title if set, otherwise
+    author surnames (with particles, e.g. 'van Beethoven') for authored works
+    or the title
+    """
+    short_title = citation.get('short_title')
+    if short_title:
+        return _italicise(citation_type, short_title)
+
+    # Parsed records, see utils.names; rows stored before they existed are parsed here
+    names = citation.get('author_names') or [name._asdict() for name in parse_names(citation.get('authors'))]
+    if names:
+        surnames = [
+            ' '.join(part for part in (name['particle'], name['family']) if part)
+            for name in names if name['family']
+        ]
+        if len(surnames) == 1:
+            return surnames[0]
+        if len(surnames) == 2:
+            return f"{surnames[0]} and {surnames[1]}"
+        if len(surnames) == 3:
+            return f"{surnames[0]}, {surnames[1]} and {surnames[2]}"
+        if surnames:
+            return f"{surnames[0]} et al"
+    if citation.get('author'):
+        return citation['author']
+
+    for field in _TITLE_FIELDS:
+        if citation.get(field):
+            return _italicise(citation_type, citation[field])
+    return ''
+
+def _italicise(citation_type: str, text: str) -> str:
+    return f"<i>{text}</i>" if citation_type in ITALIC_TITLE_TYPES else text
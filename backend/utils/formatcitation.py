@@ -1,9 +1,55 @@
-import datetime
-from datetime import date  
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Iterator, NamedTuple, Optional, Sequence
+
+from .cache import LRUCache
+from .dates import normalise_date
+from .rendering import RENDERERS, Runs, parse_markup, render
+from .templates import Template, field, group, text
+
+# Number of formatted citations kept in each formatter's memo cache
+DEFAULT_FORMAT_CACHE_SIZE = 4096
+
+# Stored with each formatted citation. Bump whenever a change to the templates,
+# the date handling or the bibliography collation keys alters stored output,
+# so stored rows are re-rendered.
+FORMATTER_VERSION = 3
+
+# Stands in for the pinpoint when a citation is split around it, see
+# FormatterEntry.split_at_pinpoint. Templates never emit control characters.
+PINPOINT_MARKER = '\x00pinpoint\x00'
+
+def is_stale(record: Dict[str, Any]) -> bool:
+    """
+    Whether a stored citation was formatted by an older formatter version,
+    or has no bibliography collation key
+    """
+    version = record.get('formatter_version')
+    return version is None or version < FORMATTER_VERSION or not record.get('collation_key')
+
+class FormatResult(NamedTuple):
+    """Outcome of formatting one citation in a batch"""
+    citation_id: Optional[str]
+    formatted_citation: Optional[str]
+    error: Optional[str]
+    # Output per requested target format, see format_many
+    rendered: Optional[Dict[str, str]] = None
+
+class CitationSource(NamedTuple):
+    """
+    A citation formatted once for reuse with many pinpoints, see
+    AGLC4Citation.format_source. head and tail surround the pinpoint; both are
+    None for types without one.
+    """
+    citation_type: str
+    formatted_citation: str
+    head: Optional[str]
+    tail: Optional[str]
 
 class AGLC4Citation:
-    def __init__(self):
-        pass  
+    def __init__(self, cache_size: Optional[int] = DEFAULT_FORMAT_CACHE_SIZE):
+        # Memo cache of formatted citations, disabled when cache_size is 0 or None
+        self.cache = LRUCache(cache_size) if cache_size else None
 
     def normalize_date_fields(self, kwargs):
         """Just return kwargs as-is since we're working with strings"""
@@ -12,1050 +58,602 @@ class AGLC4Citation:
     def format_citation(self, citation_type, **kwargs):
         # Normalize date fields
         normalized_kwargs = self.normalize_date_fields(kwargs)
-        
-        formatting_functions = {
-            'case_reported': format_case_reported,
-            'case_unreported_medium_neutral': format_case_unreported_medium_neutral,
-            'case_unreported_no_medium_neutral': format_case_unreported_no_medium_neutral,
-            'act': format_legislation,
-            'bill': format_bill,
-            'explanatory_memorandum': format_explanatory_memorandum,
-            'hansard': format_hansard,
-            'treaty': format_treaty,
-            'journal_article': format_journal_article,
-            'book': format_book,
-            'book_chapter': format_book_chapter,
-            'report': format_report,
-            'online_dictionary': format_online_dictionary,
-            'hardcopy_dictionary': format_hardcopy_dictionary,
-            'online_legal_encyclopedia': format_online_legal_encyclopedia,
-            'hardcopy_legal_encyclopedia': format_hardcopy_legal_encyclopedia,
-            'online_looseleaf': format_online_looseleaf,
-            'hardcopy_looseleaf': format_hardcopy_looseleaf,
-            'online_newspaper': format_online_newspaper,
-            'printed_newspaper': format_printed_newspaper,
-            'internet_material': format_internet_materials_author,
-            'proceeding': format_proceeding,
-            'court_order': format_court_order,
-            'arbitration': format_arbitration,
-            'transcript_of_proceedings': format_transcript_of_proceedings,
-            'high_court_transcript': format_high_court_transcript,
-            'submission': format_submission,
-            'delegated_legislation': format_delegated_legislation,
-            'gazette': format_gazette,
-            'order_or_ruling': format_order_or_ruling,
-            'court_practice_direction': format_court_practice_direction,
-            'symposium': format_symposium,
-            'book_with_editor': format_book_with_editor,
-            'translated_book': format_translated_book,
-            'audiobook': format_audiobook,
-            'research_paper': format_research_paper,
-            'speech': format_speech,
-            'press_and_media_release': format_press_release,
-            'periodical': format_periodical,
-            'interview': format_interview,
-            'film_television_media': format_film_television_media,
-            'social_media_post': format_social_media_post,
-            'written_correspondence': format_written_correspondence,
-            'custom': format_custom,
-        }
-        
-        if citation_type not in formatting_functions:
+
+        entry = FORMATTER_REGISTRY.get(citation_type)
+        if entry is None:
             raise ValueError(f"Unsupported citation type: {citation_type}")
-        
-        # Get the function's parameters
-        import inspect
-        func_params = inspect.signature(formatting_functions[citation_type]).parameters
-        
-        # Filter kwargs to only include parameters accepted by the function
-        filtered_kwargs = {k: v for k, v in normalized_kwargs.items() if k in func_params}
-        
-        if citation_type == 'online_legal_encyclopedia':
-            # Ensure retrieval_date is a string in 'YYYY-MM-DD' format
-            retrieval_date = kwargs.get('retrieval_date')
-            if isinstance(retrieval_date, str):
-                retrieval_date_parts = retrieval_date.split('-')
-                if len(retrieval_date_parts) == 3:
-                    year, month, day = retrieval_date_parts
-                    retrieval_date = f"{day} {self.get_month_name(int(month))} {year}"
-            elif isinstance(retrieval_date, datetime.date):
-                retrieval_date = retrieval_date.strftime("%d %B %Y")
-            else:
-                retrieval_date = ''
 
-            return f"{kwargs.get('publisher')}, {kwargs.get('title')} (online at {retrieval_date}) '{kwargs.get('title_number')} {kwargs.get('title_name')}' [{kwargs.get('chapter_number')} '{kwargs.get('chapter_name')}'] {kwargs.get('paragraph')}"
-        
-        # Get the formatted citation
-        citation = formatting_functions[citation_type](**filtered_kwargs)
-        
-        # Remove spaces before commas
-        citation = citation.replace(' ,', ',')
-        
-        # Add a period if it doesn't already end with one
-        if not citation.endswith('.'):
-            citation += '.'
-        
+        if self.cache is None:
+            return entry.format(normalized_kwargs)
+
+        key = entry.cache_key(normalized_kwargs)
+        citation = self.cache.get(key)
+        if citation is None:
+            citation = entry.format(normalized_kwargs)
+            self.cache.put(key, citation)
         return citation
 
-def format_date(date_string):
+    def cache_key(self, citation_type, **kwargs) -> str:
+        """The memo cache key of a citation, e.g. to check whether it is cached"""
+        entry = FORMATTER_REGISTRY.get(citation_type)
+        if entry is None:
+            raise ValueError(f"Unsupported citation type: {citation_type}")
+        return entry.cache_key(self.normalize_date_fields(kwargs))
+
+    def format_source(self, citation_type, **kwargs) -> CitationSource:
+        """
+        Format a citation once for use with any pinpoint: the citation without
+        a pinpoint, and the text either side of where a pinpoint goes.
+        format_reference(source, pinpoint) then gives the same text as
+        format_citation with that pinpoint, without formatting it again.
+        """
+        normalized_kwargs = self.normalize_date_fields({**kwargs, 'pinpoint': None})
+        entry = FORMATTER_REGISTRY.get(citation_type)
+        if entry is None:
+            raise ValueError(f"Unsupported citation type: {citation_type}")
+
+        key = None
+        if self.cache is not None:
+            key = f"source:{entry.cache_key(normalized_kwargs)}"
+            source = self.cache.get(key)
+            if source is not None:
+                return source
+
+        head, tail = entry.split_at_pinpoint(normalized_kwargs)
+        source = CitationSource(citation_type, entry.format(normalized_kwargs), head, tail)
+        if key is not None:
+            self.cache.put(key, source)
+        return source
+
+    def format_reference(self, source: CitationSource, pinpoint: Optional[str] = None) -> str:
+        """The source's citation with a pinpoint, composed from format_source's parts"""
+        if not pinpoint or source.head is None:
+            return source.formatted_citation
+        return FORMATTER_REGISTRY[source.citation_type].compose(source.head, pinpoint, source.tail)
+
+    def format_runs(self, citation_type, **kwargs) -> Runs:
+        """
+        Format a citation into runs of text (see utils.rendering), so it can be
+        rendered to several output formats without formatting it again
+        """
+        return parse_markup(self.format_citation(citation_type, **kwargs))
+
+    def format_many(
+        self,
+        citations: Iterable[Dict[str, Any]],
+        targets: Optional[Sequence[str]] = None
+    ) -> Iterator[FormatResult]:
+        """
+        Format an iterable of citation dicts, each carrying its 'type' alongside its fields.
+        Yields one FormatResult per citation, in order. A citation that fails to format
+        is reported through the result's error instead of aborting the batch.
+        If targets names output formats from utils.rendering.RENDERERS, each citation is
+        formatted once and rendered to every target in the result's rendered dict.
+        """
+        for target in targets or ():
+            if target not in RENDERERS:
+                raise ValueError(f"Unsupported output format: {target}")
+
+        for citation in citations:
+            citation_id = citation.get('id')
+            try:
+                citation_type = citation['type'].lower()
+                formatted = self.format_citation(citation_type, **citation)
+                rendered = None
+                if targets:
+                    runs = parse_markup(formatted)
+                    rendered = {target: render(runs, target) for target in targets}
+                yield FormatResult(citation_id, formatted, None, rendered)
+            except KeyError as e:
+                yield FormatResult(citation_id, None, f"Missing required field: {str(e)}")
+            except Exception as e:
+                yield FormatResult(citation_id, None, str(e))
+
+
+class FormatterEntry:
     """
-    Formats a date string in the format "day month year" (e.g., "1 January 2024")
-    Returns the formatted date string or empty string if invalid
+    A citation type's compiled template together with the fields it consumes
+    and the post-processing applied to its output.
+    Entries are built once at import time, see FORMATTER_REGISTRY below.
     """
-    if not date_string or not isinstance(date_string, str):
-        return ''
-    
-    try:
-        # Split the date string into components
-        parts = date_string.split(' ')
-        if len(parts) != 3:
-            return date_string  # Return as-is if not in expected format
-            
-        day, month, year = parts
-        
-        # Remove leading zeros from day if present
-        day = str(int(day))
-        
-        # Return formatted date
-        return f"{day} {month} {year}"
-    except:
-        return date_string  # Return original string if parsing fails
-
-def format_case_reported(case_name=None, year=None, volume=None, law_report_series=None, starting_page=None, pinpoint=None):
-    citation = []
-    if case_name:
-        citation.append(f"<i>{case_name}</i>")
-    if year:
-        citation.append(f"{year}")
-    if volume:
-        citation.append(f"{volume}")
-    if law_report_series:
-        citation.append(law_report_series)
-    if starting_page:
-        citation.append(str(starting_page) + (',' if pinpoint else ''))
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_case_unreported_medium_neutral(case_name=None, year=None, court_identifier=None, judgment_number=None, pinpoint=None):
-    citation = []
-    if case_name:
-        citation.append(f"<i>{case_name}</i>")
-    if year:
-        citation.append(f"{year}")
-    if court_identifier:
-        citation.append(court_identifier)
-    if judgment_number:
-        citation.append(f"{str(judgment_number)},")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_case_unreported_no_medium_neutral(case_name=None, court=None, judge=None, full_date=None, pinpoint=None):
-    citation = []
-    if case_name:
-        citation.append(f"<i>{case_name}</i>")
-    if court or judge or date:
-        court_info = []
-        if court:
-            court_info.append(court)
-        if judge:
-            court_info.append(judge)
-        if full_date:
-            court_info.append(format_date(full_date))
-        citation.append(f"({', '.join(court_info)})")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_legislation(title=None, year=None, jurisdiction=None, pinpoint=None):
-    citation = []
-    if title:
-        citation.append(f"<i>{title}</i>")
-    if year:
-        citation.append(f"<i>{year}</i>")
-    if jurisdiction:
-        citation.append(f"({jurisdiction})")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_bill(title=None, year=None, jurisdiction=None, pinpoint=None):
-    citation = []
-    if title:
-        citation.append(title)
-    if year:
-        citation.append(str(year))
-    if jurisdiction:
-        citation.append(f"({jurisdiction})")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_explanatory_memorandum(explanatory_type=None, bill_citation=None, pinpoint=None):
-    citation = []
-    if explanatory_type:
-        citation.append(explanatory_type)
-    if bill_citation:
-        citation.append(bill_citation)
-    if pinpoint:
-        citation.append(pinpoint)
-    return " ".join(citation)
-
-def format_hansard(jurisdiction=None, chamber=None, full_date=None, pinpoint=None, name_of_speaker=None):
-    citation = []
-    if jurisdiction:
-        citation.append(f"{jurisdiction},")
-    citation.append("<i>Parliamentary Debates</i>,")
-    if chamber:
-        citation.append(chamber + ",")
-    if full_date:
-        citation.append(format_date(full_date) + ",")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    if name_of_speaker:
-        citation.append(f"({name_of_speaker})")
+    __slots__ = ('citation_type', 'template', 'params', 'postprocess')
+
+    def __init__(self, citation_type, template, postprocess=None):
+        self.citation_type = citation_type
+        self.template = template
+        self.params = template.fields
+        self.postprocess = postprocess
+
+    def format(self, fields):
+        citation = self.template.render(fields)
+        if self.postprocess is not None:
+            citation = self.postprocess(citation)
+        return citation
 
-    return " ".join(citation)
+    def split_at_pinpoint(self, fields):
+        """
+        The template's output with a pinpoint, before post-processing, split
+        into the text before and after the pinpoint; (None, None) when the type
+        has no pinpoint or places it more than once
+        """
+        if 'pinpoint' not in self.params:
+            return None, None
+        parts = self.template.render({**fields, 'pinpoint': PINPOINT_MARKER}).split(PINPOINT_MARKER)
+        if len(parts) != 2:
+            return None, None
+        return parts[0], parts[1]
+
+    def compose(self, head, pinpoint, tail):
+        """A citation from split_at_pinpoint's parts and a pinpoint"""
+        citation = f"{head}{pinpoint}{tail}"
+        if self.postprocess is not None:
+            citation = self.postprocess(citation)
+        return citation
 
-def format_treaty(title=None, parties=None, date_opened=None, treaty_series=None, date_in_force=None, pinpoint=None):
-    citation = []
-    if title:
-        citation.append(f"<i>{title}</i>,")
-    if parties:
-        citation.append(parties + ",")
-    if date_opened:
-        citation.append(f"opened for signature {format_date(date_opened)},")
-    if treaty_series:
-        citation.append(treaty_series)
-    if date_in_force:
-        citation.append(f"(entered into force {format_date(date_in_force)})")
-    if pinpoint:
-        citation.append(pinpoint)
+    def cache_key(self, fields):
+        """
+        Stable hash of the citation type and the fields this formatter consumes.
+        Unset (None) fields are left out, as the formatter treats them as absent.
+        """
+        consumed = [[k, fields[k]] for k in self.params if fields.get(k) is not None]
+        payload = json.dumps([self.citation_type, consumed], default=_cache_key_default, ensure_ascii=False)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+def _cache_key_default(value):
+    # Tag non-JSON values with their type so that, e.g., a date and its ISO string hash differently
+    return [type(value).__name__, str(value)]
+
+def finalize_citation(citation):
+    """Remove spaces before commas and make sure the citation ends with a period"""
+    citation = citation.replace(' ,', ',')
+    if not citation.endswith('.'):
+        citation += '.'
+    return citation
+
+def format_date(value):
+    """
+    Formats a date as "day month year" (e.g., "1 January 2024").
+    See utils.dates.normalise_date for the accepted inputs.
+    """
+    return normalise_date(value)
 
-    return " ".join(citation)
+def join_names(names):
+    """
+    A name list in display form as AGLC4 rule 1.4.1 lists it: up to three names
+    joined with 'and', more as the first name 'et al'. Names are stored in
+    display form (see utils.names), so they are joined as they are.
+    """
+    if not names:
+        return ''
+    if isinstance(names, str):
+        return names
+    if len(names) == 1:
+        return names[0]
+    if len(names) == 2:
+        return f"{names[0]} and {names[1]}"
+    if len(names) == 3:
+        return f"{names[0]}, {names[1]} and {names[2]}"
+    return f"{names[0]} et al"
 
 def format_authors(authors):
-    if not authors:
-        return ''
-    if isinstance(authors, str):
-        return authors
-    if len(authors) == 1:
-        return authors[0]
-    elif len(authors) == 2:
-        return f"{authors[0]} and {authors[1]}"
-    elif len(authors) == 3:
-        return f"{authors[0]}, {authors[1]} and {authors[2]}"
-    else:
-        return f"{authors[0]} et al"
+    return join_names(authors)
 
 def format_editors(editors):
     if not editors:
         return ''
-    if isinstance(editors, str):
-        return f"{editors} (ed)"
-    if len(editors) == 1:
-        return f"{editors[0]} (ed)"
-    elif len(editors) == 2:
-        return f"{editors[0]} and {editors[1]} (eds)"
-    elif len(editors) == 3:
-        return f"{editors[0]}, {editors[1]} and {editors[2]} (eds)"
-    else:
-        return f"{editors[0]} et al (eds)"
+    plural = not isinstance(editors, str) and len(editors) > 1
+    return f"{join_names(editors)} ({'eds' if plural else 'ed'})"
 
 def format_editors_without_suffix(editors):
-    if not editors:
-        return ''
-    if isinstance(editors, str):
-        return editors
-    if len(editors) == 1:
-        return editors[0]
-    if len(editors) == 2:
-        return f"{editors[0]} and {editors[1]}"
-    if len(editors) == 3:
-        return f"{editors[0]}, {editors[1]} and {editors[2]}"
-    return f"{editors[0]} et al"
-
-def format_journal_article(authors=None, title=None, year=None, volume=None, issue=None, journal=None, starting_page=None, pinpoint=None):
-    citation = []
-    if authors:
-        citation.append(format_authors(authors) + ',')
-    if title:
-        citation.append(f"'{title}'")
-    if year:
-        citation.append(f"{year}")
-    if volume:
-        citation.append(volume)
-    if issue:
-        citation.append(f"({issue})")
-    if journal:
-        citation.append(f"<i>{journal}</i>")
-    if starting_page:
-        citation.append(str(starting_page) + (',' if pinpoint else ''))
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_book(authors=None, title=None, publisher=None, edition=None, year=None, volume=None, pinpoint=None):
-    citation = []
-    if authors:
-        citation.append(format_authors(authors) + ',')
-    if title:
-        citation.append(f"<i>'{title}'</i>")
-    publication_details = []
-    if publisher:
-        publication_details.append(publisher)
-    if edition:
-        publication_details.append(f"{edition} ed")
-    if year:
-        publication_details.append(str(year))
-    if publication_details:
-        citation.append(f"({', '.join(publication_details)})")
-    if volume:
-        citation.append(f"vol {volume}")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_book_chapter(authors=None, chapter_title=None, editors=None, book_title=None, publisher=None, edition=None, year=None, volume=None, starting_page=None, pinpoint=None):
-    citation = []
-    if authors:
-        citation.append(format_authors(authors) + ",")
-    if chapter_title:
-        citation.append(f"'{chapter_title}'")
-    if editors:
-        formatted_editors = format_editors(editors)
-        citation.append(f"in {formatted_editors},")
-    if book_title:
-        citation.append(f"<i>{book_title}</i>")
-    publication_details = []
-    if publisher:
-        publication_details.append(publisher)
-    if edition:
-        publication_details.append(f"{edition} ed")
-    if year:
-        publication_details.append(str(year))
-    if publication_details:
-        citation.append(f"({', '.join(publication_details)})")
-    if volume:
-        citation.append(f"vol {volume}")
-    if starting_page:
-        citation.append(str(starting_page) + (',' if pinpoint else ''))
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_book_with_editor(authors=None, title=None, editors=None, publisher=None, edition=None, year=None, pinpoint=None):
-    citation = []
-    if authors:
-        citation.append(format_authors(authors))
-    if title:
-        citation.append(f"<i>{title}</i>,")
-    if editors:
-        citation.append(f"ed {format_editors_without_suffix(editors)}")
-    publication_details = []
-    if publisher:
-        publication_details.append(publisher)
-    if edition:
-        publication_details.append(f"{edition} ed")
-    if year:
-        publication_details.append(str(year))
-    if publication_details:
-        citation.append(f"({', '.join(publication_details)})")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_report(author=None, title=None, document_type=None, series_no=None, document_number=None, full_date=None, pinpoint=None):
-    citation = []
-    if author:
-        citation.append(author + ",")
-    if title:
-        citation.append(f"<i>{title}</i>")
-    document_info = []
-    if document_type:
-        document_info.append(document_type)
-    if series_no:
-        document_info.append(series_no)
-    if document_number:
-        document_info.append(document_number)
-    if full_date:
-        document_info.append(format_date(full_date))
-    if document_info:
-        citation.append(f"({', '.join(document_info)})")
-    if pinpoint:
-        citation.append(str(pinpoint))
-
-    return " ".join(citation)
-
-def format_online_dictionary(title=None, retrieval_date=None, entry_title=None, definition_number=None):
-    citation = []
-    if title:
-        citation.append(f"<i>{title}</i>")
-    if retrieval_date:
-        # Handle both string and date object formats
-        if isinstance(retrieval_date, str):
-            date_parts = retrieval_date.split('-')
-            if len(date_parts) == 3:
-                year, month, day = date_parts
-                formatted_date = f"{day} {AGLC4Citation().get_month_name(int(month))} {year}"
-            else:
-                formatted_date = retrieval_date
-        elif isinstance(retrieval_date, date):
-            formatted_date = retrieval_date.strftime("%d %B %Y")
-        else:
-            formatted_date = ''
-        citation.append(f"(online at {formatted_date})")
-    if entry_title:
-        citation.append(f"'{entry_title}'")
-    if definition_number:
-        citation.append(f"(def {definition_number})")
-
-    return " ".join(citation)
-
-def format_hardcopy_dictionary(title=None, edition=None, year=None, entry_title=None, definition_number=None):
-    citation = []
-    if title:
-        citation.append(f"<i>{title}</i>,")
-    if edition and year:
-        citation.append(f"({edition} ed, {year})")
-    if entry_title:
-        citation.append(f"'{entry_title}'")
-    if definition_number:
-        citation.append(f"(def {definition_number})")
-
-    return " ".join(citation)
-
-def format_online_legal_encyclopedia(publisher=None, title=None, retrieval_date=None, title_number=None, title_name=None, chapter_number=None, chapter_name=None, paragraph=None):
-    citation = []
-    if publisher:
-        citation.append(publisher + ",")
-    if title:
-        citation.append(f"<i>{title}</i>")
-    if retrieval_date:
-        citation.append(f"(online at {format_date(retrieval_date)})")
-    if title_number and title_name:
-        citation.append(f"{title_number} {title_name},")
-    if chapter_number and chapter_name:
-        citation.append(f"'{chapter_number} {chapter_name}'")
-    if paragraph:
-        citation.append(f"[{paragraph}]")
-
-    return " ".join(citation)
-
-def format_hardcopy_legal_encyclopedia(publisher=None, title=None, volume=None, full_date=None, title_number=None, title_name=None, chapter_number=None, chapter_name=None, paragraph=None):
-    citation = []
-    if publisher:
-        citation.append(publisher + ",")
-    if title:
-        citation.append(f"<i>{title}</i>,")
-    if volume:
-        citation.append(f"vol {volume}")
-    if full_date:
-        citation.append(f"(at {format_date(full_date)})")
-    if title_number and title_name:
-        citation.append(f"{title_number} {title_name},")
-    if chapter_number and chapter_name:
-        citation.append(f"'{chapter_number} {chapter_name}'")
-    if paragraph:
-        citation.append(f"[{paragraph}]")
-
-    return " ".join(citation)
-
-def format_online_looseleaf(author=None, publisher=None, title=None, retrieval_date=None, pinpoint=None):
-    citation = []
-    if author:
-        citation.append(f"{author},")
-    if publisher:
-        citation.append(f"{publisher},")
-    if title:
-        citation.append(f"<i>{title}</i>")
-    if retrieval_date:
-        citation.append(f"(online at {format_date(retrieval_date)})")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_hardcopy_looseleaf(author=None, publisher=None, title=None, volume=None, service_number=None, full_date=None, pinpoint=None):
-    citation = []
-    if author:
-        citation.append(f"{author},")
-    if publisher:
-        citation.append(f"{publisher},")
-    if title:
-        citation.append(f"<i>{title}</i>")
-    if volume:
-        citation.append(f"vol {volume}")
-    
-    # Handle service number or date
-    if service_number or date:
-        service_info = []
-        if service_number:
-            service_info.append(service_number)
-        elif full_date:
-            service_info.append(format_date(full_date))
-        citation.append(f"(at {', '.join(service_info)})")
-    
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_online_newspaper(author=None, title=None, newspaper=None, full_date=None, pinpoint=None, url=None):
-    citation = []
-    if author:
-        citation.append(author + ",")
-    if title:
-        citation.append(f"'{title}',")
-    if newspaper:
-        citation.append(f"<i>{newspaper}</i>")
-    if full_date:
-        citation.append(f"(online, {format_date(full_date)})")
-    if pinpoint:
-        citation.append(f"[{pinpoint}]")
-    if url:
-        citation.append(f"<{url}>")
-
-    return " ".join(citation)
-
-def format_printed_newspaper(author=None, title=None, newspaper=None, place=None, full_date=None, starting_page=None, pinpoint=None):
-    citation = []
-    if author:
-        citation.append(author + ",")
-    if title:
-        citation.append(f"'{title}',")
-    if newspaper:
-        citation.append(f"<i>{newspaper}</i>")
-    if place and date:
-        citation.append(f"({place}, {format_date(full_date)})")
-    if starting_page:
-        citation.append(f"{starting_page}")
-    if pinpoint:
-        citation.append(f", {pinpoint}")
-    return " ".join(citation)
-
-def format_internet_materials_author(author=None, document_title=None, web_page_title=None, document_type=None, full_date=None, pinpoint=None, url=None):
-    citation = []
-    if author:
-        citation.append(author + ",")
-    if document_title:
-        citation.append(f"'{document_title}',")
-    if web_page_title:
-        citation.append(f"<i>{web_page_title}</i>")
-    if document_type and date:
-        citation.append(f"({document_type}, {format_date(full_date)})")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    if url:
-        citation.append(f"<{url}>")
-    return " ".join(citation)
-
-def format_internet_materials_body(author=None, document_title=None, web_page_title=None, document_type=None, full_date=None, pinpoint=None, url=None):
-    citation = []
-    if author:
-        citation.append(f"'{author}',")
-    if document_title:
-        citation.append(f"'{document_title}',")
-    if web_page_title:
-        citation.append(f"<i>{web_page_title}</i>")
-    if document_type and date:
-        citation.append(f"({document_type}, {format_date(full_date)})")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    if url:
-        citation.append(f"<{url}>")
-    if short_title:
-        citation.append(f"('{short_title}')")
-    return " ".join(citation)
-
-def format_proceeding(case_name=None, court=None, proceeding_number=None, full_date=None):
-    citation = []
-    if case_name:
-        citation.append(f"<i>{case_name}</i>")
-    if court or proceeding_number or date:
-        court_info = []
-        if court:
-            court_info.append(f"{court}")
-        if proceeding_number:
-            court_info.append(f"{proceeding_number}")
-        if full_date:
-            court_info.append(f"commenced {format_date(full_date)}")
-        citation.append(f"({', '.join(court_info)})")
-    return " ".join(citation)
-
-def format_court_order(judicial_officers=None, case_name=None, court=None, proceeding_number=None, full_date=None):
-    citation = []
-    if judicial_officers:
-        citation.append(f"Order of {judicial_officers}")
-    if case_name:
-        citation.append(f"in <i>{case_name}</i>")
-    if court or proceeding_number or date:
-        court_info = []
-        if court:
-            court_info.append(court)
-        if proceeding_number:
-            court_info.append(proceeding_number)
-        if full_date:
-            court_info.append(format_date(full_date))
-        citation.append(f"({', '.join(court_info)})")
-    return " ".join(citation)
-
-def format_arbitration(case_name=None, award_description=None, forum=None, case_award_number=None, full_date=None, pinpoint=None):
-    citation = []
-    if case_name:
-        citation.append(f"<i>{case_name}</i>")
-        # If case name exists, put other elements in parentheses
-        if award_description or forum or case_award_number or full_date:
-            arb_info = []
-            if award_description:
-                arb_info.append(award_description)
-            if forum:
-                arb_info.append(forum)
-            if case_award_number:
-                arb_info.append(case_award_number)
-            if full_date:
-                arb_info.append(format_date(full_date))
-            citation.append(f"({', '.join(arb_info)})")
-            if pinpoint:
-                # No punctuation between parentheses and pinpoint when case name exists
-                citation.append(str(pinpoint))
-    else:
-        # If no case name, add elements with commas but without parentheses
-        elements = []
-        if award_description:
-            elements.append(award_description)
-        if forum:
-            elements.append(forum)
-        if case_award_number:
-            elements.append(case_award_number)
-        if full_date:
-            elements.append(format_date(full_date))
-        if elements:
-            citation.append(', '.join(elements))
-            if pinpoint:
-                # Add comma before pinpoint when no case name
-                citation.append(f", {pinpoint}")
-    return " ".join(citation)
-
-def format_transcript_of_proceedings(case_name=None, court=None, proceeding_number=None, judicial_officers=None, full_date=None, pinpoint=None):
-    citation = ["Transcript of Proceedings,"]
-    if case_name:
-        citation.append(f"<i>{case_name}</i>")
-    if court or proceeding_number or judicial_officers or date:
-        info = []
-        if court:
-            info.append(court)
-        if proceeding_number:
-            info.append(proceeding_number)
-        if judicial_officers:
-            info.append(judicial_officers)
-        if full_date:
-            info.append(format_date(full_date))
-        citation.append(f"({', '.join(info)})")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_high_court_transcript(case_name=None, year=None, number=None, pinpoint=None):
-    citation = ["Transcript of Proceedings,"]
-    if case_name:
-        citation.append(f"<i>{case_name}</i>")
-    if year:
-        citation.append(f"[{year}]")
-    citation.append("HCATrans")
-    if number:
-        citation.append(str(number))
-    if pinpoint:
-        citation.append(f", {pinpoint}")
-    return " ".join(citation)
-
-def format_submission(party_name=None, title=None, case_name=None, proceeding_number=None, full_date=None, pinpoint=None):
-    citation = []
-    if party_name:
-        citation.append(f"{party_name},")
-    if title:
-        citation.append(f"'{title}'")
-    if case_name:
-        citation.append(f"Submission in <i>{case_name}</i>,")
-    if proceeding_number:
-        citation.append(f"{proceeding_number},")
-    if full_date:
-        citation.append(format_date(full_date))
-    if pinpoint:
-        citation.append(f", {pinpoint}")
-    return " ".join(citation)
-
-def format_delegated_legislation(title=None, year=None, jurisdiction=None, pinpoint=None):
-    return format_legislation(title, year, jurisdiction, pinpoint)
-
-def format_gazette(authors=None, title_of_notice=None, jurisdiction=None, gazette_title=None, gazette_number=None, full_date=None, starting_page=None, pinpoint=None):
-    citation = []
-    if authors:
-        citation.append(format_authors(authors))
-    if title_of_notice:
-        citation.append(f"'{title_of_notice}'")
-    if jurisdiction:
-        citation.append(f"in {jurisdiction},")
-    if gazette_title:
-        citation.append(f"<i>{gazette_title}</i>,")
-    if gazette_number:
-        citation.append(f"No {gazette_number},")
-    if full_date:
-        citation.append(format_date(full_date))
-    if starting_page:
-        citation.append(f", {starting_page}")
-    if pinpoint:
-        citation.append(f", {pinpoint}")
-    return " ".join(citation)
-
-def format_order_or_ruling(instrumentality_officer=None, instrument_title=None, document_number=None, full_date=None, pinpoint=None):
-    citation = []
-    if instrumentality_officer:
-        citation.append(f"{instrumentality_officer},")
-    if instrument_title:
-        citation.append(f"<i>{instrument_title}</i>")
-    if document_number or full_date:
-        info = []
-        if document_number:
-            info.append(document_number)
-        if full_date:
-            info.append(format_date(full_date))
-        citation.append(f"({', '.join(info)})")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_court_practice_direction(court=None, practice_direction=None, number_identifier=None, title=None, citation_report_series=None, full_date=None, pinpoint=None):
-    citation = []
-    
-    # Required elements
-    if court:
-        citation.append(f"{court},")
-    if practice_direction:
-        citation.append(f"<i>{practice_direction}</i>")
-    if number_identifier:
-        citation.append(f"<i>{number_identifier}</i>:")
-    if title and citation_report_series:
-        citation.append(f"<i>{title}</i>")
-    if title and full_date:
-        citation.append(f"<i>{title}</i>,") # Comma after title if date is used (rather than report series)
-    if citation_report_series:
-        citation.append(citation_report_series)
-    if full_date:
-        citation.append(format_date(full_date))
-    if pinpoint:
-        citation.append(f", {pinpoint}")
-        
-    return " ".join(citation)
-
-def format_symposium(title=None, year=None, volume=None, issue=None, journal=None, starting_page=None, pinpoint=None):
-    citation = ["Symposium,"]
-    if title:
-        citation.append(f"'{title}'")
-    if year:
-        citation.append(f"{year}")
-    if volume:
-        citation.append(volume)
-    if issue:
-        citation.append(f"({issue})")
-    if journal:
-        citation.append(f"<i>{journal}</i>")
-    if starting_page:
-        citation.append(str(starting_page))
-    if pinpoint:
-        citation.append(f", {pinpoint}")
-    return " ".join(citation)
-
-def format_translated_book(authors=None, translation_title=None, translator=None, publisher=None, edition=None, year=None, pinpoint=None):
-    citation = []
-    if authors:
-        citation.append(format_authors(authors))
-    if translation_title:
-        citation.append(f"<i>{translation_title}</i>,")
-    if translator:
-        citation.append(f"tr {translator}")
-    publication_details = []
-    if publisher:
-        publication_details.append(publisher)
-    if edition:
-        publication_details.append(f"{edition} ed")
-    if year:
-        publication_details.append(str(year))
-    if publication_details:
-        citation.append(f"({', '.join(publication_details)})")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_audiobook(authors=None, title=None, publisher=None, year=None, pinpoint=None):
-    citation = []
-    if authors:
-        citation.append(format_authors(authors))
-    if title:
-        citation.append(f"<i>{title}</i>")
-    publication_details = ["Audiobook"]
-    if publisher:
-        publication_details.append(publisher)
-    if year:
-        publication_details.append(str(year))
-    citation.append(f"({', '.join(publication_details)})")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_research_paper(author=None, title=None, document_type=None, document_number=None, institution=None, full_date=None, pinpoint=None):
-    citation = []
-    if author:
-        citation.append(f"{author},")
-    if title:
-        citation.append(f"'{title}'")
-    details = []
-    if document_type and document_number:
-        details.append(f"{document_type} No {document_number}")
-    if institution:
-        details.append(institution)
-    if full_date:
-        details.append(format_date(full_date))
-    if details:
-        citation.append(f"({', '.join(details)})")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_speech(author=None, title=None, speech_or_lecture=None, institution_forum=None, full_date=None, pinpoint=None):
-    citation = []
-    if author:
-        citation.append(f"{author},")
-    if title:
-        citation.append(f"'{title}'")
-    details = []
-    if speech_or_lecture:
-        details.append(speech_or_lecture)
-    if institution_forum:
-        details.append(institution_forum)
-    if full_date:
-        details.append(format_date(full_date))
-    if details:
-        citation.append(f"({', '.join(details)})")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_press_release(author=None, title=None, release_type=None, document_number=None, body=None, full_date=None, pinpoint=None):
-    citation = []
-    if author:
-        citation.append(f"{author},")
-    if title:
-        citation.append(f"'{title}'")
-    details = []
-    if release_type:
-        details.append(release_type)
-    if document_number:
-        details.append(document_number)
-    if body:
-        details.append(body)
-    if full_date:
-        details.append(format_date(full_date))
-    if details:
-        citation.append(f"({', '.join(details)})")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_periodical(author=None, title=None, date_month_season=None, periodical_name=None, pinpoint=None):
-    citation = []
-    if author:
-        citation.append(f"{author},")
-    if title:
-        citation.append(f"'{title}'")
-    if date_month_season:
-        citation.append(f"({date_month_season})")
-    if periodical_name:
-        citation.append(f"<i>{periodical_name}</i>")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_interview(format=None, interviewee=None, interviewer=None, interview_forum=None, full_date=None):
-    citation = []
-    if format:
-        citation.append(format)
-    if interviewee:
-        citation.append(f"with {interviewee}")
-    details = []
-    if interviewer:
-        details.append(interviewer)
-    if interview_forum:
-        details.append(interview_forum)
-    if full_date:
-        details.append(format_date(full_date))
-    if details:
-        citation.append(f"({', '.join(details)})")
-    return " ".join(citation)
-
-def format_film_television_media(episode_title=None, film_series_title=None, version_details=None, studio_producer=None, year=None, pinpoint=None):
-    citation = []
-    if episode_title:
-        citation.append(f"'{episode_title}',")
-    if film_series_title:
-        citation.append(f"<i>{film_series_title}</i>")
-    details = []
-    if version_details:
-        details.append(version_details)
-    if studio_producer:
-        details.append(studio_producer)
-    if year:
-        details.append(str(year))
-    if details:
-        citation.append(f"({', '.join(details)})")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_written_submission(author=None, number=None, body=None, name_of_inquiry=None, full_date=None, pinpoint=None):
-    citation = []
-    if author:
-        citation.append(f"{author},")
-    if number:
-        citation.append(f"Submission No {number}")
-    if body:
-        citation.append(f"to {body},")
-    if name_of_inquiry:
-        citation.append(f"<i>{name_of_inquiry}</i>")
-    if full_date:
-        citation.append(f"({format_date(full_date)})")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_evidence_to_parliamentary_committee(committee=None, legislature=None, location=None, full_date=None, pinpoint=None, speaker=None):
-    citation = []
-    if committee:
-        citation.append(f"Evidence to {committee},")
-    if legislature:
-        citation.append(legislature + ",")
-    if location:
-        citation.append(location + ",")
-    if full_date:
-        citation.append(format_date(full_date))
-    if pinpoint:
-        citation.append(f", {pinpoint}")
-    if speaker:
-        citation.append(f"({speaker})")
-    return " ".join(citation)
-
-def format_constitutional_convention_debates(title=None, location=None, full_date=None, pinpoint=None, speaker=None):
-    citation = []
-    if title:
-        citation.append(f"<i>{title}</i>,")
-    if location:
-        citation.append(location + ",")
-    if full_date:
-        citation.append(format_date(full_date))
-    if pinpoint:
-        citation.append(f", {pinpoint}")
-    if speaker:
-        citation.append(f"({speaker})")
-    return " ".join(citation)
-
-def format_intellectual_property_material(jurisdiction_code=None, ip_type=None, additional_info=None, 
-                                       identification_number=None, filing_date=None, registration_status=None, 
-                                       registration_date=None):
-    citation = []
-    if jurisdiction_code and ip_type and identification_number:
-        citation.append(f"<i>{jurisdiction_code} {ip_type}")
-        if additional_info:
-            citation.append(additional_info)
-        citation.append(f"No {identification_number}</i>")
-    if filing_date:
-        citation.append(f"filed/lodged on {format_date(filing_date)}")
-    if registration_status and registration_date:
-        citation.append(f"({registration_status} on {format_date(registration_date)})")
-    return " ".join(citation)
-
-def format_constitutive_document(document_type=None, company_name=None, full_date=None, pinpoint=None):
-    citation = []
-    if document_type:
-        citation.append(f"<i>{document_type}</i>,")
-    if company_name:
-        citation.append(company_name)
-    if full_date:
-        citation.append(f"(at {format_date(full_date)})")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_written_correspondence(correspondence_type=None, author=None, recipient=None, full_date=None, pinpoint=None):
-    citation = []
-    if correspondence_type:
-        citation.append(correspondence_type)
-    if author and recipient:
-        citation.append(f"from {author} to {recipient},")
-    if full_date:
-        citation.append(format_date(full_date))
-    if pinpoint:
-        citation.append(f", {pinpoint}")
-    return " ".join(citation)
-
-def format_treaty(treaty_title=None, parties_names=None, signature_date=None, treaty_series=None, 
-                 entry_force_date=None, pinpoint=None):
-    citation = []
-    if treaty_title:
-        citation.append(f"<i>{treaty_title}</i>")
-    if parties_names:
-        citation.append(parties_names)
-    if signature_date:
-        citation.append(f"signed {format_date(signature_date)}")
-    if treaty_series:
-        citation.append(treaty_series)
-    if entry_force_date:
-        citation.append(f"(entered into force {format_date(entry_force_date)})")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_social_media_post(username=None, title=None, platform=None, full_date=None, time=None, url=None):
-    citation = []
-    if username:
-        citation.append(f"{username},")
-    if title:
-        citation.append(f"'{title}'")
-    
-    details = []
-    if platform:
-        details.append(platform)
-    if date and time:
-        details.append(f"{format_date(full_date)}, {time}")
-    elif full_date:
-        details.append(format_date(full_date))
-    
-    if details:
-        citation.append(f"({', '.join(details)})")
-    
-    if url:
-        citation.append(f"<{url}>")
-    
-    return " ".join(citation)
-
-def format_delegated_non_government_legislation(issuing_body=None, title=None, full_date=None, pinpoint=None):
-    """
-    Format a delegated non-government entity legislation citation according to AGLC4
-    Format: Issuing Body, Title (at Full Date) Pinpoint.
-    """
-    citation = []
-    if issuing_body:
-        citation.append(f"{issuing_body},")
-    if title:
-        citation.append(f"<i>{title}</i>")
-    if full_date:
-        citation.append(f"(at {format_date(full_date)})")
-    if pinpoint:
-        citation.append(str(pinpoint))
-    return " ".join(citation)
-
-def format_custom(formatted_citation=None):
+    return join_names(editors)
+
+# Declarative templates, one per citation type (see utils/templates.py).
+# Elements appear in output order and are joined with spaces.
+
+_DATE = {'full_date': format_date}
+
+_PUBLICATION_DETAILS = group(
+    field('publisher'),
+    field('edition', '{edition} ed'),
+    field('year'),
+)
+
+_STARTING_PAGE = (
+    # A comma separates the starting page from a pinpoint
+    field('starting_page', '{starting_page},', when=('pinpoint',)),
+    field('starting_page', unless=('pinpoint',)),
+)
+
+_LEGISLATION = Template(
+    field('title', '<i>{title}</i>'),
+    field('year', '<i>{year}</i>'),
+    field('jurisdiction', '({jurisdiction})'),
+    field('pinpoint'),
+)
+
+_ARBITRATION_DETAILS = ('award_description', 'forum', 'case_award_number', 'full_date')
+
+TEMPLATES = {
+    'case_reported': Template(
+        field('case_name', '<i>{case_name}</i>'),
+        field('year'),
+        field('volume'),
+        field('law_report_series'),
+        *_STARTING_PAGE,
+        field('pinpoint'),
+    ),
+    'case_unreported_medium_neutral': Template(
+        field('case_name', '<i>{case_name}</i>'),
+        field('year'),
+        field('court_identifier'),
+        field('judgment_number', '{judgment_number},'),
+        field('pinpoint'),
+    ),
+    'case_unreported_no_medium_neutral': Template(
+        field('case_name', '<i>{case_name}</i>'),
+        group(field('court'), field('judge'), field('full_date')),
+        field('pinpoint'),
+        transforms=_DATE,
+    ),
+    'act': _LEGISLATION,
+    'bill': Template(
+        field('title'),
+        field('year'),
+        field('jurisdiction', '({jurisdiction})'),
+        field('pinpoint'),
+    ),
+    'explanatory_memorandum': Template(
+        field('explanatory_type'),
+        field('bill_citation'),
+        field('pinpoint'),
+    ),
+    'hansard': Template(
+        field('jurisdiction', '{jurisdiction},'),
+        text('<i>Parliamentary Debates</i>,'),
+        field('chamber', '{chamber},'),
+        field('full_date', '{full_date},'),
+        field('pinpoint'),
+        field('name_of_speaker', '({name_of_speaker})'),
+        transforms=_DATE,
+    ),
+    'treaty': Template(
+        field('treaty_title', '<i>{treaty_title}</i>'),
+        field('parties_names'),
+        field('signature_date', 'signed {signature_date}'),
+        field('treaty_series'),
+        field('entry_force_date', '(entered into force {entry_force_date})'),
+        field('pinpoint'),
+        transforms={'signature_date': format_date, 'entry_force_date': format_date},
+    ),
+    'journal_article': Template(
+        field('authors', '{authors},'),
+        field('title', "'{title}'"),
+        field('year'),
+        field('volume'),
+        field('issue', '({issue})'),
+        field('journal', '<i>{journal}</i>'),
+        *_STARTING_PAGE,
+        field('pinpoint'),
+        transforms={'authors': format_authors},
+    ),
+    'book': Template(
+        field('authors', '{authors},'),
+        field('title', "<i>'{title}'</i>"),
+        _PUBLICATION_DETAILS,
+        field('volume', 'vol {volume}'),
+        field('pinpoint'),
+        transforms={'authors': format_authors},
+    ),
+    'book_chapter': Template(
+        field('authors', '{authors},'),
+        field('chapter_title', "'{chapter_title}'"),
+        field('editors', 'in {editors},'),
+        field('book_title', '<i>{book_title}</i>'),
+        _PUBLICATION_DETAILS,
+        field('volume', 'vol {volume}'),
+        *_STARTING_PAGE,
+        field('pinpoint'),
+        transforms={'authors': format_authors, 'editors': format_editors},
+    ),
+    'report': Template(
+        field('author', '{author},'),
+        field('title', '<i>{title}</i>'),
+        group(field('document_type'), field('series_no'), field('document_number'), field('full_date')),
+        field('pinpoint'),
+        transforms=_DATE,
+    ),
+    'online_dictionary': Template(
+        field('title', '<i>{title}</i>'),
+        field('retrieval_date', '(online at {retrieval_date})'),
+        field('entry_title', "'{entry_title}'"),
+        field('definition_number', '(def {definition_number})'),
+        transforms={'retrieval_date': format_date},
+    ),
+    'hardcopy_dictionary': Template(
+        field('title', '<i>{title}</i>,'),
+        field('edition', '({edition} ed, {year})', when=('year',)),
+        field('entry_title', "'{entry_title}'"),
+        field('definition_number', '(def {definition_number})'),
+    ),
+    'online_legal_encyclopedia': Template(
+        text("{publisher}, {title} (online at {retrieval_date}) '{title_number} {title_name}' "
+             "[{chapter_number} '{chapter_name}'] {paragraph}"),
+        transforms={'retrieval_date': format_date},
+    ),
+    'hardcopy_legal_encyclopedia': Template(
+        field('publisher', '{publisher},'),
+        field('title', '<i>{title}</i>,'),
+        field('volume', 'vol {volume}'),
+        field('full_date', '(at {full_date})'),
+        field('title_number', '{title_number} {title_name},', when=('title_name',)),
+        field('chapter_number', "'{chapter_number} {chapter_name}'", when=('chapter_name',)),
+        field('paragraph', '[{paragraph}]'),
+        transforms=_DATE,
+    ),
+    'online_looseleaf': Template(
+        field('author', '{author},'),
+        field('publisher', '{publisher},'),
+        field('title', '<i>{title}</i>'),
+        field('retrieval_date', '(online at {retrieval_date})'),
+        field('pinpoint'),
+        transforms={'retrieval_date': format_date},
+    ),
+    'hardcopy_looseleaf': Template(
+        field('author', '{author},'),
+        field('publisher', '{publisher},'),
+        field('title', '<i>{title}</i>'),
+        field('volume', 'vol {volume}'),
+        # Service number, or the date when there is none
+        group(field('service_number'), field('full_date', unless=('service_number',)), open='(at '),
+        field('pinpoint'),
+        transforms=_DATE,
+    ),
+    'online_newspaper': Template(
+        field('author', '{author},'),
+        field('title', "'{title}',"),
+        field('newspaper', '<i>{newspaper}</i>'),
+        field('full_date', '(online, {full_date})'),
+        field('pinpoint', '[{pinpoint}]'),
+        field('url', '<{url}>'),
+        transforms=_DATE,
+    ),
+    'printed_newspaper': Template(
+        field('author', '{author},'),
+        field('title', "'{title}',"),
+        field('newspaper', '<i>{newspaper}</i>'),
+        group(field('place'), field('full_date')),
+        field('starting_page'),
+        field('pinpoint', ', {pinpoint}'),
+        transforms=_DATE,
+    ),
+    'internet_material': Template(
+        field('author', '{author},'),
+        field('document_title', "'{document_title}',"),
+        field('web_page_title', '<i>{web_page_title}</i>'),
+        group(field('document_type'), field('full_date')),
+        field('pinpoint'),
+        field('url', '<{url}>'),
+        transforms=_DATE,
+    ),
+    'proceeding': Template(
+        field('case_name', '<i>{case_name}</i>'),
+        group(field('court'), field('proceeding_number'), field('full_date', 'commenced {full_date}')),
+        transforms=_DATE,
+    ),
+    'court_order': Template(
+        field('judicial_officers', 'Order of {judicial_officers}'),
+        field('case_name', 'in <i>{case_name}</i>'),
+        group(field('court'), field('proceeding_number'), field('full_date')),
+        transforms=_DATE,
+    ),
+    'arbitration': Template(
+        field('case_name', '<i>{case_name}</i>'),
+        # With a case name the other elements go in parentheses, followed by the pinpoint
+        group(*(field(name) for name in _ARBITRATION_DETAILS), when=('case_name',)),
+        field('pinpoint', when=('case_name',), any_of=_ARBITRATION_DETAILS),
+        # Without one they are separated by commas, as is the pinpoint
+        group(*(field(name) for name in _ARBITRATION_DETAILS), open='', close='', unless=('case_name',)),
+        field('pinpoint', ', {pinpoint}', unless=('case_name',), any_of=_ARBITRATION_DETAILS),
+        transforms=_DATE,
+    ),
+    'transcript_of_proceedings': Template(
+        text('Transcript of Proceedings,'),
+        field('case_name', '<i>{case_name}</i>'),
+        group(field('court'), field('proceeding_number'), field('judicial_officers'), field('full_date')),
+        field('pinpoint'),
+        transforms=_DATE,
+    ),
+    'high_court_transcript': Template(
+        text('Transcript of Proceedings,'),
+        field('case_name', '<i>{case_name}</i>'),
+        field('year', '[{year}]'),
+        text('HCATrans'),
+        field('number'),
+        field('pinpoint', ', {pinpoint}'),
+    ),
+    'submission': Template(
+        field('party_name', '{party_name},'),
+        field('title', "'{title}'"),
+        field('case_name', 'Submission in <i>{case_name}</i>,'),
+        field('proceeding_number', '{proceeding_number},'),
+        field('full_date'),
+        field('pinpoint', ', {pinpoint}'),
+        transforms=_DATE,
+    ),
+    'delegated_legislation': _LEGISLATION,
+    'gazette': Template(
+        field('authors'),
+        field('title_of_notice', "'{title_of_notice}'"),
+        field('jurisdiction', 'in {jurisdiction},'),
+        field('gazette_title', '<i>{gazette_title}</i>,'),
+        field('gazette_number', 'No {gazette_number},'),
+        field('full_date'),
+        field('starting_page', ', {starting_page}'),
+        field('pinpoint', ', {pinpoint}'),
+        transforms={'authors': format_authors, **_DATE},
+    ),
+    'order_or_ruling': Template(
+        field('instrumentality_officer', '{instrumentality_officer},'),
+        field('instrument_title', '<i>{instrument_title}</i>'),
+        group(field('document_number'), field('full_date')),
+        field('pinpoint'),
+        transforms=_DATE,
+    ),
+    'court_practice_direction': Template(
+        field('court', '{court},'),
+        field('practice_direction', '<i>{practice_direction}</i>'),
+        field('number_identifier', '<i>{number_identifier}</i>:'),
+        field('title', '<i>{title}</i>', when=('citation_report_series',)),
+        # Comma after title if date is used (rather than report series)
+        field('title', '<i>{title}</i>,', when=('full_date',)),
+        field('citation_report_series'),
+        field('full_date'),
+        field('pinpoint', ', {pinpoint}'),
+        transforms=_DATE,
+    ),
+    'symposium': Template(
+        text('Symposium,'),
+        field('title', "'{title}'"),
+        field('year'),
+        field('volume'),
+        field('issue', '({issue})'),
+        field('journal', '<i>{journal}</i>'),
+        field('starting_page'),
+        field('pinpoint', ', {pinpoint}'),
+    ),
+    'book_with_editor': Template(
+        field('authors'),
+        field('title', '<i>{title}</i>,'),
+        field('editors', 'ed {editors}'),
+        _PUBLICATION_DETAILS,
+        field('pinpoint'),
+        transforms={'authors': format_authors, 'editors': format_editors_without_suffix},
+    ),
+    'translated_book': Template(
+        field('authors'),
+        field('translation_title', '<i>{translation_title}</i>,'),
+        field('translator', 'tr {translator}'),
+        _PUBLICATION_DETAILS,
+        field('pinpoint'),
+        transforms={'authors': format_authors},
+    ),
+    'audiobook': Template(
+        field('authors'),
+        field('title', '<i>{title}</i>'),
+        group(text('Audiobook'), field('publisher'), field('year')),
+        field('pinpoint'),
+        transforms={'authors': format_authors},
+    ),
+    'research_paper': Template(
+        field('author', '{author},'),
+        field('title', "'{title}'"),
+        group(
+            field('document_type', '{document_type} No {document_number}', when=('document_number',)),
+            field('institution'),
+            field('full_date'),
+        ),
+        field('pinpoint'),
+        transforms=_DATE,
+    ),
+    'speech': Template(
+        field('author', '{author},'),
+        field('title', "'{title}'"),
+        group(field('speech_or_lecture'), field('institution_forum'), field('full_date')),
+        field('pinpoint'),
+        transforms=_DATE,
+    ),
+    'press_and_media_release': Template(
+        field('author', '{author},'),
+        field('title', "'{title}'"),
+        group(field('release_type'), field('document_number'), field('body'), field('full_date')),
+        field('pinpoint'),
+        transforms=_DATE,
+    ),
+    'periodical': Template(
+        field('author', '{author},'),
+        field('title', "'{title}'"),
+        field('date_month_season', '({date_month_season})'),
+        field('periodical_name', '<i>{periodical_name}</i>'),
+        field('pinpoint'),
+    ),
+    'interview': Template(
+        field('format'),
+        field('interviewee', 'with {interviewee}'),
+        group(field('interviewer'), field('interview_forum'), field('full_date')),
+        transforms=_DATE,
+    ),
+    'film_television_media': Template(
+        field('episode_title', "'{episode_title}',"),
+        field('film_series_title', '<i>{film_series_title}</i>'),
+        group(field('version_details'), field('studio_producer'), field('year')),
+        field('pinpoint'),
+    ),
+    'social_media_post': Template(
+        field('username', '{username},'),
+        field('title', "'{title}'"),
+        group(
+            field('platform'),
+            field('full_date', '{full_date}, {time}', when=('time',)),
+            field('full_date', unless=('time',)),
+            field('time', unless=('full_date',)),
+        ),
+        field('url', '<{url}>'),
+        transforms=_DATE,
+    ),
+    'written_correspondence': Template(
+        field('correspondence_type'),
+        field('author', 'from {author} to {recipient},', when=('recipient',)),
+        field('full_date'),
+        field('pinpoint', ', {pinpoint}'),
+        transforms=_DATE,
+    ),
+    'custom': Template(
+        # The exact text provided in formatted_citation
+        field('formatted_citation'),
+    ),
+}
+
+# Name each template's generated functions after its citation type
+for _citation_type, _template in TEMPLATES.items():
+    if _template is not _LEGISLATION:
+        _template.name = _citation_type
+_LEGISLATION.name = 'legislation'
+
+# Formatter registry, built once at import time.
+# Maps each citation type to its FormatterEntry.
+FORMATTER_REGISTRY = {
+    citation_type: FormatterEntry(
+        citation_type,
+        template,
+        # The online legal encyclopedia entry is returned as-is
+        None if citation_type == 'online_legal_encyclopedia' else finalize_citation
+    )
+    for citation_type, template in TEMPLATES.items()
+}
+
+# Fields each citation type's template reads, so changes to any other field
+# leave its formatted citation unchanged
+FIELD_DEPENDENCIES = {
+    citation_type: frozenset(entry.params) for citation_type, entry in FORMATTER_REGISTRY.items()
+}
+
+# Fields read by at least one citation type
+CONSUMED_FIELDS = frozenset().union(*FIELD_DEPENDENCIES.values())
+
+def affects_formatting(patch: Dict[str, Any]) -> bool:
+    """Whether a patch touches a field that some citation type's formatting reads"""
+    return 'type' in patch or not CONSUMED_FIELDS.isdisjoint(patch)
+
+def needs_reformat(current: Dict[str, Any], patch: Dict[str, Any]) -> bool:
     """
-    Format a custom citation by returning the exact text provided in formatted_citation
+    Whether applying patch to the stored citation current changes the inputs of
+    its formatted citation, or the stored text is from an older formatter version
     """
-    if not formatted_citation:
-        return ""
-    return formatted_citation
+    current_type = (current.get('type') or '').lower()
+    new_type = (patch.get('type') or current_type).lower()
+    if new_type != current_type or is_stale(current):
+        return True
+    return any(
+        name in patch and patch[name] != current.get(name)
+        for name in FIELD_DEPENDENCIES.get(new_type, ())
+    )
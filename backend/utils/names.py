@@ -0,0 +1,111 @@
+"""
+Structured personal names.
+
+Author and editor names are entered as free text, either 'Given Family' or
+'Family, Given'. parse_name() splits a name once into given names, particles
+and family name, and precomputes the forms the rest of the app reads:
+display ('Ludwig van Beethoven', as AGLC4 cites it) and sort
+('Beethoven, Ludwig van', as a bibliography lists it). Names of bodies such
+as 'Australian Law Reform Commission' are kept whole.
+"""
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple
+
+# Fields holding lists of personal names
+NAME_LIST_FIELDS = ('authors', 'editors')
+
+PARSE_CACHE_SIZE = 4096
+
+# Words that mark a name as a body rather than a person
+BODY_WORDS = frozenset({
+    'of', 'the', 'and', 'for', 'department', 'commission', 'court', 'office', 'council',
+    'committee', 'association', 'institute', 'university', 'government', 'ministry',
+    'agency', 'authority', 'bureau', 'centre', 'center', 'service', 'society', 'union',
+    'parliament', 'tribunal', 'commonwealth', 'attorney-general', 'nations',
+})
+
+# Lowercase words that belong with the family name, e.g. 'van' in 'Ludwig van Beethoven'
+PARTICLES = frozenset({
+    'al', 'bin', 'binti', 'd', 'da', 'das', 'de', 'del', 'della', 'den', 'der', 'di',
+    'dos', 'du', 'el', 'la', 'le', 'ten', 'ter', 'van', 'von', 'zu',
+})
+
+
+class Name(NamedTuple):
+    """A parsed name. Bodies have only a family name."""
+    given: str
+    particle: str
+    family: str
+    display: str
+    sort: str
+
+
+def is_body(words: Iterable[str]) -> bool:
+    return any(word.lower() in BODY_WORDS for word in words)
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_name(text: str) -> Name:
+    """
+    Parse a name entered as 'Given Family' or 'Family, Given'. Full stops are
+    dropped from given names and initials ('J. R.' becomes 'J R'), as AGLC4
+    rule 1.13 requires; a 'Given Family' name is otherwise displayed as entered.
+    Bodies and names with more than one comma are kept whole.
+    """
+    words = text.split()
+    if not words:
+        return Name('', '', '', '', '')
+    if is_body(words) or text.count(',') > 1:
+        whole = ' '.join(words)
+        return Name('', '', whole, whole, whole)
+
+    family_part, comma, given_part = ' '.join(words).partition(',')
+    if comma and given_part.strip():
+        family_words = family_part.split()
+        given = ' '.join(word.replace('.', '') for word in given_part.split())
+        split = 0
+        while split < len(family_words) - 1 and family_words[split] in PARTICLES:
+            split += 1
+        particle = ' '.join(family_words[:split])
+        family = ' '.join(family_words[split:])
+        display = ' '.join(part for part in (given, particle, family) if part)
+    else:
+        # Particles are the lowercase words just before the last one; the first
+        # word is always a given name
+        split = len(words) - 1
+        while split > 1 and words[split - 1] in PARTICLES:
+            split -= 1
+        given = ' '.join(words[:split])
+        particle = ' '.join(words[split:-1])
+        family = words[-1]
+        display = ' '.join(words)
+
+    sort = f"{family}, {' '.join(part for part in (given, particle) if part)}" if given else family
+    return Name(given, particle, family, display, sort)
+
+def parse_names(names: Any) -> List[Name]:
+    """Parse a name list field, which may also hold a single name as a string"""
+    if not names:
+        return []
+    if isinstance(names, str):
+        names = [names]
+    return [parse_name(name) for name in names if name and name.strip()]
+
+def structured_names(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fields to store alongside a citation's name lists, computed from fields
+    (the full citation): each list rewritten in display form, its parsed
+    records as '<field>_names', e.g. author_names, and name_search, the
+    display and sort forms of every name in one lowercase string for search.
+    """
+    updates: Dict[str, Any] = {}
+    search = []
+    for field in NAME_LIST_FIELDS:
+        if field not in fields:
+            continue
+        names = parse_names(fields[field])
+        updates[field] = [name.display for name in names]
+        updates[f"{field[:-1]}_names"] = [name._asdict() for name in names]
+        search.extend(f"{name.display} {name.sort}" for name in names)
+    if updates:
+        updates['name_search'] = ' '.join(search).lower()
+    return updates
@@ -0,0 +1,96 @@
+from html import escape as _escape_html
+from typing import Callable, Dict, Iterable, NamedTuple, Tuple
+from xml.sax.saxutils import escape as _escape_xml
+
+class Run(NamedTuple):
+    """A stretch of citation text sharing the same styling"""
+    text: str
+    italic: bool = False
+
+Runs = Tuple[Run, ...]
+
+_OPEN = '<i>'
+_CLOSE = '</i>'
+
+def parse_markup(markup: str) -> Runs:
+    """
+    Split a formatted citation string into runs in a single pass.
+    The formatters only emit <i>...</i> markup; every other character,
+    including the angle brackets around URLs, is literal text.
+    """
+    runs = []
+    position = 0
+    italic = False
+    while position < len(markup):
+        tag = _CLOSE if italic else _OPEN
+        end = markup.find(tag, position)
+        if end == -1:
+            end = len(markup)
+        if end > position:
+            text = markup[position:end]
+            if runs and runs[-1].italic == italic:
+                runs[-1] = Run(runs[-1].text + text, italic)
+            else:
+                runs.append(Run(text, italic))
+        position = end + len(tag)
+        italic = not italic
+    return tuple(runs)
+
+def plain_text(runs: Iterable[Run]) -> str:
+    return ''.join(run.text for run in runs)
+
+def render_markup(runs: Iterable[Run]) -> str:
+    """The form stored in formatted_citation: literal text with <i> tags"""
+    return ''.join(f"{_OPEN}{run.text}{_CLOSE}" if run.italic else run.text for run in runs)
+
+def render_html(runs: Iterable[Run]) -> str:
+    """HTML with the text escaped, so URLs in angle brackets survive"""
+    return ''.join(
+        f"<i>{_escape_html(run.text, quote=False)}</i>" if run.italic else _escape_html(run.text, quote=False)
+        for run in runs
+    )
+
+def _escape_rtf(text: str) -> str:
+    out = []
+    for char in text:
+        if char in '\\{}':
+            out.append('\\' + char)
+        elif ord(char) < 128:
+            out.append(char)
+        else:
+            # RTF \u takes a signed 16-bit value; astral characters become surrogate pairs
+            encoded = char.encode('utf-16-le')
+            for i in range(0, len(encoded), 2):
+                code = int.from_bytes(encoded[i:i + 2], 'little', signed=True)
+                out.append(f"\\u{code}?")
+    return ''.join(out)
+
+def render_rtf(runs: Iterable[Run]) -> str:
+    """An RTF fragment, ready to be placed inside a paragraph"""
+    return ''.join(
+        f"{{\\i {_escape_rtf(run.text)}}}" if run.italic else _escape_rtf(run.text)
+        for run in runs
+    )
+
+def render_ooxml(runs: Iterable[Run]) -> str:
+    """WordprocessingML <w:r> runs, ready to be placed inside a <w:p>"""
+    return ''.join(
+        f'<w:r>{"<w:rPr><w:i/></w:rPr>" if run.italic else ""}'
+        f'<w:t xml:space="preserve">{_escape_xml(run.text)}</w:t></w:r>'
+        for run in runs
+    )
+
+RENDERERS: Dict[str, Callable[[Iterable[Run]], str]] = {
+    'markup': render_markup,
+    'html': render_html,
+    'text': plain_text,
+    'rtf': render_rtf,
+    'ooxml': render_ooxml,
+}
+
+def render(runs: Iterable[Run], target: str) -> str:
+    """Render runs for one of the RENDERERS targets"""
+    renderer = RENDERERS.get(target)
+    if renderer is None:
+        raise ValueError(f"Unsupported output format: {target}")
+    return renderer(runs)
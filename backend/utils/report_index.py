@@ -0,0 +1,192 @@
+"""
+Reference index of AGLC4 law report series abbreviations and medium neutral
+court identifiers.
+
+The index is a file of sorted fixed-width records, memory-mapped read-only, so
+every worker process shares the operating system's one cached copy instead of
+loading its own. A lookup is a binary search over the records, comparing the
+abbreviation's bytes, and reads no more than a few dozen of them; recent
+results are memoised.
+
+File layout, RECORD_SIZE bytes per record:
+    header   MAGIC, CRC-32 of the source lists, record count (little endian)
+    records  abbreviation, NUL padded to KEY_SIZE bytes, then one flags byte
+The lists below are the source; the file is rebuilt when they change. Rebuild
+it by hand with:
+    python -m utils.report_index
+"""
+import mmap
+import os
+import struct
+import zlib
+from functools import lru_cache
+from typing import Dict, Iterable, Union
+
+REPORT_SERIES = 1
+COURT_IDENTIFIER = 2
+
+# Authorised and generalist report series, Australian and overseas
+REPORT_SERIES_ABBREVIATIONS = (
+    'CLR', 'ALR', 'ALJR', 'FCR', 'FLR', 'FamLR', 'NSWLR', 'NSWR', 'SR (NSW)', 'VR', 'VLR',
+    'Qd R', 'QWN', 'WAR', 'WALR', 'SASR', 'SALR', 'Tas R', 'Tas LR', 'ACTR', 'ACTLR',
+    'NTR', 'NTLR', 'FLC', 'A Crim R', 'IR', 'IPR', 'ACSR', 'ACLC', 'ATR', 'ATC', 'ALD',
+    'AAR', 'LGERA', 'IRCA', 'AILR', 'BPR', 'ANZ ConvR', 'MVR', 'NSWCCR', 'AC', 'App Cas',
+    'QB', 'QBD', 'KB', 'Ch', 'Ch D', 'Fam', 'P', 'WLR', 'All ER', 'Lloyd\'s Rep', 'Cr App R',
+    'HL Cas', 'ER', 'NZLR', 'SCR', 'DLR', 'US', 'S Ct', 'F', 'F 2d', 'F 3d', 'F Supp',
+    'ILR', 'ICJ Rep', 'EHRR', 'ECR',
+)
+
+# Medium neutral court and tribunal identifiers, and BarNet Jade's own identifier
+COURT_IDENTIFIERS = (
+    'HCA', 'HCATrans', 'FCA', 'FCAFC', 'FamCA', 'FamCAFC', 'FCCA', 'FMCA', 'FedCFamC1A',
+    'FedCFamC1F', 'FedCFamC2F', 'FedCFamC2G', 'AATA', 'ARTA', 'NNTTA', 'FWC', 'FWCFB', 'AIRC',
+    'NSWSC', 'NSWCA', 'NSWCCA', 'NSWLEC', 'NSWDC', 'NSWLC', 'NSWIRComm', 'NSWIC', 'NSWCATAD',
+    'NSWCATAP', 'NSWCATCD', 'NSWCATEN', 'NSWCATGD', 'NSWCATOD', 'NSWADT', 'VSC', 'VSCA', 'VCC',
+    'VCAT', 'VMC', 'QSC', 'QCA', 'QDC', 'QCAT', 'QCATA', 'QLC', 'QMC', 'QPEC', 'QIRC', 'WASC',
+    'WASCA', 'WADC', 'WASAT', 'SASC',
+    'SASCFC', 'SASCA', 'SADC', 'SAET', 'SACAT', 'TASSC', 'TASFC', 'TASCCA', 'TASMC',
+    'ACTSC', 'ACTCA', 'ACAT', 'NTSC', 'NTCA', 'NTCCA', 'NTCAT', 'UKHL', 'UKSC', 'UKPC',
+    'EWCA Civ', 'EWCA Crim', 'EWHC', 'NZSC', 'NZCA', 'NZHC', 'SCC', 'IESC', 'ZACC', 'JADE',
+)
+
+MAGIC = b'AGLCIDX1'
+KEY_SIZE = 15
+RECORD_SIZE = KEY_SIZE + 1
+_HEADER = struct.Struct('<8sII')
+MEMO_SIZE = 4096
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'report_index.bin')
+
+def _flags() -> Dict[bytes, int]:
+    flags = {}
+    for abbreviations, flag in ((REPORT_SERIES_ABBREVIATIONS, REPORT_SERIES), (COURT_IDENTIFIERS, COURT_IDENTIFIER)):
+        for abbreviation in abbreviations:
+            key = abbreviation.encode('ascii')
+            if len(key) > KEY_SIZE:
+                raise ValueError(f"Abbreviation longer than {KEY_SIZE} bytes: {abbreviation}")
+            flags[key] = flags.get(key, 0) | flag
+    return flags
+
+def build_index_bytes() -> bytes:
+    """The index file's contents for the lists above"""
+    records = b''.join(key.ljust(KEY_SIZE, b'\x00') + bytes([flag]) for key, flag in sorted(_flags().items()))
+    return _HEADER.pack(MAGIC, zlib.crc32(records), len(records) // RECORD_SIZE) + records
+
+def build_index(path: str = DEFAULT_PATH) -> None:
+    """Write the index file; readers of the old file keep their mapping"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as f:
+        f.write(build_index_bytes())
+    os.replace(temporary, path)
+
+
+class _FlagsMemo(dict):
+    """Flags by abbreviation, searched for on a miss; cleared once it holds MEMO_SIZE"""
+
+    def __init__(self, search):
+        super().__init__()
+        self._search = search
+
+    def __missing__(self, abbreviation: str) -> int:
+        if len(self) >= MEMO_SIZE:
+            self.clear()
+        flags = self[abbreviation] = self._search(' '.join(abbreviation.split()))
+        return flags
+
+
+class ReportIndex:
+    """Read-only view of an index file's records"""
+
+    def __init__(self, data: Union[mmap.mmap, bytes]):
+        magic, _, count = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or len(data) != RECORD_SIZE * (count + 1):
+            raise ValueError("Not a report index file")
+        self._data = data
+        self._count = count
+        # Results of recent lookups, as lookup() returns them; pastes repeat the same
+        # few abbreviations. Indexing it directly saves the tokenizer a call per token
+        self.flags: Dict[str, int] = _FlagsMemo(self._search)
+
+    @classmethod
+    def open(cls, path: str) -> 'ReportIndex':
+        with open(path, 'rb') as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def lookup(self, abbreviation: str) -> int:
+        """
+        REPORT_SERIES and/or COURT_IDENTIFIER flags for an abbreviation, 0 if
+        unknown; each run of whitespace in it reads as one space
+        """
+        return self.flags[abbreviation]
+
+    def _search(self, abbreviation: str) -> int:
+        try:
+            key = abbreviation.encode('ascii').ljust(KEY_SIZE, b'\x00')
+        except UnicodeEncodeError:
+            return 0
+        if len(key) > KEY_SIZE:
+            return 0
+        data = self._data
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            offset = RECORD_SIZE * (middle + 1)
+            record = data[offset:offset + KEY_SIZE]
+            if record < key:
+                low = middle + 1
+            elif record > key:
+                high = middle
+            else:
+                return data[offset + KEY_SIZE]
+        return 0
+
+    def is_report_series(self, abbreviation: str) -> bool:
+        return bool(self.lookup(abbreviation) & REPORT_SERIES)
+
+    def is_court_identifier(self, abbreviation: str) -> bool:
+        return bool(self.lookup(abbreviation) & COURT_IDENTIFIER)
+
+    def reads_as_report(self, abbreviation: str) -> bool:
+        """
+        Whether '[year] ABBREVIATION number' is a report citation, e.g. [1932] AC 562,
+        rather than a medium neutral one: the abbreviation is a report series and
+        not also a court identifier
+        """
+        return self.lookup(abbreviation) == REPORT_SERIES
+
+    def abbreviations(self) -> Iterable[str]:
+        for index in range(self._count):
+            offset = RECORD_SIZE * (index + 1)
+            yield self._data[offset:offset + KEY_SIZE].rstrip(b'\x00').decode('ascii')
+
+
+def _is_current(path: str, expected: bytes) -> bool:
+    try:
+        with open(path, 'rb') as f:
+            return f.read(_HEADER.size) == expected[:_HEADER.size]
+    except OSError:
+        return False
+
+@lru_cache(maxsize=None)
+def report_index(path: str = DEFAULT_PATH) -> ReportIndex:
+    """
+    The index at path, memory-mapped once per process. A missing or stale file
+    is rebuilt first; if it cannot be written the index is kept in memory.
+    """
+    expected = build_index_bytes()
+    if not _is_current(path, expected):
+        try:
+            build_index(path)
+        except OSError as e:
+            print(f"Could not write report index {path}: {e}")
+            return ReportIndex(expected)
+    return ReportIndex.open(path)
+
+
+if __name__ == '__main__':
+    build_index()
+    print(f"Wrote {len(report_index())} abbreviations to {DEFAULT_PATH}")
@@ -0,0 +1,195 @@
+"""
+Differential testing of formatter engines.
+
+An engine is anything with AGLC4Citation's format_citation(citation_type, **fields).
+compare_engines() replays a corpus of stored citations through the current
+engine and a candidate, reporting byte-level differences and throughput per
+citation type. ShadowFormatter does the same on live traffic: it serves every
+call from the current engine and, for a sample of calls, formats the citation
+with the candidate in the background and records any difference.
+"""
+import importlib
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .formatcitation import AGLC4Citation, FormatResult
+
+# Characters of context shown either side of the first difference
+DIFF_CONTEXT = 30
+# Differences kept as examples, per citation type in reports and overall in shadow mode
+MAX_EXAMPLES = 5
+# Shadow comparisons waiting for the background thread before new samples are dropped
+MAX_PENDING_SHADOW = 100
+
+def load_engine(path: str) -> Any:
+    """
+    Load an engine from 'module:attribute'. A class is instantiated with no
+    arguments, e.g. 'benchmarks.format_templates:LegacyAGLC4Citation'.
+    """
+    module_name, _, attribute = path.partition(':')
+    if not attribute:
+        raise ValueError(f"Engine must be given as module:attribute, got {path}")
+    engine = getattr(importlib.import_module(module_name), attribute)
+    return engine() if isinstance(engine, type) else engine
+
+def first_difference(expected: str, actual: str) -> Optional[int]:
+    """Byte offset of the first difference between the UTF-8 encodings, or None if equal"""
+    a, b = expected.encode('utf-8'), actual.encode('utf-8')
+    if a == b:
+        return None
+    for offset, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            return offset
+    return min(len(a), len(b))
+
+def describe_difference(citation_id: Any, expected: str, actual: str) -> Dict[str, Any]:
+    """A difference with the bytes around its first differing offset, for reports"""
+    offset = first_difference(expected, actual)
+    start = max(offset - DIFF_CONTEXT, 0)
+
+    def context(text: str) -> str:
+        return text.encode('utf-8')[start:offset + DIFF_CONTEXT].decode('utf-8', 'replace')
+
+    return {
+        'citation_id': citation_id,
+        'offset': offset,
+        'expected': context(expected),
+        'actual': context(actual),
+    }
+
+def _run(engine: Any, citation: Dict[str, Any]) -> str:
+    try:
+        return engine.format_citation(citation['type'].lower(), **citation)
+    except Exception as e:
+        # Errors are compared like output, so a candidate must fail the same way
+        return f"<error {type(e).__name__}: {e}>"
+
+def compare_engines(corpus: Iterable[Dict[str, Any]], current: Any, candidate: Any) -> Dict[str, Any]:
+    """
+    Replay every citation through both engines. Each type's citations are timed
+    as a batch per engine. Reports, per type and overall, the citation count,
+    the number whose output differs, example differences and each engine's
+    throughput in citations per second.
+    """
+    by_type: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for citation in corpus:
+        by_type[str(citation.get('type', '')).lower()].append(citation)
+
+    types = {}
+    totals = {'count': 0, 'diffs': 0, 'current_seconds': 0.0, 'candidate_seconds': 0.0}
+    for citation_type in sorted(by_type):
+        citations = by_type[citation_type]
+        outputs = {}
+        for name, engine in (('current', current), ('candidate', candidate)):
+            start = time.perf_counter()
+            outputs[name] = [_run(engine, citation) for citation in citations]
+            outputs[f'{name}_seconds'] = time.perf_counter() - start
+            totals[f'{name}_seconds'] += outputs[f'{name}_seconds']
+
+        diffs = [
+            describe_difference(citation.get('id'), expected, actual)
+            for citation, expected, actual in zip(citations, outputs['current'], outputs['candidate'])
+            if expected != actual
+        ]
+        totals['count'] += len(citations)
+        totals['diffs'] += len(diffs)
+        types[citation_type] = {
+            'count': len(citations),
+            'diffs': len(diffs),
+            'examples': diffs[:MAX_EXAMPLES],
+            'current_per_second': _rate(len(citations), outputs['current_seconds']),
+            'candidate_per_second': _rate(len(citations), outputs['candidate_seconds']),
+        }
+
+    return {
+        'count': totals['count'],
+        'diffs': totals['diffs'],
+        'current_per_second': _rate(totals['count'], totals['current_seconds']),
+        'candidate_per_second': _rate(totals['count'], totals['candidate_seconds']),
+        'types': types,
+    }
+
+def _rate(count: int, seconds: float) -> Optional[float]:
+    return count / seconds if seconds > 0 else None
+
+
+class ShadowFormatter:
+    """
+    Wraps the live formatter. Every call is answered by the wrapped formatter;
+    a sample_rate fraction of calls is also formatted by the candidate on a
+    background thread and compared. Samples are dropped rather than queued
+    when MAX_PENDING_SHADOW comparisons are already waiting, so the shadow
+    never slows requests down. Other attributes are those of the wrapped formatter.
+    """
+
+    def __init__(self, formatter: AGLC4Citation, candidate: Any, sample_rate: float):
+        self.formatter = formatter
+        self.candidate = candidate
+        self.sample_rate = sample_rate
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='formatter-shadow')
+        self._pending = threading.BoundedSemaphore(MAX_PENDING_SHADOW)
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(lambda: {'compared': 0, 'diffs': 0})
+        self._dropped = 0
+        self._examples: deque = deque(maxlen=MAX_EXAMPLES)
+
+    def __getattr__(self, name):
+        return getattr(self.formatter, name)
+
+    def format_citation(self, citation_type, **kwargs):
+        formatted = self.formatter.format_citation(citation_type, **kwargs)
+        self._sample(citation_type, kwargs, formatted)
+        return formatted
+
+    def format_many(self, citations, targets=None) -> Iterator[FormatResult]:
+        citations = list(citations)
+        for citation, result in zip(citations, self.formatter.format_many(citations, targets=targets)):
+            if result.error is None:
+                self._sample(citation['type'].lower(), citation, result.formatted_citation)
+            yield result
+
+    def stats(self) -> Dict[str, Any]:
+        """Comparison counts per citation type, samples dropped and recent differences"""
+        with self._lock:
+            return {
+                'sample_rate': self.sample_rate,
+                'compared': sum(c['compared'] for c in self._counts.values()),
+                'diffs': sum(c['diffs'] for c in self._counts.values()),
+                'dropped': self._dropped,
+                'types': {t: dict(c) for t, c in self._counts.items()},
+                'examples': list(self._examples),
+            }
+
+    def _sample(self, citation_type: str, fields: Dict[str, Any], formatted: str) -> None:
+        if random.random() >= self.sample_rate:
+            return
+        if not self._pending.acquire(blocking=False):
+            with self._lock:
+                self._dropped += 1
+            return
+        try:
+            self._executor.submit(self._compare, citation_type, dict(fields), formatted)
+        except Exception:
+            self._pending.release()
+            raise
+
+    def _compare(self, citation_type: str, fields: Dict[str, Any], expected: str) -> None:
+        try:
+            actual = _run(self.candidate, {**fields, 'type': citation_type})
+            with self._lock:
+                counts = self._counts[citation_type]
+                counts['compared'] += 1
+                if actual != expected:
+                    counts['diffs'] += 1
+                    self._examples.append({
+                        'type': citation_type,
+                        **describe_difference(fields.get('id'), expected, actual)
+                    })
+            if actual != expected:
+                print(f"Shadow formatter difference for {citation_type} {fields.get('id')}")
+        finally:
+            self._pending.release()
@@ -0,0 +1,349 @@
+"""
+Citation styles rendered from one normalised record.
+
+A style maps citation types to FormatterEntry objects, the same compiled
+templates that AGLC4Citation uses. normalise_citation() prepares a citation
+once: it drops empty fields and parses dates. Every requested style then
+renders from that record. Only that normalisation is shared: each style still
+renders its own template and applies its own transforms, which is most of the
+work, so formatting in three styles costs roughly two to three times one
+style, not one style plus a little (see benchmarks/styles.py).
+
+AGLC4 covers every citation type. OSCOLA and Bluebook cover the common
+primary and secondary sources; other types are reported as unsupported.
+"""
+import re
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, Sequence
+
+from .dates import MONTHS, parse_date
+from .formatcitation import FORMATTER_REGISTRY, FormatResult, FormatterEntry, finalize_citation, format_date
+from .templates import Template, field, group
+
+# Fields holding dates, parsed once during normalisation
+DATE_FIELDS = frozenset({
+    'full_date', 'retrieval_date', 'signature_date', 'entry_force_date',
+    'date_opened', 'date_in_force', 'filing_date', 'registration_date',
+    'status_change_date', 'date_of_proceedings', 'date_of_submission', 'date_of_debate',
+})
+
+_BRACKETS = re.compile(r'[()\[\]]')
+
+def _bare_year(year: Any) -> str:
+    # AGLC years are entered with their brackets, e.g. '(1992)' or '[2020]'
+    return _BRACKETS.sub('', str(year)).strip()
+
+def _names(names: Any, two: str, many: str, limit: int) -> str:
+    if isinstance(names, str):
+        return names
+    names = [name for name in names if name]
+    if len(names) > limit:
+        return f"{names[0]} {many}"
+    if len(names) > 1:
+        return f"{', '.join(names[:-1])}{two}{names[-1]}"
+    return names[0] if names else ''
+
+
+class CitationStyle:
+    """A named set of formatter entries, one per supported citation type"""
+
+    def __init__(self, name: str, entries: Dict[str, FormatterEntry]):
+        self.name = name
+        self.entries = entries
+
+    def supports(self, citation_type: str) -> bool:
+        return citation_type in self.entries
+
+    def fields(self, citation_type: str) -> Sequence[str]:
+        """Fields this style reads for a citation type"""
+        entry = self.entries.get(citation_type)
+        return entry.params if entry else ()
+
+    def format(self, record: Dict[str, Any]) -> str:
+        """Format a record from normalise_citation"""
+        entry = self.entries.get(record['type'])
+        if entry is None:
+            raise ValueError(f"Unsupported citation type for {self.name}: {record['type']}")
+        return entry.format(record)
+
+
+def _style(name: str, templates: Dict[str, Template]) -> CitationStyle:
+    entries = {}
+    for citation_type, template in templates.items():
+        template.name = f"{name}_{citation_type}"
+        entries[citation_type] = FormatterEntry(citation_type, template, finalize_citation)
+    return CitationStyle(name, entries)
+
+
+# OSCOLA (4th ed)
+
+def _oscola_names(names: Any) -> str:
+    return _names(names, ' and ', 'and others', 3)
+
+def _oscola_editors(editors: Any) -> str:
+    plural = not isinstance(editors, str) and len([name for name in editors if name]) > 1
+    return f"{_oscola_names(editors)} ({'eds' if plural else 'ed'})"
+
+
+_OSCOLA_LEGISLATION = Template(
+    field('title'),
+    field('year'),
+    field('jurisdiction', '({jurisdiction})'),
+    field('pinpoint', ', {pinpoint}'),
+)
+
+OSCOLA = _style('oscola', {
+    'case_reported': Template(
+        field('case_name', '<i>{case_name}</i>'),
+        field('year'),
+        field('volume'),
+        field('law_report_series'),
+        field('starting_page', '{starting_page},', when=('pinpoint',)),
+        field('starting_page', unless=('pinpoint',)),
+        field('pinpoint'),
+    ),
+    'case_unreported_medium_neutral': Template(
+        field('case_name', '<i>{case_name}</i>'),
+        field('year'),
+        field('court_identifier'),
+        field('judgment_number'),
+        field('pinpoint'),
+    ),
+    'act': _OSCOLA_LEGISLATION,
+    'delegated_legislation': _OSCOLA_LEGISLATION,
+    'bill': _OSCOLA_LEGISLATION,
+    'treaty': Template(
+        field('treaty_title', '<i>{treaty_title}</i>'),
+        group(
+            field('signature_date', 'signed {signature_date}'),
+            field('entry_force_date', 'entered into force {entry_force_date}'),
+        ),
+        field('treaty_series'),
+        field('pinpoint', ', {pinpoint}'),
+        transforms={'signature_date': format_date, 'entry_force_date': format_date},
+    ),
+    'journal_article': Template(
+        field('authors', '{authors},'),
+        field('title', "'{title}'"),
+        field('year'),
+        field('volume'),
+        field('journal'),
+        field('starting_page', '{starting_page},', when=('pinpoint',)),
+        field('starting_page', unless=('pinpoint',)),
+        field('pinpoint'),
+        transforms={'authors': _oscola_names},
+    ),
+    'book': Template(
+        field('authors', '{authors},'),
+        field('title', '<i>{title}</i>'),
+        group(field('edition', '{edition} edn,'), field('publisher'), field('year'), sep=' '),
+        field('pinpoint'),
+        transforms={'authors': _oscola_names},
+    ),
+    'book_chapter': Template(
+        field('authors', '{authors},'),
+        field('chapter_title', "'{chapter_title}'"),
+        field('editors', 'in {editors},'),
+        field('book_title', '<i>{book_title}</i>'),
+        group(field('edition', '{edition} edn,'), field('publisher'), field('year'), sep=' '),
+        field('pinpoint'),
+        transforms={'authors': _oscola_names, 'editors': _oscola_editors},
+    ),
+    'report': Template(
+        field('author', '{author},'),
+        field('title', '<i>{title}</i>'),
+        group(
+            field('document_type', '{document_type} No {document_number}', when=('document_number',)),
+            field('document_type', unless=('document_number',)),
+            field('full_date'),
+        ),
+        field('pinpoint'),
+        transforms={'full_date': format_date},
+    ),
+    'online_newspaper': Template(
+        field('author', '{author},'),
+        field('title', "'{title}'"),
+        field('newspaper', '<i>{newspaper}</i>'),
+        field('full_date', '({full_date})'),
+        field('url', '<{url}>'),
+        transforms={'full_date': format_date},
+    ),
+    'internet_material': Template(
+        field('author', '{author},'),
+        field('document_title', "'{document_title}'"),
+        group(field('web_page_title'), field('full_date')),
+        field('url', '<{url}>'),
+        transforms={'full_date': format_date},
+    ),
+    'custom': Template(field('formatted_citation')),
+})
+
+
+# Bluebook (21st ed)
+
+# Rule 10.2.2 / T12 month abbreviations
+_BLUEBOOK_MONTHS = tuple(
+    name if len(name) <= 4 else ('Sept.' if name == 'September' else f"{name[:3]}.")
+    for name in MONTHS
+)
+
+def _bluebook_date(value: Any) -> str:
+    parsed = parse_date(value)
+    if isinstance(parsed, date):
+        return f"{_BLUEBOOK_MONTHS[parsed.month - 1]} {parsed.day}, {parsed.year}"
+    return parsed
+
+def _bluebook_names(names: Any) -> str:
+    return _names(names, ' & ', 'et al.', 2)
+
+def _bluebook_editors(editors: Any) -> str:
+    plural = not isinstance(editors, str) and len([name for name in editors if name]) > 1
+    return f"{_bluebook_names(editors)} {'eds.' if plural else 'ed.'},"
+
+_BLUEBOOK_LEGISLATION = Template(
+    field('title'),
+    field('year'),
+    field('jurisdiction', '({jurisdiction})'),
+    field('pinpoint'),
+)
+
+BLUEBOOK = _style('bluebook', {
+    'case_reported': Template(
+        field('case_name', '<i>{case_name}</i>,'),
+        field('volume'),
+        field('law_report_series'),
+        field('starting_page', '{starting_page},', when=('pinpoint',)),
+        field('starting_page', unless=('pinpoint',)),
+        field('pinpoint'),
+        field('year', '({year})'),
+        transforms={'year': _bare_year},
+    ),
+    'case_unreported_medium_neutral': Template(
+        field('case_name', '<i>{case_name}</i>'),
+        field('year', '[{year}]'),
+        field('court_identifier'),
+        field('judgment_number', '{judgment_number},', when=('pinpoint',)),
+        field('judgment_number', unless=('pinpoint',)),
+        field('pinpoint'),
+        transforms={'year': _bare_year},
+    ),
+    'act': _BLUEBOOK_LEGISLATION,
+    'delegated_legislation': _BLUEBOOK_LEGISLATION,
+    'bill': _BLUEBOOK_LEGISLATION,
+    'treaty': Template(
+        field('treaty_title', '{treaty_title}'),
+        field('pinpoint', '{pinpoint},'),
+        field('signature_date', '{signature_date},'),
+        field('treaty_series'),
+        transforms={'signature_date': _bluebook_date},
+    ),
+    'journal_article': Template(
+        field('authors', '{authors},'),
+        field('title', '<i>{title}</i>,'),
+        field('volume'),
+        field('journal'),
+        field('starting_page', '{starting_page},', when=('pinpoint',)),
+        field('starting_page', unless=('pinpoint',)),
+        field('pinpoint'),
+        field('year', '({year})'),
+        transforms={'authors': _bluebook_names, 'year': _bare_year},
+    ),
+    'book': Template(
+        field('authors', '{authors},'),
+        field('title', '<i>{title}</i>'),
+        field('pinpoint'),
+        group(field('edition', '{edition} ed.'), field('year'), sep=' '),
+        transforms={'authors': _bluebook_names, 'year': _bare_year},
+    ),
+    'book_chapter': Template(
+        field('authors', '{authors},'),
+        field('chapter_title', '<i>{chapter_title}</i>,'),
+        field('book_title', 'in {book_title}'),
+        field('pinpoint'),
+        group(field('editors'), field('edition', '{edition} ed.'), field('year'), sep=' '),
+        transforms={'authors': _bluebook_names, 'editors': _bluebook_editors, 'year': _bare_year},
+    ),
+    'report': Template(
+        field('author', '{author},'),
+        field('title', '<i>{title}</i>'),
+        field('pinpoint'),
+        field('full_date', '({full_date})'),
+        transforms={'full_date': _bluebook_date},
+    ),
+    'online_newspaper': Template(
+        field('author', '{author},'),
+        field('title', '<i>{title}</i>,'),
+        field('newspaper', '{newspaper}'),
+        field('full_date', '({full_date}),'),
+        field('url'),
+        transforms={'full_date': _bluebook_date},
+    ),
+    'internet_material': Template(
+        field('author', '{author},'),
+        field('document_title', '<i>{document_title}</i>,'),
+        field('web_page_title', '{web_page_title}'),
+        field('full_date', '({full_date}),'),
+        field('url'),
+        transforms={'full_date': _bluebook_date},
+    ),
+    'custom': Template(field('formatted_citation')),
+})
+
+AGLC4 = CitationStyle('aglc4', FORMATTER_REGISTRY)
+
+STYLES: Dict[str, CitationStyle] = {style.name: style for style in (AGLC4, OSCOLA, BLUEBOOK)}
+
+
+def get_style(name: str) -> CitationStyle:
+    style = STYLES.get(name)
+    if style is None:
+        raise ValueError(f"Unsupported citation style: {name}")
+    return style
+
+def normalise_citation(citation: Dict[str, Any], styles: Sequence[CitationStyle]) -> Dict[str, Any]:
+    """
+    The record every style renders from: the lowercased type plus the
+    non-empty fields any of the styles reads, with dates parsed
+    """
+    citation_type = citation['type'].lower()
+    record = {'type': citation_type}
+    for style in styles:
+        for name in style.fields(citation_type):
+            if name in record:
+                continue
+            value = citation.get(name)
+            if value is None or value == '' or value == []:
+                continue
+            record[name] = parse_date(value) if name in DATE_FIELDS else value
+    return record
+
+def format_styles(
+    citations: Iterable[Dict[str, Any]],
+    style_names: Sequence[str]
+) -> Iterator[Dict[str, FormatResult]]:
+    """
+    Format each citation in every named style, normalising it only once.
+    Yields, per citation, a dict of style name to FormatResult; a style that
+    fails or does not support the type reports it in that result's error.
+    """
+    styles = [get_style(name) for name in style_names]
+    for citation in citations:
+        citation_id = citation.get('id')
+        try:
+            record = normalise_citation(citation, styles)
+        except KeyError as e:
+            error = FormatResult(citation_id, None, f"Missing required field: {str(e)}")
+            yield {style.name: error for style in styles}
+            continue
+        except Exception as e:
+            error = FormatResult(citation_id, None, str(e))
+            yield {style.name: error for style in styles}
+            continue
+
+        results = {}
+        for style in styles:
+            try:
+                results[style.name] = FormatResult(citation_id, style.format(record), None)
+            except Exception as e:
+                results[style.name] = FormatResult(citation_id, None, str(e))
+        yield results
@@ -0,0 +1,189 @@
+"""
+Declarative citation templates.
+
+A template lists a citation type's elements in output order. Each element is
+emitted or skipped depending only on which fields are present (truthy), and
+the emitted elements are joined with spaces:
+
+    Template(
+        field('case_name', '<i>{case_name}</i>'),
+        field('year'),
+        group(field('court'), field('judge')),   # "(court, judge)"
+    )
+
+Elements:
+    field(name, fmt)  emitted when `name` is present; fmt defaults to '{name}'
+    text(fmt)         emitted unconditionally, e.g. a fixed label
+    group(*elements)  its emitted members joined with sep and wrapped in open/close;
+                      emitted when any member is, or always when always=True
+
+Every element also takes when= (fields that must be present), unless= (fields
+that must be absent) and any_of= (at least one must be present). Placeholders
+in fmt may name any field; transforms= maps a field to a function applied to
+its value before it is inserted.
+
+Templates are compiled when they are created. Because every condition depends
+only on field presence, the compiled template generates one straight-line
+f-string function per presence pattern the first time that pattern is seen.
+After that a call only computes the pattern and calls the specialised function,
+with no per-field branching.
+"""
+from string import Formatter
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+_formatter = Formatter()
+
+def _placeholders(fmt: str) -> Tuple[str, ...]:
+    return tuple(name for _, name, _, _ in _formatter.parse(fmt) if name)
+
+
+class Element:
+    """Base class for template elements"""
+    __slots__ = ('when', 'unless', 'any_of')
+
+    def __init__(self, when: Sequence[str] = (), unless: Sequence[str] = (), any_of: Sequence[str] = ()):
+        self.when = tuple(when)
+        self.unless = tuple(unless)
+        self.any_of = tuple(any_of)
+
+    def _conditions_met(self, present: FrozenSet[str]) -> bool:
+        return (
+            all(name in present for name in self.when)
+            and not any(name in present for name in self.unless)
+            and (not self.any_of or any(name in present for name in self.any_of))
+        )
+
+    def fields(self) -> Tuple[str, ...]:
+        return self.when + self.unless + self.any_of
+
+    def emit(self, present: FrozenSet[str]) -> Optional[str]:
+        """The format string this element contributes for the given present fields, or None"""
+        raise NotImplementedError
+
+
+class Part(Element):
+    """A format string emitted when its conditions are met"""
+    __slots__ = ('fmt',)
+
+    def __init__(self, fmt: str, **conditions):
+        super().__init__(**conditions)
+        self.fmt = fmt
+
+    def fields(self) -> Tuple[str, ...]:
+        return super().fields() + _placeholders(self.fmt)
+
+    def emit(self, present):
+        return self.fmt if self._conditions_met(present) else None
+
+
+class Group(Element):
+    """Members joined with sep and wrapped in open/close"""
+    __slots__ = ('members', 'open', 'close', 'sep', 'always')
+
+    def __init__(self, members: Sequence[Element], open: str = '(', close: str = ')',
+                 sep: str = ', ', always: bool = False, **conditions):
+        super().__init__(**conditions)
+        self.members = tuple(members)
+        self.open = open
+        self.close = close
+        self.sep = sep
+        self.always = always
+
+    def fields(self) -> Tuple[str, ...]:
+        names = super().fields()
+        for member in self.members:
+            names += member.fields()
+        return names
+
+    def emit(self, present):
+        if not self._conditions_met(present):
+            return None
+        pieces = [piece for piece in (m.emit(present) for m in self.members) if piece is not None]
+        if not pieces and not self.always:
+            return None
+        return _escape(self.open) + _escape(self.sep).join(pieces) + _escape(self.close)
+
+
+def field(name: str, fmt: Optional[str] = None, when: Sequence[str] = (), **conditions) -> Part:
+    """An element emitted when field `name` (and any `when` fields) are present"""
+    return Part(fmt if fmt is not None else '{%s}' % name, when=(name,) + tuple(when), **conditions)
+
+def text(fmt: str, **conditions) -> Part:
+    """An element emitted regardless of which fields are present"""
+    return Part(fmt, **conditions)
+
+def group(*members: Element, **options) -> Group:
+    return Group(members, **options)
+
+def _escape(literal: str) -> str:
+    # Literals inside format strings must have their braces doubled
+    return literal.replace('{', '{{').replace('}', '}}')
+
+
+class Template:
+    """A citation type's declarative template, compiled on creation"""
+
+    def __init__(self, *elements: Element, transforms: Optional[Dict[str, Callable[[Any], Any]]] = None,
+                 sep: str = ' '):
+        self.elements = elements
+        self.transforms = dict(transforms or {})
+        self.sep = sep
+        self.name = 'template'
+
+        # Every field the template reads, in first-use order
+        names: List[str] = []
+        for element in elements:
+            for name in element.fields():
+                if name not in names:
+                    names.append(name)
+        self.fields: Tuple[str, ...] = tuple(names)
+
+        unknown = set(self.transforms) - set(self.fields)
+        if unknown:
+            raise ValueError(f"Transforms for unused fields: {', '.join(sorted(unknown))}")
+
+        self._namespace = {f"_t_{name}": fn for name, fn in self.transforms.items()}
+        self._specialised: Dict[Tuple[bool, ...], Callable[..., str]] = {}
+
+    def render(self, fields: Dict[str, Any]) -> str:
+        """Render the template from a dict of citation fields"""
+        values = [fields.get(name) for name in self.fields]
+        pattern = tuple(map(bool, values))
+        function = self._specialised.get(pattern)
+        if function is None:
+            function = self._specialise(pattern)
+        return function(*values)
+
+    def __call__(self, **fields) -> str:
+        return self.render(fields)
+
+    def format_string(self, present: FrozenSet[str]) -> str:
+        """The format string emitted for the given set of present fields"""
+        pieces = [piece for piece in (e.emit(present) for e in self.elements) if piece is not None]
+        return _escape(self.sep).join(pieces)
+
+    def _specialise(self, pattern: Tuple[bool, ...]) -> Callable[..., str]:
+        present = frozenset(name for name, flag in zip(self.fields, pattern) if flag)
+        source = (
+            f"def {self.name}({', '.join(self.fields)}):\n"
+            f"    return {self._fstring(self.format_string(present))}\n"
+        )
+        namespace = dict(self._namespace)
+        exec(compile(source, f"<template {self.name}>", 'exec'), namespace)
+        function = namespace[self.name]
+        self._specialised[pattern] = function
+        return function
+
+    def _fstring(self, fmt: str) -> str:
+        """Python source of an f-string equivalent to fmt.format(**transformed fields)"""
+        out = []
+        for literal, name, spec, conversion in _formatter.parse(fmt):
+            out.append(
+                literal.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+                .replace('{', '{{').replace('}', '}}')
+            )
+            if name:
+                if spec or conversion:
+                    raise ValueError(f"Format specs are not supported in templates: {fmt}")
+                out.append('{' + (f"_t_{name}({name})" if name in self.transforms else name) + '}')
+        return 'f"' + ''.join(out) + '"'